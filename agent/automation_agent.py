@@ -1,13 +1,24 @@
 import os
 import json
+import argparse
 from pathlib import Path
+from typing import Optional
 
-import requests
 from openai import OpenAI
 from agent.behavior_explorer import BehaviorExplorer
+from agent.cassette import cassette_mode, placeholder_token
+from agent.exploration_cache import (
+    DEFAULT_CACHE_FILE,
+    ExplorationCache,
+    operation_fingerprint,
+)
+from agent.http_session import get_session
+from agent.token_cache import TokenCache, cache_key, oauth_client_id, token_entry
 from agent.intent_model_builder import IntentModelBuilder
+from agent.load_generator import generate_load_scenarios
+from agent.streaming import DEFAULT_INTENT_MODEL_FILE, IntentModelFile
 from agent.swagger_reader import read_swagger, extract_endpoints
-from agent.test_generator import generate_tests
+from agent.test_generator import generate_intent_suite, generate_tests
 
 client = OpenAI()
 
@@ -105,6 +116,8 @@ def ensure_common_files(base_url: str):
         AUTOMATION_DIR / "requirements.txt",
         """pytest
 pytest-html
+pytest-xdist
+filelock
 requests
 playwright
 python-dotenv
@@ -143,6 +156,10 @@ jobs:
           pip install -r automation/requirements.txt
           playwright install --with-deps
 
+      - name: Unit tests
+        run: |
+          pytest tests
+
       - name: Set environment variables
         run: |
             echo "BASE_URL=${{ secrets.BASE_URL }}" >> $GITHUB_ENV
@@ -155,13 +172,16 @@ jobs:
       
       - name: Run tests
         run: |
-          pytest automation --html=report.html --self-contained-html || true
+          pytest automation -n auto --dist loadgroup --html=report.html --self-contained-html || true
 
       - name: Publish report
         uses: actions/upload-artifact@v4
         with:
           name: automation-report
-          path: report.html
+          path: |
+            report.html
+            api_capture*.jsonl
+            latency_report.json
 """,
         encoding="utf-8",
     )
@@ -180,21 +200,83 @@ def ensure_fixtures():
         """
 import os
 import pytest
-import requests
+
+from agent.cassette import placeholder_token
+from agent.http_session import get_session, close_sessions
+from agent.token_cache import TokenCache, cache_key, oauth_client_id
+from automation.utils.api_runtime import CASSETTE, EXECUTION_CONTEXT
+from automation.utils.intent_plugin import pytest_collect_file  # noqa: F401 (collects intent_suite.json)
+from automation.utils.capture import configure_logging, end_test, start_test
+from automation.utils.latency_report import LATENCY, latency_html, write_latency_report
 
 BASE_URL = os.getenv("BASE_URL")
+TOKEN_CACHE = TokenCache()
+
+# Generated tests run create -> read/search -> update -> delete, and in
+# chain order within a phase (second argument of the lifecycle marker)
+LIFECYCLE_ORDER = {"create": 0, "read": 1, "search": 1, "update": 2, "delete": 3}
+
+
+def pytest_configure(config):
+    # Log files are opened here, not when the runtime is imported
+    configure_logging("api_test.log")
+
+    # Each run starts with an empty shared context; xdist workers join the
+    # controller's. CI shards sharing one file set EXECUTION_CONTEXT_KEEP=1
+    if not hasattr(config, "workerinput") and os.getenv("EXECUTION_CONTEXT_KEEP", "0") != "1":
+        EXECUTION_CONTEXT.clear()
+
+
+def pytest_collection_modifyitems(items):
+    def phase(item):
+        marker = item.get_closest_marker("lifecycle")
+        if marker is None:
+            return (1, 0)
+        position = marker.args[1] if len(marker.args) > 1 else 0
+        return (LIFECYCLE_ORDER.get(marker.args[0], 1), position)
+
+    # Stable sort: collection order is kept among equal (phase, position)
+    items.sort(key=phase)
+
+
+# Latency histograms and cassette counts: xdist workers send theirs to
+# the controller, which writes the merged report (a plain run writes its own)
+def pytest_sessionfinish(session):
+    CASSETTE.close()
+
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["latency"] = LATENCY.to_dict()
+        workeroutput["cassette"] = CASSETTE.to_dict()
+    else:
+        write_latency_report()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    workeroutput = getattr(node, "workeroutput", {})
+    LATENCY.merge_dict(workeroutput.get("latency", {}))
+    CASSETTE.merge_dict(workeroutput.get("cassette", {}))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if CASSETTE.mode == "off":
+        return
+
+    terminalreporter.write_sep("-", f"cassette: {CASSETTE.summary()}")
+    for line in CASSETTE.unmatched_report():
+        terminalreporter.write_line(line)
 
-def login(username: str, password: str) -> str:
-    response = requests.post(
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    prefix.extend(latency_html())
+
+
+def token_request(form_data: dict) -> dict:
+    response = get_session(BASE_URL).post(
         f"{BASE_URL}/api/v1/auth/auth/login",
-        data={
-            "grant_type": os.getenv("GRANT_TYPE", "password"),
-            "username": username,
-            "password": password,
-            "scope": os.getenv("SCOPE", ""),
-            "client_id": os.getenv("CLIENT_ID"),
-            "client_secret": os.getenv("CLIENT_SECRET"),
-        },
+        data=form_data,
         headers={
             "Content-Type": "application/x-www-form-urlencoded",
             "Accept": "application/json",
@@ -203,12 +285,63 @@ def login(username: str, password: str) -> str:
     )
 
     response.raise_for_status()
-    return response.json()["access_token"]
+    return response.json()
+
+
+def password_grant(username: str, password: str) -> dict:
+    return token_request({
+        "grant_type": os.getenv("GRANT_TYPE", "password"),
+        "username": username,
+        "password": password,
+        "scope": os.getenv("SCOPE", ""),
+        "client_id": oauth_client_id(),
+        "client_secret": os.getenv("CLIENT_SECRET"),
+    })
+
+
+def refresh_grant(refresh_token: str) -> dict:
+    return token_request({
+        "grant_type": "refresh_token",
+        "refresh_token": refresh_token,
+        "client_id": oauth_client_id(),
+        "client_secret": os.getenv("CLIENT_SECRET"),
+    })
+
+
+# The on-disk token cache is shared by every pytest session and xdist
+# worker: the auth service only sees a login when the cached token is
+# missing or about to expire.
+def login(role: str, username: str, password: str) -> str:
+    # Strict replay never reaches the API: the cassette ignores tokens
+    if CASSETTE.mode == "strict":
+        return placeholder_token(role)
+
+    return TOKEN_CACHE.get_token(
+        cache_key(BASE_URL, role, oauth_client_id()),
+        lambda: password_grant(username, password),
+        refresh_grant,
+    )
+
+
+@pytest.fixture(autouse=True)
+def correlation_id(request):
+    # Tags every captured request of this test with one correlation ID
+    token = start_test(request.node.nodeid)
+    yield
+    end_test(token)
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    session = get_session(BASE_URL)
+    yield session
+    close_sessions()
 
 
 @pytest.fixture(scope="session")
 def admin_headers():
     token = login(
+        "admin",
         os.getenv("ADMIN_USERNAME"),
         os.getenv("ADMIN_PASSWORD"),
     )
@@ -218,6 +351,7 @@ def admin_headers():
 @pytest.fixture(scope="session")
 def user_headers():
     token = login(
+        "user",
         os.getenv("USER_USERNAME"),
         os.getenv("USER_PASSWORD"),
     )
@@ -259,51 +393,146 @@ def run_agent(spec: dict):
     # ----------------------------
     print("Authenticating roles...")
 
+    token_cache = TokenCache() if spec.get("token_cache", True) else None
+
+    # Strict cassette replay never reaches the API (see agent/cassette.py)
+    replay_only = cassette_mode() == "strict"
+
     role_headers = {}
     for role_name, credentials in spec.get("roles", {}).items():
-        
+
+        if replay_only:
+            role_headers[role_name] = {"Authorization": f"Bearer {placeholder_token(role_name)}"}
+            continue
+
         headers = authenticate_role(
             base_url,
             spec["auth"],
-            credentials
+            credentials,
+            role_name=role_name,
+            token_cache=token_cache,
         )
         role_headers[role_name] = headers
 
     print(f"Authenticated roles: {list(role_headers.keys())}")
 
-   # ----------------------------
+    # ----------------------------
+    # Exploration Cache
+    # ----------------------------
+    cache = ExplorationCache(spec.get("exploration_cache", DEFAULT_CACHE_FILE))
+    full_exploration = spec.get("full_exploration", False)
+
+    cache_context = {
+        "base_url": base_url,
+        "environment": environment,
+        "roles": sorted(role_headers),
+    }
+    fingerprints = [operation_fingerprint(ep, cache_context) for ep in endpoints]
+
+    # Only keys are kept here: cached records are read back one at a time
+    cached = set()
+    if not full_exploration:
+        for ep, fingerprint in zip(endpoints, fingerprints):
+            if cache.lookup(fingerprint):
+                cached.add((ep["method"], ep["path"]))
+
+    pending_endpoints = [
+        ep for ep in endpoints
+        if (ep["method"], ep["path"]) not in cached
+    ]
+
+    if full_exploration:
+        print("Full exploration requested - exploration cache ignored")
+    else:
+        print(f"Exploration cache: {cache.summary()}")
+
+    # ----------------------------
     # Behavior Explorer
     # ----------------------------
-    print("Running Behavior Explorer...")
+    print(f"Running Behavior Explorer on {len(pending_endpoints)} endpoints...")
 
     explorer = BehaviorExplorer(
         base_url=base_url,
-        endpoints=endpoints,
+        endpoints=pending_endpoints,
         role_headers=role_headers,   # <-- multi-role support
         environment=environment,
+        max_concurrency=spec.get("exploration_concurrency", 1),
+        rate_limit_per_host=spec.get("exploration_rate_limit"),
     )
 
-    behavior_report = explorer.explore_all()
-
-    print(f"Behavior analysis completed for {len(behavior_report)} endpoints")
-
+    builder = IntentModelBuilder()
 
     # ----------------------------
-    # Intent Model Builder
+    # Streaming pipeline: explore -> classify -> write
     # ----------------------------
+    # Fresh results arrive in endpoint order and are merged with cached
+    # ones back into Swagger order; each record is classified and written
+    # to the JSON-lines intent model, and fresh ones to the cache file,
+    # as soon as it is available.
+    def intent_stream():
+        fresh = explorer.iter_explore()
+        behavior = next(fresh, None)
+
+        for ep, fingerprint in zip(endpoints, fingerprints):
+            key = (ep["method"], ep["path"])
+
+            if key in cached:
+                record = cache.get(fingerprint)
+                yield record.get("intent") or builder.classify(record["behavior"])
+
+            elif behavior and (behavior["method"], behavior["endpoint"]) == key:
+                intent = builder.classify(behavior)
+                cache.put(fingerprint, behavior, intent)
+                yield intent
+                behavior = next(fresh, None)
+
     print("Building Intent Model...")
 
-    builder = IntentModelBuilder(behavior_report)
-    intent_model = builder.build()
-    builder.save("intent_model.json")
+    intent_model_file = spec.get("intent_model_file", DEFAULT_INTENT_MODEL_FILE)
+    written = builder.stream_save(intent_stream(), intent_model_file)
+
+    print(f"Behavior analysis completed for {written} endpoints")
+    print(f"Intent model saved to {intent_model_file}")
+
+    if len(explorer.latency):
+        latency_file = spec.get("exploration_latency_file", "exploration_latency.json")
+        explorer.latency.save(latency_file)
+        print(f"Exploration latency saved to {latency_file}")
 
-    print("Intent model saved")
+    cache.save(keep=fingerprints)
 
     # ----------------------------
     # Generate Tests
     # ----------------------------
-    if spec.get("generate_api_tests", True):
-        generate_tests(base_url, intent_model, swagger_spec)
+    if spec.get("generate_api_tests", True) and spec.get("collect_from_intent_model", False):
+        # Collected by automation/utils/intent_plugin.py, no modules rendered
+        generate_intent_suite(
+            base_url,
+            intent_model_file,
+            swagger_spec,
+            workers=spec.get("generation_workers"),
+            shard_by=spec.get("shard_by", "tag"),
+        )
+    elif spec.get("generate_api_tests", True):
+        generate_tests(
+            base_url,
+            IntentModelFile(intent_model_file),
+            swagger_spec,
+            workers=spec.get("generation_workers"),
+            shard_by=spec.get("shard_by", "tag"),
+        )
+
+    if spec.get("generate_load_tests", False):
+        # Writes are only replayed outside production
+        generate_load_scenarios(
+            base_url,
+            IntentModelFile(intent_model_file),
+            swagger_spec,
+            profile=spec.get("load_profile"),
+            include_writes=environment != "production",
+            login_path=spec.get("auth", {}).get("login_path"),
+        )
+        print("Run the load test with: python -m automation.utils.load_runner")
 
     if not spec.get("enable_ui_tests", False):
         print("UI tests are disabled (code retained, not executed)")
@@ -336,38 +565,66 @@ def strip_markdown_fences(code: str) -> str:
     return code.strip()
 
 
-def authenticate_role(base_url: str, auth_config: dict, credentials: dict) -> dict:
+def authenticate_role(
+    base_url: str,
+    auth_config: dict,
+    credentials: dict,
+    role_name: Optional[str] = None,
+    token_cache: Optional[TokenCache] = None,
+) -> dict:
     """
     Authenticates a role using OAuth2 password flow.
     Returns headers with Bearer token.
+
+    With a token cache, a still-valid token is reused and an expiring
+    one is renewed with the refresh_token grant when possible.
     """
 
     login_url = f"{base_url.rstrip('/')}{auth_config['login_path']}"
-
-    form_data = {
-        "grant_type": auth_config.get("grant_type", "password"),
-        "username": credentials["username"],
-        "password": credentials["password"],
-        "scope": "",
-        "client_id": auth_config.get("client_id", "string"),
-        "client_secret": auth_config.get("client_secret", ""),
-    }
-
-    response = requests.post(
-        login_url,
-        data=form_data,
-        headers={
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Accept": "application/json",
-        },
-        timeout=15,
-    )
-
-    response.raise_for_status()
-
-    token = response.json().get("access_token")
-    if not token:
-        raise ValueError("Authentication succeeded but access_token missing")
+    refresh_url = f"{base_url.rstrip('/')}{auth_config.get('refresh_path', auth_config['login_path'])}"
+    # Same client_id as the suite's conftest, so both share cached tokens
+    client_id = oauth_client_id()
+    session = get_session(base_url)
+
+    def token_request(url: str, form_data: dict) -> dict:
+        response = session.post(
+            url,
+            data=form_data,
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Accept": "application/json",
+            },
+            timeout=15,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def password_grant() -> dict:
+        return token_request(login_url, {
+            "grant_type": auth_config.get("grant_type", "password"),
+            "username": credentials["username"],
+            "password": credentials["password"],
+            "scope": "",
+            "client_id": client_id,
+            "client_secret": auth_config.get("client_secret", ""),
+        })
+
+    def refresh_grant(refresh_token: str) -> dict:
+        return token_request(refresh_url, {
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_id": client_id,
+            "client_secret": auth_config.get("client_secret", ""),
+        })
+
+    if token_cache is None:
+        token = token_entry(password_grant())["access_token"]
+    else:
+        token = token_cache.get_token(
+            cache_key(base_url, role_name or credentials["username"], client_id),
+            password_grant,
+            refresh_grant,
+        )
 
     return {
         "Authorization": f"Bearer {token}"
@@ -379,12 +636,23 @@ def authenticate_role(base_url: str, auth_config: dict, credentials: dict) -> di
 # ---------------------------
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Swagger-driven automation agent")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-explore every operation, ignoring the exploration cache",
+    )
+    args = parser.parse_args()
+
     SPEC = {
         # Swagger / OpenAPI URL (JSON)
         "swagger_url": "http://34.56.161.228:8000/openapi.json",
         # Base URL fallback (used if swagger has no servers section)
         "base_url": "http://34.56.161.228:8000",
         "environment": "staging",
+        # Parallel exploration: max in-flight probes and requests/sec per host
+        "exploration_concurrency": 8,
+        "exploration_rate_limit": None,
         "roles": {
                 "admin": {
                             "username": "admin@acme.com",
@@ -398,7 +666,6 @@ if __name__ == "__main__":
             "auth": {
                         "login_path": "/api/v1/auth/auth/login",
                         "grant_type": "password",
-                        "client_id": "string",
                         "client_secret": ""
                     },
         # Keep UI code in repo, but do not run it
@@ -407,6 +674,24 @@ if __name__ == "__main__":
         "generate_api_tests": True,
         # Overwrite previously generated API tests
         "overwrite": True,
+        # One generated module per OpenAPI "tag" or path "prefix"
+        "shard_by": "tag",
+        # Collect tests from the intent model with the pytest plugin
+        # (automation/utils/intent_plugin.py) instead of rendering modules
+        "collect_from_intent_model": False,
+        # Reuse behavior of unchanged operations from previous runs
+        "exploration_cache": ".exploration_cache.jsonl",
+        "full_exploration": args.full,
+        # JSON-lines intent model, written as endpoints are explored
+        "intent_model_file": "intent_model.jsonl",
+        # Asyncio load-test scenarios (automation/load/load_scenarios.json);
+        # rps / concurrency / ramp_up / duration are the runner defaults
+        "generate_load_tests": False,
+        "load_profile": {"rps": 10, "concurrency": 10, "ramp_up": 5, "duration": 60},
+        # Per-operation latency percentiles of the exploration requests
+        "exploration_latency_file": "exploration_latency.json",
+        # Reuse role tokens across runs until shortly before they expire
+        "token_cache": True,
     }
 
 
@@ -1,5 +1,21 @@
-import requests
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional
+
+from agent.cassette import Cassette
+from agent.http_session import get_session
+from agent.latency import LatencyRecorder
+from agent.probe_cache import ProbeCache, probe_key
+from agent.rate_limiter import HostRateLimiter
+from agent.streaming import bounded_map
+
+# Query-string probes only make sense (and are only safe) on reads
+READ_ONLY_PROBES = ("pagination", "sorting", "filtering")
+PROBE_REQUESTS = {"pagination": 2, "sorting": 1, "filtering": 1, "error_patterns": 1}
+
+# Fewer timed probes than this give no latency baseline (one sample is noise)
+MIN_BASELINE_SAMPLES = 5
 
 
 class BehaviorExplorer:
@@ -9,94 +25,252 @@ class BehaviorExplorer:
         endpoints: List[dict],
         role_headers: Optional[Dict[str, Dict]] = None,
         environment: str = "staging",
+        max_concurrency: int = 1,
+        rate_limit_per_host: Optional[float] = None,
+        cassette: Optional[Cassette] = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.endpoints = endpoints
         self.role_headers = role_headers or {}
         self.environment = environment
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = HostRateLimiter(rate_limit_per_host)
+        self.session = get_session(self.base_url, pool_size=self.max_concurrency)
+        self.probe_cache = ProbeCache()
+        self.latency = LatencyRecorder()
+        self.cassette = cassette or Cassette.from_env("exploration")
         self.report = []
 
+        # Role of each header set, to label latency samples
+        self._role_names = {id(headers): role for role, headers in self.role_headers.items()}
+
+        # Global cap on in-flight requests across all endpoints
+        self._inflight = threading.BoundedSemaphore(self.max_concurrency)
+        self._probe_pool: Optional[ThreadPoolExecutor] = None
+
     # --------------------------------------------------
     # Entry Point
     # --------------------------------------------------
     def explore_all(self) -> List[dict]:
-        for ep in self.endpoints:
-            result = self.explore_endpoint(ep)
-            if result:
-                self.report.append(result)
+        self.report = list(self.iter_explore())
         return self.report
 
+    def iter_explore(self) -> Iterator[dict]:
+        """
+        Yields endpoint behavior records in endpoint order as they complete,
+        without keeping them: memory stays bounded by the concurrency window.
+        """
+        if self.max_concurrency == 1:
+            results = map(self.explore_endpoint, self.endpoints)
+            yield from filter(None, results)
+        else:
+            yield from self.explore_concurrently()
+
+        print(f"Probe cache: {self.probe_cache.summary()}")
+        print(f"Latency: {self.latency_summary()}")
+
+        if self.cassette.mode != "off":
+            self.cassette.close()
+            print(f"Cassette: {self.cassette.summary()}")
+            for line in self.cassette.unmatched_report():
+                print(f"  {line}")
+
+    def explore_concurrently(self) -> Iterator[dict]:
+        # Endpoints and their probes run on separate pools so an
+        # endpoint worker waiting on its probes can never starve them.
+        # bounded_map keeps endpoint order and a small look-ahead window.
+        with ThreadPoolExecutor(self.max_concurrency) as endpoint_pool, \
+                ThreadPoolExecutor(self.max_concurrency) as probe_pool:
+            self._probe_pool = probe_pool
+            try:
+                results = bounded_map(
+                    endpoint_pool,
+                    self.explore_endpoint,
+                    self.endpoints,
+                    window=2 * self.max_concurrency,
+                )
+                yield from filter(None, results)
+            finally:
+                self._probe_pool = None
+
+    def run_probes(self, *probes: Callable):
+        """
+        Runs independent probes, concurrently when a probe pool is active.
+        Results are returned in the order the probes were given.
+        """
+        if self._probe_pool is None:
+            return [probe() for probe in probes]
+
+        futures = [self._probe_pool.submit(probe) for probe in probes]
+        return [future.result() for future in futures]
+
     # --------------------------------------------------
     # Preferred Role Selection
     # --------------------------------------------------
-    def get_preferred_role_headers(self) -> Dict:
+    def preferred_role(self) -> str:
         # Prefer admin if available
         if "admin" in self.role_headers:
-            return self.role_headers["admin"]
+            return "admin"
 
-        # Otherwise return first available role
-        for headers in self.role_headers.values():
-            return headers
+        # Otherwise the first available role
+        for role in self.role_headers:
+            return role
 
         # No auth
-        return {}
+        return "anonymous"
+
+    def get_preferred_role_headers(self) -> Dict:
+        return self.role_headers.get(self.preferred_role(), {})
+
+    # --------------------------------------------------
+    # Probe Planning
+    # --------------------------------------------------
+    def plan_probes(self, method: str) -> List[str]:
+        if method == "GET":
+            return list(PROBE_REQUESTS)
+
+        return [name for name in PROBE_REQUESTS if name not in READ_ONLY_PROBES]
 
     # --------------------------------------------------
     # Endpoint Exploration
     # --------------------------------------------------
     def explore_endpoint(self, endpoint: dict) -> Optional[dict]:
         method = endpoint["method"].upper()
-        path = endpoint["path"]
-        full_url = f"{self.base_url}{path}"
+        full_url = f"{self.base_url}{endpoint['path']}"
+
+        try:
+            return self._explore_endpoint(method, endpoint["path"], full_url)
+        finally:
+            # Its probes are never asked for again: keep only the counts
+            self.probe_cache.release(method, full_url)
 
+    def _explore_endpoint(self, method: str, path: str, full_url: str) -> Optional[dict]:
         # Production safety guard
         if self.environment == "production" and method != "GET":
             return None
 
+        headers = self.get_preferred_role_headers()
+
+        auth, response = self.run_probes(
+            lambda: self.detect_roles(method, full_url, path),
+            lambda: self.safe_call(method, full_url, path, headers=headers),
+        )
+
         behavior = {
             "endpoint": path,
             "method": method,
-            "auth": self.detect_roles(method, full_url),
+            "auth": auth,
             "pagination": False,
             "sorting": False,
             "filtering": False,
             "async": False,
             "response_schema": None,
             "error_patterns": {},
+            "latency_ms": None,
         }
 
-        headers = self.get_preferred_role_headers()
-        response = self.safe_call(method, full_url, headers=headers)
-
         if not response:
             return behavior
 
+        detectors = {
+            "pagination": self.detect_pagination,
+            "sorting": self.detect_sorting,
+            "filtering": self.detect_filtering,
+            "error_patterns": self.detect_error_patterns,
+        }
+        planned = self.plan_probes(method)
+
+        results = self.run_probes(
+            *(partial(detectors[name], method, full_url, path) for name in planned)
+        )
+        behavior.update(zip(planned, results))
+
+        self.probe_cache.record_skipped(
+            sum(cost for name, cost in PROBE_REQUESTS.items() if name not in planned)
+        )
         behavior["response_schema"] = self.capture_runtime_schema(response)
-        behavior["pagination"] = self.detect_pagination(method, full_url)
-        behavior["sorting"] = self.detect_sorting(method, full_url)
-        behavior["filtering"] = self.detect_filtering(method, full_url)
         behavior["async"] = self.detect_async_behavior(response)
-        behavior["error_patterns"] = self.detect_error_patterns(method, full_url)
+        behavior["latency_ms"] = self.latency_baseline(method, path)
 
         return behavior
 
     # --------------------------------------------------
     # Safe Call Wrapper
     # --------------------------------------------------
-    def safe_call(self, method, url, **kwargs):
-        try:
-            return requests.request(method, url, timeout=10, **kwargs)
-        except Exception:
+    def safe_call(self, method, url, path, **kwargs):
+        """
+        `path` is the operation's template path: every probe of the
+        operation, whatever its URL, is timed under it.
+        """
+        key = probe_key(
+            method,
+            url,
+            kwargs.get("headers"),
+            kwargs.get("json") or kwargs.get("data"),
+        )
+        return self.probe_cache.get_or_call(
+            key, lambda: self.send(method, url, path, **kwargs)
+        )
+
+    def send(self, method, url, path, **kwargs):
+        role = self._role_names.get(id(kwargs.get("headers")), "anonymous")
+
+        with self._inflight:
+            try:
+                response = self.cassette.request(
+                    self.session,
+                    method,
+                    url,
+                    role=role,
+                    throttle=partial(self.rate_limiter.acquire, url),
+                    timeout=10,
+                    **kwargs,
+                )
+            except Exception:
+                return None
+
+        self.latency.record(method, path, role, response.timings)
+        return response
+
+    # --------------------------------------------------
+    # Latency
+    # --------------------------------------------------
+    def latency_baseline(self, method: str, path: str) -> Optional[dict]:
+        """
+        Median / p95 time to response headers (`response.elapsed`) over
+        this operation's probes as the preferred role, once there are at
+        least MIN_BASELINE_SAMPLES of them.
+        """
+        histogram = self.latency.histogram(method, path, self.preferred_role(), "ttfb_ms")
+        if histogram is None or histogram.count < MIN_BASELINE_SAMPLES:
             return None
 
+        return {
+            "median": histogram.percentile(50),
+            "p95": histogram.percentile(95),
+            "samples": histogram.count,
+        }
+
+    def latency_summary(self) -> str:
+        rows = self.latency.summary()
+        if not rows:
+            return "no requests timed"
+
+        slowest = max(rows, key=lambda row: row["total_ms"]["p95"])
+        return (
+            f"{sum(row['count'] for row in rows)} requests over {len(rows)} operations, "
+            f"slowest p95 {slowest['total_ms']['p95']} ms "
+            f"({slowest['method']} {slowest['endpoint']} as {slowest['role']})"
+        )
+
     # --------------------------------------------------
     # Role Detection
     # --------------------------------------------------
-    def detect_roles(self, method, url):
+    def detect_roles(self, method, url, path):
         role_access = {}
 
         # Check without authentication
-        no_auth_response = self.safe_call(method, url)
+        no_auth_response = self.safe_call(method, url, path)
 
         if no_auth_response is None:
             requires_auth = False
@@ -105,7 +279,7 @@ class BehaviorExplorer:
 
         # Check each role
         for role_name, headers in self.role_headers.items():
-            response = self.safe_call(method, url, headers=headers)
+            response = self.safe_call(method, url, path, headers=headers)
 
             if response is None:
                 role_access[role_name] = False
@@ -126,11 +300,11 @@ class BehaviorExplorer:
     # --------------------------------------------------
     # Pagination Detection
     # --------------------------------------------------
-    def detect_pagination(self, method, url):
+    def detect_pagination(self, method, url, path):
         headers = self.get_preferred_role_headers()
 
-        r1 = self.safe_call(method, f"{url}?page=1&limit=5", headers=headers)
-        r2 = self.safe_call(method, f"{url}?page=2&limit=5", headers=headers)
+        r1 = self.safe_call(method, f"{url}?page=1&limit=5", path, headers=headers)
+        r2 = self.safe_call(method, f"{url}?page=2&limit=5", path, headers=headers)
 
         if not r1 or not r2:
             return False
@@ -140,20 +314,20 @@ class BehaviorExplorer:
     # --------------------------------------------------
     # Sorting Detection
     # --------------------------------------------------
-    def detect_sorting(self, method, url):
+    def detect_sorting(self, method, url, path):
         headers = self.get_preferred_role_headers()
 
-        r = self.safe_call(method, f"{url}?sort=id&order=desc", headers=headers)
-        return r and r.status_code == 200
+        r = self.safe_call(method, f"{url}?sort=id&order=desc", path, headers=headers)
+        return bool(r and r.status_code == 200)
 
     # --------------------------------------------------
     # Filtering Detection
     # --------------------------------------------------
-    def detect_filtering(self, method, url):
+    def detect_filtering(self, method, url, path):
         headers = self.get_preferred_role_headers()
 
-        r = self.safe_call(method, f"{url}?filter=test", headers=headers)
-        return r and r.status_code == 200
+        r = self.safe_call(method, f"{url}?filter=test", path, headers=headers)
+        return bool(r and r.status_code == 200)
 
     # --------------------------------------------------
     # Async Detection
@@ -164,11 +338,11 @@ class BehaviorExplorer:
     # --------------------------------------------------
     # Error Pattern Capture
     # --------------------------------------------------
-    def detect_error_patterns(self, method, url):
+    def detect_error_patterns(self, method, url, path):
         headers = self.get_preferred_role_headers()
         errors = {}
 
-        r = self.safe_call(method, url + "/invalid", headers=headers)
+        r = self.safe_call(method, url + "/invalid", path, headers=headers)
         if r:
             errors[str(r.status_code)] = {
                 "status_code": r.status_code,
@@ -0,0 +1,317 @@
+"""
+HTTP Cassette
+-------------
+Record / replay of the HTTP interactions below `BehaviorExplorer.safe_call`
+and the generated suite's `safe_request`, for fast deterministic re-runs.
+
+- Interactions are keyed by (method, normalized URL, body hash, role):
+  query parameters are sorted, the host is lower-cased and credentials
+  are left out, so re-issued tokens still match
+- Cassettes are JSON lines: each distinct response body is stored once
+  and referenced by its hash; one file per pytest-xdist worker while
+  recording, all of them are indexed together on replay
+- A recording replaces the whole cassette: the process that starts it
+  (the xdist controller, never a worker) removes the previous run's
+  files, so a replay never mixes two recordings
+- A key recorded several times is replayed in recording order (the last
+  response repeats), so create -> read -> delete sequences replay faithfully
+- Replayed responses carry the recorded status, headers, body, elapsed
+  time and timings; no socket is opened
+- Requests without a recorded interaction are reported as unmatched
+
+Modes (CASSETTE_MODE):
+- off    → every request is sent (default)
+- record → every request is sent and written to the cassette
+- replay → recorded requests are replayed, unmatched ones are sent
+- strict → recorded requests are replayed, unmatched ones fail with
+           CassetteMiss; role logins are skipped (nothing is sent)
+
+Environment overrides:
+- CASSETTE_MODE → off / record / replay / strict
+- CASSETTE_DIR  → cassette directory (default cassettes)
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from agent.latency import METRICS, timed_request
+from agent.probe_cache import fingerprint
+
+MODES = ("off", "record", "replay", "strict")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Replayed bodies are already decoded
+DROPPED_HEADERS = ("content-encoding", "transfer-encoding", "content-length")
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def normalize_url(url: str, params=None) -> str:
+    parts = urlsplit(url)
+    netloc = parts.hostname or ""
+    if parts.port and parts.port != DEFAULT_PORTS.get(parts.scheme):
+        netloc = f"{netloc}:{parts.port}"
+
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        query.extend(
+            (str(name), str(item))
+            for name, value in items if value is not None
+            for item in (value if isinstance(value, (list, tuple)) else [value])
+        )
+
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path or "/", urlencode(sorted(query)), ""))
+
+
+def body_hash(kwargs: dict) -> str:
+    body = kwargs.get("json")
+    if body is None:
+        body = kwargs.get("data")
+        if isinstance(body, dict):
+            body = urlencode(sorted((str(k), str(v)) for k, v in body.items() if v is not None))
+    return fingerprint(body)
+
+
+def interaction_key(method: str, url: str, role: str, kwargs: dict) -> str:
+    return " ".join((
+        method.upper(),
+        normalize_url(url, kwargs.get("params")),
+        body_hash(kwargs) or "-",
+        role or "anonymous",
+    ))
+
+
+def body_record(digest: str, body: bytes) -> dict:
+    # Text bodies are kept readable; anything else is base64
+    try:
+        return {"digest": digest, "text": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"digest": digest, "data": base64.b64encode(body).decode("ascii")}
+
+
+def body_bytes(record: dict) -> bytes:
+    if "text" in record:
+        return record["text"].encode("utf-8")
+    return base64.b64decode(record["data"])
+
+
+def cassette_mode() -> str:
+    mode = os.getenv("CASSETTE_MODE", "off").lower()
+    if mode not in MODES:
+        raise ValueError(f"CASSETTE_MODE must be one of {', '.join(MODES)}, got {mode!r}")
+    return mode
+
+
+def cassette_file(name: str) -> Path:
+    path = Path(os.getenv("CASSETTE_DIR", "cassettes")) / f"{name}.jsonl"
+
+    # xdist workers record separate files instead of interleaving appends
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if worker:
+        path = path.with_name(f"{name}.{worker}.jsonl")
+
+    return path
+
+
+def placeholder_token(role: str) -> str:
+    """
+    Stands in for a role login in strict mode: the cassette matches on
+    the role, never on the token.
+    """
+    return f"cassette-{role}"
+
+
+class Cassette:
+    def __init__(self, path: Path, mode: str = "off"):
+        self.path = Path(path)
+        self.mode = mode
+        self.unmatched: List[str] = []
+        self.replayed = 0
+        self.recorded = 0
+
+        self._interactions: Dict[str, List[dict]] = {}
+        self._bodies: Dict[str, bytes] = {}
+        self._cursors: Dict[str, int] = {}
+        self._written_bodies = set()
+        self._writer = None
+        self._lock = threading.Lock()
+
+        if self.replaying:
+            self.load()
+        elif self.mode == "record" and not os.getenv("PYTEST_XDIST_WORKER"):
+            # Workers start after the controller built its cassette
+            self.clear()
+
+    @classmethod
+    def from_env(cls, name: str) -> "Cassette":
+        return cls(cassette_file(name), cassette_mode())
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode in ("replay", "strict")
+
+    # --------------------------------------------------
+    # Requests
+    # --------------------------------------------------
+    def request(
+        self,
+        session,
+        method: str,
+        url: str,
+        role: str = "anonymous",
+        throttle: Optional[Callable[[], None]] = None,
+        **kwargs,
+    ):
+        """
+        `timed_request` through the cassette. `throttle` runs before a
+        request actually goes out (never before a replay).
+        """
+        if self.mode == "off":
+            return self.send(session, method, url, throttle, kwargs)
+
+        key = interaction_key(method, url, role, kwargs)
+
+        if self.replaying:
+            response = self.replay(key, url)
+            if response is not None:
+                return response
+
+            with self._lock:
+                self.unmatched.append(key)
+            if self.mode == "strict":
+                raise CassetteMiss(f"No recorded interaction for {key}")
+
+        response = self.send(session, method, url, throttle, kwargs)
+        if self.mode == "record":
+            self.record(key, response)
+        return response
+
+    @staticmethod
+    def send(session, method: str, url: str, throttle, kwargs: dict):
+        if throttle is not None:
+            throttle()
+        return timed_request(session, method, url, **kwargs)
+
+    def replay(self, key: str, url: str) -> Optional[Response]:
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                return None
+
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            self.replayed += 1
+
+        interaction = recorded[min(cursor, len(recorded) - 1)]
+
+        response = Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction.get("reason")
+        response.url = url
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response._content = self._bodies.get(interaction["body"], b"")
+        response.headers["Content-Length"] = str(len(response._content))
+        response._content_consumed = True
+        response.encoding = interaction.get("encoding")
+        response.elapsed = timedelta(milliseconds=interaction["timings"]["ttfb_ms"])
+        response.timings = dict(interaction["timings"])
+        return response
+
+    def record(self, key: str, response):
+        body = response.content
+        digest = hashlib.sha1(body).hexdigest()
+
+        interaction = {
+            "key": key,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in DROPPED_HEADERS
+            },
+            "encoding": response.encoding,
+            "body": digest,
+            "timings": {metric: response.timings[metric] for metric in METRICS},
+        }
+
+        with self._lock:
+            if self._writer is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._writer = self.path.open("w", encoding="utf-8")
+
+            if digest not in self._written_bodies:
+                self._written_bodies.add(digest)
+                self._writer.write(json.dumps(body_record(digest, body)) + "\n")
+
+            self._writer.write(json.dumps(interaction) + "\n")
+            self.recorded += 1
+
+    # --------------------------------------------------
+    # Storage
+    # --------------------------------------------------
+    def files(self) -> List[Path]:
+        # The plain cassette plus the per-worker files of an xdist recording
+        stem = self.path.name.split(".", 1)[0]
+        return sorted(self.path.parent.glob(f"{stem}.jsonl")) + sorted(
+            self.path.parent.glob(f"{stem}.gw*.jsonl")
+        )
+
+    def clear(self):
+        for path in self.files():
+            path.unlink(missing_ok=True)
+
+    def load(self):
+        for path in self.files():
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if "digest" in record:
+                        self._bodies[record["digest"]] = body_bytes(record)
+                    else:
+                        self._interactions.setdefault(record["key"], []).append(record)
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def summary(self) -> str:
+        if self.mode == "record":
+            return f"{self.recorded} interactions recorded in {self.path.parent}"
+        return (
+            f"{self.replayed} requests replayed, {len(self.unmatched)} unmatched "
+            f"({sum(map(len, self._interactions.values()))} recorded interactions)"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "replayed": self.replayed,
+            "recorded": self.recorded,
+            "unmatched": list(self.unmatched),
+        }
+
+    def merge_dict(self, data: dict):
+        with self._lock:
+            self.replayed += data.get("replayed", 0)
+            self.recorded += data.get("recorded", 0)
+            self.unmatched.extend(data.get("unmatched", []))
+
+    def unmatched_report(self, limit: int = 20) -> List[str]:
+        lines = [f"Unmatched: {key}" for key in self.unmatched[:limit]]
+        if len(self.unmatched) > limit:
+            lines.append(f"... and {len(self.unmatched) - limit} more")
+        return lines
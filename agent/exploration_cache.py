@@ -0,0 +1,140 @@
+"""
+Exploration Cache
+-----------------
+Persists behavior reports and intent entries between agent runs.
+
+Each operation is keyed by a stable hash of its path, method,
+parameters, requestBody and responses (as returned by
+`extract_endpoints`) plus the exploration context (base URL,
+environment and role names). Unchanged operations reuse their
+previous results; only changed or new operations are probed again.
+
+Storage is JSON-lines: one {"fingerprint", "behavior", "intent"}
+record per operation, read and written one record at a time.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+DEFAULT_CACHE_FILE = ".exploration_cache.jsonl"
+
+
+def operation_fingerprint(endpoint: dict, context: Optional[dict] = None) -> str:
+    material = {
+        "path": endpoint.get("path"),
+        "method": endpoint.get("method", "").upper(),
+        "parameters": endpoint.get("parameters"),
+        "requestBody": endpoint.get("requestBody"),
+        "responses": endpoint.get("responses"),
+        "context": context or {},
+    }
+    raw = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ExplorationCache:
+    """
+    Only an index (fingerprint -> line offset) is held in memory: cached
+    records are read back from the file when needed, and fresh records
+    are streamed into the next version of the file as they are `put`.
+    """
+
+    def __init__(self, file_path: str = DEFAULT_CACHE_FILE):
+        self.file_path = Path(file_path)
+        self.tmp_path = self.file_path.with_suffix(self.file_path.suffix + ".tmp")
+        self.offsets: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self._reader = None
+        self._writer = None
+        self._written = set()
+        self.load()
+
+    def load(self):
+        if not self.file_path.exists():
+            return
+
+        with open(self.file_path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A truncated last line must not discard the rest
+                    record = None
+                if isinstance(record, dict) and "fingerprint" in record:
+                    self.offsets[record["fingerprint"]] = offset
+                offset += len(line)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self.offsets
+
+    def lookup(self, fingerprint: str) -> bool:
+        """
+        Whether an operation can be reused; counted in the summary.
+        """
+        if fingerprint in self.offsets:
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        return False
+
+    def get(self, fingerprint: str) -> Optional[dict]:
+        offset = self.offsets.get(fingerprint)
+        if offset is None:
+            return None
+
+        if self._reader is None:
+            self._reader = open(self.file_path, "rb")
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())
+
+    def put(self, fingerprint: str, behavior: dict, intent: Optional[dict]):
+        if self._writer is None:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = open(self.tmp_path, "w", encoding="utf-8")
+
+        record = {"fingerprint": fingerprint, "behavior": behavior, "intent": intent}
+        self._writer.write(json.dumps(record, default=str) + "\n")
+        self._written.add(fingerprint)
+
+    def save(self, keep: Optional[Iterable[str]] = None):
+        """
+        Completes the next version of the file and replaces the old one
+        atomically: records `put` this run, plus the previous records of
+        every other operation (only those in `keep` when it is given).
+        """
+        fingerprints = list(self.offsets) if keep is None else list(dict.fromkeys(keep))
+
+        for fingerprint in fingerprints:
+            if fingerprint not in self._written and fingerprint in self.offsets:
+                record = self.get(fingerprint)
+                self.put(fingerprint, record.get("behavior"), record.get("intent"))
+
+        if self._writer is None:
+            # Nothing to keep: an empty cache
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = open(self.tmp_path, "w", encoding="utf-8")
+
+        self._writer.close()
+        self._writer = None
+        self.close()
+        os.replace(self.tmp_path, self.file_path)
+
+        self._written = set()
+        self.offsets = {}
+        self.load()
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.0f}% reused)"
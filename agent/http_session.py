@@ -0,0 +1,91 @@
+"""
+Pooled HTTP Sessions
+--------------------
+One keep-alive `requests.Session` per base URL, shared by the
+Behavior Explorer, role authentication, the Swagger reader and the
+generated test runtime.
+
+Reusing sessions avoids a fresh TCP/TLS handshake per request.
+Pooled connections record DNS / connect time (see latency.py).
+
+Environment overrides:
+- HTTP_POOL_SIZE  → connections kept alive per host (default 32)
+- HTTP_RETRIES    → retries on connection errors / 502, 503, 504 (default 2)
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from agent.latency import TimedHTTPAdapter
+
+DEFAULT_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+DEFAULT_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+
+_sessions: Dict[str, requests.Session] = {}
+_pool_sizes: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def build_adapter(pool_size: int, retries: int) -> HTTPAdapter:
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=retries,
+        status_forcelist=(502, 503, 504),
+        backoff_factor=0.2,
+        raise_on_status=False,
+    )
+    return TimedHTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+
+
+def get_session(
+    base_url: str,
+    pool_size: Optional[int] = None,
+    retries: Optional[int] = None,
+) -> requests.Session:
+    """
+    Returns the shared session for the origin of `base_url`.
+    Asking for a larger pool than the existing one remounts the adapter.
+    """
+    origin = _origin(base_url)
+    pool_size = max(pool_size or 0, DEFAULT_POOL_SIZE)
+    retries = DEFAULT_RETRIES if retries is None else retries
+
+    with _lock:
+        session = _sessions.get(origin)
+
+        if session is None:
+            session = requests.Session()
+            _sessions[origin] = session
+
+        if pool_size > _pool_sizes.get(origin, 0):
+            adapter = build_adapter(pool_size, retries)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _pool_sizes[origin] = pool_size
+
+        return session
+
+
+def close_sessions():
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _pool_sizes.clear()
@@ -1,21 +1,43 @@
 import json
-from typing import List, Dict
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+
+from agent.streaming import write_jsonl
 
 
 class IntentModelBuilder:
-    def __init__(self, behavior_report: List[Dict]):
+    def __init__(
+        self,
+        behavior_report: Iterable[Dict] = (),
+        known_intents: Optional[Dict[Tuple[str, str], Dict]] = None,
+    ):
         self.behavior_report = behavior_report
+        # (method, endpoint) -> intent entry reused from a previous run
+        self.known_intents = known_intents or {}
         self.intent_model = []
 
     # --------------------------------------------------
     # Public Build Method
     # --------------------------------------------------
     def build(self) -> List[Dict]:
-        for ep in self.behavior_report:
-            classified = self.classify_endpoint(ep)
-            self.intent_model.append(classified)
+        self.intent_model.extend(self.iter_build(self.behavior_report))
         return self.intent_model
 
+    # --------------------------------------------------
+    # Streaming Build
+    # --------------------------------------------------
+    def iter_build(self, behavior_report: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Classifies behavior records lazily, one intent entry per record.
+        """
+        for ep in behavior_report:
+            yield self.classify(ep)
+
+    def classify(self, ep: Dict) -> Dict:
+        classified = self.known_intents.get((ep.get("method"), ep.get("endpoint")))
+        if classified is None:
+            classified = self.classify_endpoint(ep)
+        return classified
+
     # --------------------------------------------------
     # Classification Logic
     # --------------------------------------------------
@@ -41,6 +63,7 @@ class IntentModelBuilder:
             "pagination": ep.get("pagination", False),
             "sorting": ep.get("sorting", False),
             "filtering": ep.get("filtering", False),
+            "latency_ms": ep.get("latency_ms"),
         }
 
     # --------------------------------------------------
@@ -101,6 +124,9 @@ class IntentModelBuilder:
         if ep.get("filtering"):
             test_types.append("filtering")
 
+        if ep.get("latency_ms"):
+            test_types.append("performance")
+
         return test_types
 
     # --------------------------------------------------
@@ -114,6 +140,16 @@ class IntentModelBuilder:
 
         print("Intent model saved")
 
+    def stream_save(self, intent_entries: Iterable[Dict], file_path: str) -> int:
+        """
+        Writes intent entries to a JSON-lines file as they are produced.
+        Returns the number of entries written.
+        """
+        return write_jsonl(
+            file_path,
+            (self.make_json_safe(entry) for entry in intent_entries),
+        )
+
     # --------------------------------------------------
     # JSON Safety Converter
     # --------------------------------------------------
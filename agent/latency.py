@@ -0,0 +1,354 @@
+"""
+Request Latency Instrumentation
+-------------------------------
+Per-request timings and HDR-style latency histograms, shared by the
+Behavior Explorer and the generated test runtime.
+
+Every request sent through `timed_request` records:
+- dns_ms     → host name resolution of a new pooled connection
+- connect_ms → TCP connect + TLS handshake of a new pooled connection
+               (both 0 when a keep-alive connection is reused)
+- ttfb_ms    → request start until the response headers are parsed
+               (`response.elapsed`, includes dns/connect)
+- total_ms   → wall time including the body download
+
+Connection timings come from the connection classes mounted by
+`TimedHTTPAdapter` (see http_session.py). Timings are aggregated per
+(method, endpoint, role) into log-linear histograms with a bounded
+relative error that merge losslessly across processes.
+
+Environment overrides:
+- LATENCY_PRECISION → significant bits per histogram bucket
+                      (default 7, about 0.8% relative error)
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+
+METRICS = ("dns_ms", "connect_ms", "ttfb_ms", "total_ms")
+PERCENTILES = (50, 95, 99)
+DEFAULT_PRECISION = int(os.getenv("LATENCY_PRECISION", "7"))
+
+_connection_timings = threading.local()
+
+
+# --------------------------------------------------
+# Connection hooks
+# --------------------------------------------------
+def reset_connection_timings():
+    _connection_timings.dns_ms = 0.0
+    _connection_timings.connect_ms = 0.0
+
+
+def connection_timings() -> Dict[str, float]:
+    """
+    DNS / connect time spent by this thread since the last reset
+    (summed when retries opened more than one connection).
+    """
+    return {
+        "dns_ms": getattr(_connection_timings, "dns_ms", 0.0),
+        "connect_ms": getattr(_connection_timings, "connect_ms", 0.0),
+    }
+
+
+def _add_timing(metric: str, elapsed_ms: float):
+    setattr(_connection_timings, metric, getattr(_connection_timings, metric, 0.0) + elapsed_ms)
+
+
+class _TimedConnectionMixin:
+    """
+    Times name resolution separately from the TCP/TLS setup.
+
+    The host is resolved here and urllib3 connects to each address in
+    turn, so the usual fallback across addresses is kept.
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror:
+            return super()._new_conn()  # urllib3 raises its own resolution error
+        _add_timing("dns_ms", (time.perf_counter() - start) * 1000)
+
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        error = None
+        for address in addresses:
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except Exception as e:
+                error = e
+            finally:
+                self._dns_host = host
+
+        raise error
+
+    def connect(self):
+        before = connection_timings()["dns_ms"]
+        start = time.perf_counter()
+        super().connect()
+        dns_ms = connection_timings()["dns_ms"] - before
+        _add_timing("connect_ms", (time.perf_counter() - start) * 1000 - dns_ms)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose pooled connections record DNS / connect time.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def timed_request(session, method: str, url: str, **kwargs):
+    """
+    `session.request` that attaches `response.timings` (see METRICS).
+    """
+    reset_connection_timings()
+    start = time.perf_counter()
+    response = session.request(method, url, **kwargs)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    timings = connection_timings()
+    timings["ttfb_ms"] = response.elapsed.total_seconds() * 1000
+    timings["total_ms"] = total_ms
+    response.timings = {metric: round(timings[metric], 3) for metric in METRICS}
+    return response
+
+
+# --------------------------------------------------
+# HDR-style histogram
+# --------------------------------------------------
+class LatencyHistogram:
+    """
+    Log-linear histogram of latencies (stored in microseconds).
+
+    Values below 2**precision µs are exact; above that each power of
+    two is split into 2**(precision - 1) equal buckets, so every bucket
+    is within 2**-(precision - 1) of its value. Buckets are sparse and
+    keyed by their lower bound.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        self.precision = precision
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us: Optional[int] = None
+
+    def _bucket(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.precision)
+        return (value >> shift) << shift
+
+    def record(self, value_ms: float):
+        value = max(0, int(value_ms * 1000))
+        bucket = self._bucket(value)
+
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_us += value
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = value if self.max_us is None else max(self.max_us, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge latency histograms of different precision")
+
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        for value in (other.min_us, other.max_us):
+            if value is not None:
+                self.min_us = value if self.min_us is None else min(self.min_us, value)
+                self.max_us = value if self.max_us is None else max(self.max_us, value)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Value (ms) at or below which `percent` of the recordings fall.
+        """
+        if not self.count:
+            return None
+
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                width = 1 << max(0, bucket.bit_length() - self.precision)
+                value = bucket + (width - 1) / 2
+                return round(min(max(value, self.min_us), self.max_us) / 1000, 3)
+
+        return round(self.max_us / 1000, 3)
+
+    def mean(self) -> Optional[float]:
+        return round(self.total_us / self.count / 1000, 3) if self.count else None
+
+    def to_dict(self) -> dict:
+        return {
+            "precision": self.precision,
+            "count": self.count,
+            "total_us": self.total_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+            "buckets": {str(bucket): count for bucket, count in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        histogram = cls(data.get("precision", DEFAULT_PRECISION))
+        histogram.buckets = {int(bucket): count for bucket, count in data.get("buckets", {}).items()}
+        histogram.count = data.get("count", 0)
+        histogram.total_us = data.get("total_us", 0)
+        histogram.min_us = data.get("min_us")
+        histogram.max_us = data.get("max_us")
+        return histogram
+
+
+# --------------------------------------------------
+# Per-operation aggregation
+# --------------------------------------------------
+class LatencyRecorder:
+    """
+    Thread-safe latency histograms per (method, endpoint, role) and metric.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        self.precision = precision
+        self._histograms: Dict[Tuple[str, str, str], Dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, key: Tuple[str, str, str]) -> Dict[str, LatencyHistogram]:
+        entry = self._histograms.get(key)
+        if entry is None:
+            entry = {metric: LatencyHistogram(self.precision) for metric in METRICS}
+            self._histograms[key] = entry
+        return entry
+
+    def record(self, method: str, endpoint: str, role: str, timings: Dict[str, float]):
+        key = (method.upper(), endpoint, role)
+        with self._lock:
+            entry = self._entry(key)
+            for metric in METRICS:
+                if timings.get(metric) is not None:
+                    entry[metric].record(timings[metric])
+
+    def histogram(
+        self,
+        method: str,
+        endpoint: str,
+        role: str,
+        metric: str = "total_ms",
+    ) -> Optional[LatencyHistogram]:
+        entry = self._histograms.get((method.upper(), endpoint, role))
+        return entry[metric] if entry else None
+
+    def __len__(self) -> int:
+        return len(self._histograms)
+
+    # --------------------------------------------------
+    # Serialisation (JSON artifact, xdist workers)
+    # --------------------------------------------------
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "operations": [
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        "role": role,
+                        "histograms": {metric: h.to_dict() for metric, h in entry.items()},
+                    }
+                    for (method, endpoint, role), entry in sorted(self._histograms.items())
+                ]
+            }
+
+    def merge_dict(self, data: dict):
+        with self._lock:
+            for operation in data.get("operations", []):
+                key = (operation["method"], operation["endpoint"], operation["role"])
+                entry = self._entry(key)
+                for metric, histogram in operation.get("histograms", {}).items():
+                    if metric in entry:
+                        entry[metric].merge(LatencyHistogram.from_dict(histogram))
+
+    # --------------------------------------------------
+    # Reporting
+    # --------------------------------------------------
+    def summary(self, percentiles: Iterable[int] = PERCENTILES) -> List[dict]:
+        """
+        One row per operation: request count and percentiles of every metric.
+        """
+        percentiles = tuple(percentiles)
+        rows = []
+
+        with self._lock:
+            for (method, endpoint, role), entry in sorted(self._histograms.items()):
+                row = {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "role": role,
+                    "count": entry["total_ms"].count,
+                }
+                for metric, histogram in entry.items():
+                    row[metric] = {f"p{p}": histogram.percentile(p) for p in percentiles}
+                    row[metric]["mean"] = histogram.mean()
+                rows.append(row)
+
+        return rows
+
+    def save(self, path: str) -> int:
+        """
+        Writes percentile rows plus the raw histograms; returns the row count.
+        """
+        summary = self.summary()
+        report = {"percentiles": summary, **self.to_dict()}
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, path)
+
+        return len(summary)
+
+    def format_table(self, metric: str = "total_ms") -> str:
+        lines = [f"{'METHOD':<8}{'ENDPOINT':<48}{'ROLE':<12}{'N':>7}{'p50':>10}{'p95':>10}{'p99':>10}"]
+        for row in self.summary():
+            p = row[metric]
+            lines.append(
+                f"{row['method']:<8}{row['endpoint']:<48}{row['role']:<12}{row['count']:>7}"
+                f"{p['p50']:>10}{p['p95']:>10}{p['p99']:>10}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,143 @@
+"""
+Load Scenario Generator
+-----------------------
+Turns the intent model into replayable load-test scenarios for
+automation/utils/load_runner.py.
+
+- Every read / search operation becomes a single-step scenario
+- Every lifecycle chain of the spec's producer / consumer graph
+  (`resolution/lifecycle_graph.py`) becomes one scenario, in dependency
+  order: create, then read/search, update and delete of the created
+  resource; path parameters are filled from the create response at run
+  time (`capture`), and steps list the captured values they `require`;
+  body fields another operation produces are filled the same way (`links`)
+- Payloads and query parameters are resolved once, here, with
+  TestDataResolutionEngine; the runner only replays them
+
+Output: automation/load/load_scenarios.json
+"""
+
+import json
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional
+
+from agent.data_factory import deterministic_value
+from agent.test_generator import contract_role_for, resolve_with_engine
+from resolution.lifecycle_graph import LifecycleGraph
+from resolution.spec_index import SpecIndex
+
+LOAD_SCENARIO_FILE = Path("automation/load/load_scenarios.json")
+
+DEFAULT_PROFILE = {"rps": 10, "concurrency": 10, "ramp_up": 0, "duration": 30}
+
+
+def path_param_fallbacks(path: str, method: str, swagger_spec: dict, tc_id: str) -> dict:
+    """
+    Static values for path parameters nothing was captured for.
+    """
+    operation = SpecIndex.for_spec(swagger_spec).operation(path, method)
+    param_map = operation.path_params if operation else {}
+
+    fallbacks = {}
+    for name, schema in param_map.items():
+        if schema.get("format") == "uuid":
+            fallbacks[name] = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{tc_id}:{name}"))
+        elif schema.get("type") == "integer":
+            fallbacks[name] = "1"
+        else:
+            fallbacks[name] = str(deterministic_value(tc_id, name, schema.get("type") or "string"))
+
+    return fallbacks
+
+
+def load_step(ep: dict, tc_id: str, swagger_spec: dict) -> dict:
+    method = ep["method"].upper()
+    path = ep["endpoint"]
+
+    payload, query, content_type, links = resolve_with_engine(ep, tc_id, swagger_spec)
+
+    step = {
+        "method": method,
+        "endpoint": path,
+        "classification": ep.get("classification", "unknown"),
+        "role": contract_role_for(ep.get("roles", {}).get("role_access", {})),
+        "path_params": path_param_fallbacks(path, method, swagger_spec, tc_id),
+        "params": query or None,
+    }
+
+    if payload:
+        body_key = "data" if content_type == "application/x-www-form-urlencoded" else "json"
+        step[body_key] = payload
+        if links:
+            step["links"] = links
+
+    return step
+
+
+def generate_load_scenarios(
+    base_url: str,
+    intent_model: Iterable[dict],
+    swagger_spec: dict,
+    profile: Optional[dict] = None,
+    include_writes: bool = True,
+    login_path: Optional[str] = None,
+    output: Path = LOAD_SCENARIO_FILE,
+) -> Path:
+    """
+    Writes the load scenarios of an intent model.
+    Without `include_writes` (production) lifecycle chains are left out.
+    """
+    if iter(intent_model) is intent_model:
+        intent_model = list(intent_model)
+
+    steps = {}
+    for index, ep in enumerate(intent_model, start=1):
+        key = (ep["method"].upper(), ep["endpoint"])
+        steps[key] = load_step(ep, f"TC_LOAD_{index:03d}", swagger_spec)
+
+    chains = {}
+    if include_writes:
+        graph = LifecycleGraph(
+            swagger_spec,
+            {key: step["classification"] for key, step in steps.items()},
+        )
+        for name, nodes in graph.chains().items():
+            chain = [node for node in nodes if node in steps]
+            if len(chain) < 2:
+                continue
+            for node in chain:
+                step = steps[node]
+                step["requires"] = graph.requires(node)
+                if step["classification"] == "create":
+                    step["capture"] = graph.captures(node)
+            chains[name] = [steps[node] for node in chain]
+
+    chained = {(step["method"], step["endpoint"]) for chain in chains.values() for step in chain}
+
+    scenarios = [
+        {"name": f"{key[0]} {key[1]}", "weight": 1, "steps": [step]}
+        for key, step in steps.items()
+        if key not in chained and step["classification"] in ("read", "search")
+    ]
+    scenarios.extend(
+        {"name": name, "weight": 1, "steps": chain} for name, chain in chains.items()
+    )
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "base_url": base_url,
+                "login_path": login_path,
+                "profile": {**DEFAULT_PROFILE, **(profile or {})},
+                "scenarios": scenarios,
+            },
+            indent=2,
+            default=str,
+        ),
+        encoding="utf-8",
+    )
+
+    print(f"[GENERATED] {output} ({len(scenarios)} scenarios, {len(chains)} lifecycle chains)")
+    return output
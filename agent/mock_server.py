@@ -0,0 +1,655 @@
+"""
+Local Mock API Server
+---------------------
+Serves every operation of an OpenAPI spec locally, so exploration,
+test generation, the generated suite and the load runner can run
+without the live API.
+
+- Responses are built from the documented success schema with
+  `deterministic_value`: the same request always gets the same body, and
+  enums, formats (uuid, date-time, date, email, uri), nullable, allOf /
+  anyOf / oneOf and $ref are honoured, so contract validation passes
+- Authentication: a password-grant login endpoint issues bearer tokens
+  per configured role; protected operations answer 401 without a valid
+  token and 403 for roles not allowed to call them
+- Request bodies are validated against the request schema (422 with a
+  FastAPI-style `detail` list)
+- List responses are paginated with `page` / `limit` (or `offset` / `skip`)
+  over a fixed-size collection
+- Fixed latency plus optional jitter per request
+- The spec itself is served at /openapi.json, pointing at the mock
+
+Role permissions: an operation's `x-roles` list if present, otherwise
+every role may read (GET) and only MOCK_WRITE_ROLES may write.
+
+Usage:
+    python -m agent.mock_server --spec openapi.json --port 8000 --latency-ms 5
+
+Environment overrides:
+- MOCK_ROLES           → "role=username:password,..." (default admin / user
+                         with the credentials of the sample SPEC)
+- MOCK_WRITE_ROLES     → roles allowed to call non-GET operations (default admin)
+- MOCK_LATENCY_MS      → fixed delay per request (default 0)
+- MOCK_JITTER_MS       → extra uniform random delay (default 0)
+- MOCK_COLLECTION_SIZE → items behind every paginated list (default 25)
+- MOCK_TOKEN_SECRET    → key signing the issued tokens
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from agent.data_factory import deterministic_value
+from agent.swagger_reader import extract_endpoints, read_swagger
+from resolution.schema_compiler import ContractValidator
+from resolution.spec_index import SpecIndex
+
+DEFAULT_ROLES = {
+    "admin": ("admin@acme.com", "admin123"),
+    "user": ("user@acme.com", "user123"),
+}
+DEFAULT_LOGIN_PATH = "/api/v1/auth/auth/login"
+TOKEN_TTL = 3600
+
+# Recursive DTOs are expanded this many levels before they are cut
+MAX_DEPTH = 3
+
+DATE_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+PAGE_PARAMS = ("page", "limit", "offset", "skip", "size", "per_page", "page_size")
+
+
+def parse_roles(value: str) -> Dict[str, Tuple[str, str]]:
+    """
+    "admin=admin@acme.com:admin123,user=user@acme.com:user123"
+    """
+    roles = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        role, _, credentials = entry.partition("=")
+        username, _, password = credentials.partition(":")
+        roles[role] = (username, password)
+    return roles
+
+
+def _hash(seed: str) -> int:
+    return int.from_bytes(hashlib.blake2b(seed.encode(), digest_size=8).digest(), "big")
+
+
+# --------------------------------------------------
+# Deterministic response values
+# --------------------------------------------------
+class MockValueBuilder:
+    """
+    Schema-conformant values seeded by request, resolved against the spec.
+    """
+
+    def __init__(self, swagger_spec: dict):
+        self.graph = SpecIndex.for_spec(swagger_spec).graph
+
+    def build(self, schema: Any, seed: str, name: str = "value", depth: int = 0) -> Any:
+        schema = self.graph.resolve(schema) if isinstance(schema, dict) else {}
+
+        if schema.get("x-recursive"):
+            if depth >= MAX_DEPTH:
+                return None
+            schema = self.graph.expand(schema)
+
+        for keyword in ("oneOf", "anyOf"):
+            if keyword in schema:
+                options = [o for o in schema[keyword] if o.get("type") != "null"] or [{}]
+                return self.build(options[0], seed, name, depth)
+
+        if "enum" in schema and schema["enum"]:
+            choices = [value for value in schema["enum"] if value is not None] or [None]
+            return choices[_hash(f"{seed}:{name}") % len(choices)]
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            schema_type = next((t for t in schema_type if t != "null"), None)
+        if schema_type is None:
+            schema_type = "object" if "properties" in schema else "string"
+
+        if schema_type == "object":
+            if depth >= MAX_DEPTH and not schema.get("required"):
+                return {}
+            return {
+                key: self.build(value, seed, key, depth + 1)
+                for key, value in schema.get("properties", {}).items()
+            }
+
+        if schema_type == "array":
+            if depth >= MAX_DEPTH:
+                return []
+            return [self.build(schema.get("items", {}), seed, name, depth + 1)]
+
+        return self.primitive(schema, schema_type, seed, name)
+
+    def primitive(self, schema: dict, schema_type: str, seed: str, name: str) -> Any:
+        schema_format = schema.get("format")
+        h = _hash(f"{seed}:{name}")
+
+        if schema_type == "string":
+            if schema_format == "uuid":
+                return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{seed}:{name}"))
+            if schema_format == "date-time":
+                return (DATE_EPOCH + timedelta(seconds=h % 31_536_000)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            if schema_format == "date":
+                return (DATE_EPOCH + timedelta(days=h % 365)).strftime("%Y-%m-%d")
+            if schema_format == "email":
+                return f"{name}_{h % 10000}@example.com"
+            if schema_format in ("uri", "url"):
+                return f"https://example.com/{name}/{h % 10000}"
+
+            value = deterministic_value(seed, name, "string")
+            min_length = schema.get("minLength", 0)
+            max_length = schema.get("maxLength")
+            value = value.ljust(min_length, "x")
+            return value[:max_length] if max_length is not None else value
+
+        if schema_type in ("integer", "number"):
+            value = deterministic_value(seed, name, schema_type)
+            if "minimum" in schema:
+                value = max(value, schema["minimum"])
+            if "maximum" in schema:
+                value = min(value, schema["maximum"])
+            return value
+
+        return deterministic_value(seed, name, schema_type)
+
+
+# --------------------------------------------------
+# Routing
+# --------------------------------------------------
+def path_pattern(path: str) -> re.Pattern:
+    """
+    "/projects/{project_id}" -> regex with one group per path parameter;
+    a trailing slash is optional.
+    """
+    regex = re.sub(r"\\\{.*?\\\}", "([^/]+)", re.escape(path.rstrip("/")))
+    return re.compile(f"^{regex}/?$")
+
+
+class MockOperation:
+    def __init__(self, path: str, method: str, prefix: str, swagger_spec: dict):
+        self.path = path
+        self.method = method
+        self.pattern = path_pattern(prefix + path)
+        self.param_names = re.findall(r"{([^}]+)}", path)
+
+        operation = SpecIndex.for_spec(swagger_spec).operation(path, method)
+        raw = operation.operation if operation else {}
+
+        self.security = raw.get("security", swagger_spec.get("security"))
+        self.allowed_roles: Optional[List[str]] = raw.get("x-roles")
+
+        self.request_content_type = operation.request_content_type if operation else None
+        self.request_schema = None
+        body = raw.get("requestBody") or {}
+        if "$ref" in body:
+            body = SpecIndex.for_spec(swagger_spec).graph.resolve(body)
+        for content_type, media in body.get("content", {}).items():
+            if content_type == self.request_content_type:
+                self.request_schema = media.get("schema")
+        self.body_required = bool(body.get("required", False))
+
+        self.status, self.response_schema = self._success_response(raw.get("responses", {}), swagger_spec)
+
+    @staticmethod
+    def _success_response(responses: dict, swagger_spec: dict):
+        codes = sorted(code for code in map(str, responses) if code.startswith("2"))
+        if not codes:
+            return 200, None
+
+        status = codes[0]
+        response = responses.get(status) or responses.get(int(status)) or {}
+        if "$ref" in response:
+            response = SpecIndex.for_spec(swagger_spec).graph.resolve(response)
+
+        for content_type, media in response.get("content", {}).items():
+            if content_type == "application/json" or content_type.endswith("+json"):
+                return int(status), media.get("schema")
+
+        return int(status), response.get("schema")
+
+
+# --------------------------------------------------
+# Mock API (transport independent)
+# --------------------------------------------------
+class MockAPI:
+    def __init__(
+        self,
+        swagger_spec: dict,
+        roles: Optional[Dict[str, Tuple[str, str]]] = None,
+        login_path: Optional[str] = None,
+        write_roles: Optional[List[str]] = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        collection_size: int = 25,
+        token_secret: str = "mock-server",
+    ):
+        self.swagger_spec = swagger_spec
+        self.roles = roles or DEFAULT_ROLES
+        self.write_roles = set(write_roles or ["admin"])
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.collection_size = collection_size
+
+        self.values = MockValueBuilder(swagger_spec)
+        self.validator = ContractValidator(swagger_spec, constraints=True)
+
+        server_url, endpoints = extract_endpoints(swagger_spec)
+        self.prefix = urlsplit(server_url).path.rstrip("/")
+        self.login_path = login_path or self._find_login_path(endpoints)
+
+        # Spec without any security: everything but the login needs a token
+        self.secure_by_default = not self._declares_security(swagger_spec)
+
+        self.operations = [
+            MockOperation(ep["path"], ep["method"], self.prefix, swagger_spec)
+            for ep in endpoints
+            if ep["method"] not in ("HEAD", "OPTIONS")
+        ]
+
+        self.token_secret = token_secret.encode()
+        self._body = lru_cache(maxsize=4096)(self._render_body)
+
+    @staticmethod
+    def _find_login_path(endpoints: List[dict]) -> str:
+        for ep in endpoints:
+            if ep["method"] == "POST" and ("login" in ep["path"] or ep["path"].endswith("/token")):
+                return ep["path"]
+        return DEFAULT_LOGIN_PATH
+
+    @staticmethod
+    def _declares_security(swagger_spec: dict) -> bool:
+        if swagger_spec.get("security"):
+            return True
+        return any(
+            isinstance(operation, dict) and "security" in operation
+            for path_item in swagger_spec.get("paths", {}).values()
+            for operation in path_item.values()
+        )
+
+    # --------------------------------------------------
+    # Entry point
+    # --------------------------------------------------
+    def handle(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        """
+        Returns (status, headers, body bytes) for one request.
+        """
+        self.delay()
+        headers = {name.lower(): value for name, value in headers.items()}
+
+        parts = urlsplit(target)
+        path = parts.path
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+        if method == "GET" and path in ("/openapi.json", f"{self.prefix}/openapi.json"):
+            return self.json(200, self.public_spec(headers.get("host", "")))
+
+        if method == "POST" and path.rstrip("/") == (self.prefix + self.login_path).rstrip("/"):
+            return self.login(headers, body)
+
+        operation, path_values, allowed_methods = self.route(method, path)
+        if operation is None:
+            if allowed_methods:
+                return self.json(405, {"detail": "Method Not Allowed"})
+            return self.json(404, {"detail": "Not Found"})
+
+        # Authentication and role permissions
+        if operation.security or (operation.security is None and self.secure_by_default):
+            role = self.token_role(headers.get("authorization", ""))
+            if role is None:
+                return self.json(401, {"detail": "Not authenticated"})
+            if not self.permitted(operation, role):
+                return self.json(403, {"detail": "Not enough permissions"})
+
+        # Request body validation
+        payload = None
+        if operation.request_schema is not None and method != "GET":
+            payload, errors = self.parse_body(operation, headers, body)
+            if errors:
+                return self.json(422, {"detail": errors})
+
+        if operation.status == 204 or operation.response_schema is None:
+            return operation.status, {}, b""
+
+        return self.json_bytes(
+            operation.status,
+            self._body(operation, tuple(sorted(path_values.items())), self._page(query), self._overlay(payload)),
+        )
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            time.sleep((self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000)
+
+    def route(self, method: str, path: str):
+        allowed = []
+        for operation in self.operations:
+            match = operation.pattern.match(path)
+            if not match:
+                continue
+            if operation.method == method:
+                return operation, dict(zip(operation.param_names, match.groups())), allowed
+            allowed.append(operation.method)
+        return None, {}, allowed
+
+    # --------------------------------------------------
+    # Authentication
+    # --------------------------------------------------
+    def login(self, headers: Dict[str, str], body: bytes):
+        content_type = headers.get("content-type", "")
+        text = body.decode("utf-8", errors="replace")
+        if "json" in content_type:
+            try:
+                form = json.loads(text or "{}")
+            except ValueError:
+                form = {}
+        else:
+            form = {key: values[0] for key, values in parse_qs(text).items()}
+
+        if form.get("grant_type") == "refresh_token":
+            role = self.token_role(f"Bearer {form.get('refresh_token', '')}", refresh=True)
+        elif "username" not in form or "password" not in form:
+            return self.json(422, {"detail": [
+                {"loc": ["body", field], "msg": "Field required", "type": "missing"}
+                for field in ("username", "password")
+                if field not in form
+            ]})
+        else:
+            role = next(
+                (
+                    name for name, (username, password) in self.roles.items()
+                    if form.get("username") == username and form.get("password") == password
+                ),
+                None,
+            )
+
+        if role is None:
+            return self.json(401, {"detail": "Incorrect username or password"})
+
+        return self.json(200, {
+            "access_token": self.issue_token(role, "access"),
+            "refresh_token": self.issue_token(role, "refresh"),
+            "token_type": "bearer",
+            "expires_in": TOKEN_TTL,
+        })
+
+    def issue_token(self, role: str, kind: str) -> str:
+        # Stateless and signed: tokens cached by clients survive restarts
+        expires = int(time.time()) + TOKEN_TTL
+        return f"mock-{kind}.{role}.{expires}.{self._sign(kind, role, expires)}"
+
+    def token_role(self, authorization: str, refresh: bool = False) -> Optional[str]:
+        scheme, _, token = authorization.partition(" ")
+        kind, _, rest = token.partition(".")
+        role, _, rest = rest.partition(".")
+        expires, _, signature = rest.partition(".")
+
+        if scheme.lower() != "bearer" or kind != ("mock-refresh" if refresh else "mock-access"):
+            return None
+        if not expires.isdigit() or int(expires) < time.time():
+            return None
+        if not hmac.compare_digest(signature, self._sign(kind[5:], role, int(expires))):
+            return None
+        return role if role in self.roles else None
+
+    def _sign(self, kind: str, role: str, expires: int) -> str:
+        message = f"{kind}.{role}.{expires}".encode()
+        return hmac.new(self.token_secret, message, hashlib.sha256).hexdigest()[:32]
+
+    def permitted(self, operation: MockOperation, role: str) -> bool:
+        if operation.allowed_roles is not None:
+            return role in operation.allowed_roles
+        return operation.method == "GET" or role in self.write_roles
+
+    # --------------------------------------------------
+    # Request bodies
+    # --------------------------------------------------
+    def parse_body(self, operation: MockOperation, headers: Dict[str, str], body: bytes):
+        if not body:
+            if operation.body_required:
+                return None, [{"loc": ["body"], "msg": "Field required", "type": "missing"}]
+            return None, []
+
+        text = body.decode("utf-8", errors="replace")
+        if operation.request_content_type == "application/x-www-form-urlencoded":
+            # Form values are all strings: only required fields are checked
+            payload = {key: values[0] for key, values in parse_qs(text).items()}
+            required = self.values.graph.resolve(operation.request_schema).get("required", [])
+            return payload, [
+                {"loc": ["body", field], "msg": "Field required", "type": "missing"}
+                for field in required
+                if field not in payload
+            ]
+
+        try:
+            payload = json.loads(text)
+        except ValueError as e:
+            return None, [{"loc": ["body"], "msg": f"JSON decode error: {e}", "type": "json_invalid"}]
+
+        try:
+            self.validator.validate(payload, operation.request_schema, "body")
+        except AssertionError as e:
+            return payload, [{"loc": ["body"], "msg": str(e), "type": "value_error"}]
+
+        return payload, []
+
+    @staticmethod
+    def _overlay(payload) -> Optional[str]:
+        # Hashable form of the submitted fields echoed into the response
+        if not isinstance(payload, dict):
+            return None
+        scalars = {k: v for k, v in payload.items() if isinstance(v, (str, int, float, bool))}
+        return json.dumps(scalars, sort_keys=True) if scalars else None
+
+    # --------------------------------------------------
+    # Responses
+    # --------------------------------------------------
+    def _page(self, query: Dict[str, str]) -> Optional[Tuple[int, int]]:
+        if not any(name in query for name in PAGE_PARAMS):
+            return None
+
+        def number(*names, default):
+            for name in names:
+                if str(query.get(name, "")).isdigit():
+                    return int(query[name])
+            return default
+
+        limit = max(1, number("limit", "size", "per_page", "page_size", default=10))
+        offset = number("offset", "skip", default=(max(1, number("page", default=1)) - 1) * limit)
+        return offset, limit
+
+    def _render_body(self, operation: MockOperation, path_values: tuple, page, overlay) -> bytes:
+        seed = f"{operation.method} {operation.path} {path_values}"
+        schema = self.values.graph.resolve(operation.response_schema)
+        values = dict(path_values)
+
+        if schema.get("type") == "array":
+            offset, limit = page or (0, 10)
+            count = max(0, min(limit, self.collection_size - offset))
+            data = [
+                self.values.build(schema.get("items", {}), f"{seed}#{offset + index}", "item")
+                for index in range(count)
+            ]
+        else:
+            data = self.values.build(schema, seed)
+            if isinstance(data, dict):
+                self._fill_identifiers(data, schema, values)
+                if overlay:
+                    for key, value in json.loads(overlay).items():
+                        if key in data and not isinstance(data[key], (dict, list)):
+                            data[key] = value
+                self._paginate(data, schema, seed, page)
+
+        return json.dumps(data).encode()
+
+    def _fill_identifiers(self, data: dict, schema: dict, path_values: dict):
+        # /projects/{project_id} answers with that project's id, when the
+        # path value is valid for the field (GET /projects/123 keeps its uuid)
+        properties = schema.get("properties", {})
+        for name, value in path_values.items():
+            if name in data:
+                self._echo(data, name, value, properties.get(name, {}))
+        if path_values and "id" in data:
+            self._echo(data, "id", list(path_values.values())[-1], properties.get("id", {}))
+
+    def _echo(self, data: dict, name: str, value: str, field_schema: dict):
+        field_type = self.values.graph.resolve(field_schema).get("type")
+        if field_type == "integer":
+            if not value.isdigit():
+                return
+            value = int(value)
+        elif field_type not in (None, "string"):
+            return
+
+        try:
+            self.validator.validate(value, field_schema, name)
+        except AssertionError:
+            return
+        data[name] = value
+
+    def _paginate(self, data: dict, schema: dict, seed: str, page):
+        # Envelope objects ({"items": [...], "total": N}) page their first list
+        for key, prop in schema.get("properties", {}).items():
+            if prop.get("type") == "array" and isinstance(data.get(key), list):
+                offset, limit = page or (0, 10)
+                count = max(0, min(limit, self.collection_size - offset))
+                data[key] = [
+                    self.values.build(prop.get("items", {}), f"{seed}#{offset + index}", key)
+                    for index in range(count)
+                ]
+                for total_key in ("total", "count", "total_count"):
+                    if isinstance(data.get(total_key), int):
+                        data[total_key] = self.collection_size
+                return
+
+    def public_spec(self, host: str) -> dict:
+        spec = dict(self.swagger_spec)
+        if host:
+            spec["servers"] = [{"url": f"http://{host}{self.prefix}"}]
+        return spec
+
+    @staticmethod
+    def json(status: int, data) -> Tuple[int, dict, bytes]:
+        return MockAPI.json_bytes(status, json.dumps(data).encode())
+
+    @staticmethod
+    def json_bytes(status: int, body: bytes) -> Tuple[int, dict, bytes]:
+        return status, {"Content-Type": "application/json"}, body
+
+
+# --------------------------------------------------
+# HTTP transport
+# --------------------------------------------------
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes: without TCP_NODELAY every
+    # keep-alive response with a body waits for the client's delayed ACK
+    disable_nagle_algorithm = True
+    api: MockAPI = None
+
+    def _serve(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        status, headers, payload = self.api.handle(self.command, self.path, dict(self.headers), body)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _serve
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockServer:
+    """
+    Threaded HTTP server around a MockAPI; usable as a context manager.
+    """
+
+    def __init__(self, api: MockAPI, host: str = "127.0.0.1", port: int = 0):
+        handler = type("MockHandler", (_MockHandler,), {"api": api})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an OpenAPI spec as a local mock API")
+    parser.add_argument("--spec", required=True, help="OpenAPI JSON file or URL")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--login-path", default=None)
+    parser.add_argument("--latency-ms", type=float, default=float(os.getenv("MOCK_LATENCY_MS", "0")))
+    parser.add_argument("--jitter-ms", type=float, default=float(os.getenv("MOCK_JITTER_MS", "0")))
+    args = parser.parse_args()
+
+    if args.spec.startswith(("http://", "https://")):
+        swagger_spec = read_swagger(args.spec)
+    else:
+        with open(args.spec, encoding="utf-8") as f:
+            swagger_spec = json.load(f)
+
+    api = MockAPI(
+        swagger_spec,
+        roles=parse_roles(os.getenv("MOCK_ROLES", "")) or None,
+        login_path=args.login_path,
+        write_roles=[r for r in os.getenv("MOCK_WRITE_ROLES", "admin").split(",") if r],
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        collection_size=int(os.getenv("MOCK_COLLECTION_SIZE", "25")),
+        token_secret=os.getenv("MOCK_TOKEN_SECRET", "mock-server"),
+    )
+    server = MockServer(api, args.host, args.port)
+
+    print(f"Mock API for {len(api.operations)} operations on {server.base_url}")
+    print(f"Spec: {server.base_url}/openapi.json, login: POST {api.prefix}{api.login_path}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Probe Cache
+-----------
+Per-run memoization of Behavior Explorer probes.
+
+Probes are keyed on (method, url, header fingerprint, body hash) so an
+identical request is sent once per run. Concurrent callers asking for a
+probe that is already in flight wait for the same result instead of
+sending a duplicate.
+
+Entries of an operation are released once it has been explored, so a
+run holds the responses of in-flight operations only, plus the counts.
+"""
+
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+
+def fingerprint(value) -> str:
+    if not value:
+        return ""
+
+    if isinstance(value, bytes):
+        raw = value
+    elif isinstance(value, str):
+        raw = value.encode()
+    else:
+        raw = json.dumps(value, sort_keys=True, default=str).encode()
+
+    return hashlib.sha1(raw).hexdigest()
+
+
+def probe_key(method: str, url: str, headers: Optional[dict] = None, body=None) -> Tuple:
+    return (
+        method.upper(),
+        url,
+        fingerprint(sorted((headers or {}).items())),
+        fingerprint(body),
+    )
+
+
+def operation_of(key: Tuple) -> Tuple[str, str]:
+    return key[0], key[1].split("?", 1)[0]
+
+
+class ProbeCache:
+    def __init__(self):
+        self._results: Dict[Tuple, Future] = {}
+        # (METHOD, url without query) -> its probe keys
+        self._operations: Dict[Tuple[str, str], set] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.deduplicated = 0
+        self.skipped = 0
+
+    @property
+    def requests_saved(self) -> int:
+        return self.deduplicated + self.skipped
+
+    def get_or_call(self, key: Tuple, call: Callable):
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+
+            if owner:
+                future = Future()
+                self._results[key] = future
+                self._operations.setdefault(operation_of(key), set()).add(key)
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+
+        if owner:
+            try:
+                future.set_result(call())
+            except BaseException as e:
+                future.set_exception(e)
+
+        return future.result()
+
+    def release(self, method: str, url: str):
+        """
+        Drops the cached probes (and their responses) of one operation.
+        """
+        with self._lock:
+            for key in self._operations.pop(operation_of((method.upper(), url)), ()):
+                self._results.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def record_skipped(self, count: int):
+        with self._lock:
+            self.skipped += count
+
+    def summary(self) -> str:
+        return (
+            f"{self.executed} requests sent, {self.requests_saved} saved "
+            f"({self.deduplicated} deduplicated, {self.skipped} skipped by probe planning)"
+        )
@@ -0,0 +1,41 @@
+"""
+Per-Host Rate Limiter
+---------------------
+Caps the number of requests per second sent to any single host.
+
+Used by the Behavior Explorer so concurrent exploration does not
+flood the target API.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class HostRateLimiter:
+    def __init__(self, rate_per_second: Optional[float] = None):
+        self.rate_per_second = rate_per_second
+        self.interval = 1.0 / rate_per_second if rate_per_second else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str):
+        """
+        Blocks until the host of `url` may receive another request.
+        Slots are reserved under the lock and slept outside of it,
+        so waiting callers never block other hosts.
+        """
+        if not self.interval:
+            return
+
+        host = urlsplit(url).netloc
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
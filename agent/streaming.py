@@ -0,0 +1,85 @@
+"""
+Streaming Pipeline
+------------------
+Helpers for the explore → classify → write pipeline, which passes
+endpoint records along one at a time instead of building whole
+reports in memory.
+
+- `IntentModelFile` reads a JSON-lines intent model lazily
+  (a legacy JSON-array file is still accepted)
+- `write_jsonl` writes records as they arrive, atomically
+- `bounded_map` is an ordered `Executor.map` that keeps only a
+  window of pending results instead of submitting every item up front
+"""
+
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+DEFAULT_INTENT_MODEL_FILE = "intent_model.jsonl"
+
+
+class IntentModelFile:
+    """
+    Re-iterable view of an intent model file: every iteration
+    re-reads the file, so several passes never hold the model in memory.
+    """
+
+    def __init__(self, file_path: str = DEFAULT_INTENT_MODEL_FILE):
+        self.file_path = Path(file_path)
+
+    def __iter__(self) -> Iterator[dict]:
+        with open(self.file_path, encoding="utf-8") as f:
+            # Legacy intent_model.json: a single indented JSON array
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            f.seek(0)
+
+            if first == "[":
+                yield from json.load(f)
+                return
+
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def write_jsonl(file_path: str, records: Iterable[dict], default: Callable = str) -> int:
+    """
+    Writes one JSON record per line while consuming `records`.
+    The file is only replaced once the stream is exhausted.
+    Returns the number of records written.
+    """
+    file_path = Path(file_path)
+    tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+
+    count = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, default=default))
+            f.write("\n")
+            count += 1
+
+    os.replace(tmp_path, file_path)
+    return count
+
+
+def bounded_map(executor: Executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    Like `executor.map(fn, items)` - results come back in input order -
+    but `items` is consumed lazily and at most `window` calls are pending.
+    """
+    pending = deque()
+
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
@@ -1,8 +1,12 @@
-import requests
+from agent.cassette import Cassette
+from agent.http_session import get_session
 
 
 def read_swagger(swagger_url: str) -> dict:
-    response = requests.get(swagger_url, timeout=10)
+    # Recorded with the exploration so replayed runs need no network
+    cassette = Cassette.from_env("swagger")
+    response = cassette.request(get_session(swagger_url), "GET", swagger_url, timeout=10)
+    cassette.close()
     response.raise_for_status()
     return response.json()
 
@@ -4,15 +4,36 @@ import textwrap
 import re
 import itertools
 import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
 from agent.data_factory import deterministic_value
+from agent.streaming import IntentModelFile, bounded_map, write_jsonl
 from resolution.engine import TestDataResolutionEngine
 from resolution.contracts import TestStepResolutionRequest
+from resolution.component_graph import lookup_ref
+from resolution.lifecycle_graph import LifecycleGraph
+from resolution.schema_compiler import compile_generator
+from resolution.spec_index import SpecIndex
 import uuid
 
-API_TEST_FILE = Path("automation/api/test_generated_api.py")
+API_TEST_DIR = Path("automation/api")
+
+# Generated modules are named test_generated_<tag or path prefix>.py
+GENERATED_PREFIX = "test_generated_"
+
+# Sidecar read by assert_response_contract at test time
+CONTRACT_SCHEMA_FILE = "contract_schemas.json"
+
+# Collected by automation/utils/intent_plugin.py instead of generated modules:
+# the manifest, and the resolved request data it loads lazily
+INTENT_SUITE_FILE = "intent_suite.json"
+INTENT_CASES_FILE = "intent_cases.jsonl"
 
 TC_COUNTER = itertools.count(1)
 
+# One engine for the whole run; it reuses the compiled component graph
+ENGINE = TestDataResolutionEngine()
+
 
 # ----------------------------
 # Helpers
@@ -22,6 +43,19 @@ def next_tc_id() -> str:
     return f"TC_API_{next(TC_COUNTER):03d}"
 
 
+def tc_id_plan(intent_model: Iterable[dict], counter=None):
+    """
+    (endpoint, test case IDs) in generation order: creation endpoints
+    first, so their tests capture IDs for the rest.
+    """
+    counter = counter or TC_COUNTER
+    for creation_pass in (True, False):
+        for ep in intent_model:
+            if (ep.get("classification") == "create") != creation_pass:
+                continue
+            yield ep, [f"TC_API_{next(counter):03d}" for _ in range(tc_id_count(ep))]
+
+
 def safe_test_name(value: str) -> str:
     value = value.strip("/")
     value = re.sub(r"[{}\\/]+", "_", value)
@@ -42,6 +76,21 @@ def bdd_test_name(method: str, path: str) -> str:
     return f"{action}_{clean}"
 
 
+JSON_CONSTANTS = {"null": "None", "true": "True", "false": "False"}
+JSON_TOKEN = re.compile(r'("(?:\\.|[^"\\])*")|\b(null|true|false)\b')
+
+
+def python_literal(value) -> str:
+    """
+    json.dumps layout, but valid Python: null / true / false outside
+    of strings become None / True / False.
+    """
+    return JSON_TOKEN.sub(
+        lambda m: m.group(1) or JSON_CONSTANTS[m.group(2)],
+        json.dumps(value, indent=4),
+    )
+
+
 # ----------------------------
 # Schema-Based Payload Builder
 # ----------------------------
@@ -51,24 +100,8 @@ def build_payload_from_schema(schema: dict, tc_id: str, parent_field: str = ""):
         return None
 
     print(f'schema: {schema}')
-    schema_type = schema.get("type")
-
-    if schema_type == "object":
-        properties = schema.get("properties", {})
-        result = {}
-        for field, field_schema in properties.items():
-            result[field] = build_payload_from_schema(
-                field_schema,
-                tc_id,
-                parent_field=field,
-            )
-        return result
-
-    if schema_type == "array":
-        item_schema = schema.get("items", {})
-        return [build_payload_from_schema(item_schema, tc_id, parent_field)]
-
-    return deterministic_value(tc_id, parent_field, schema_type)
+    generator = compile_generator(schema, default_type=None, formats=False)
+    return generator(tc_id, parent_field)
 
 
 def generate_payload_from_intent(ep: dict, tc_id: str):
@@ -91,10 +124,12 @@ def resolve_with_engine(ep: dict, tc_id: str, swagger_spec_from_Parent: dict):
     """
     Uses TestDataResolutionEngine to resolve payload + query safely.
     Falls back to schema-based builder if resolution fails.
+    Also returns the body fields another operation produces
+    (field -> execution-context keys), filled in at run time.
     """
 
     try:
-        engine = TestDataResolutionEngine()
+        engine = ENGINE
 
         swagger_spec =  swagger_spec_from_Parent  # In real implementation, this would be passed down or accessed globally
         role_context = {
@@ -127,122 +162,396 @@ def resolve_with_engine(ep: dict, tc_id: str, swagger_spec_from_Parent: dict):
                 resolved.body,
                 resolved.query_params,
                 resolved.request_content_type,
+                resolved.metadata.get("links", {}),
                 )
     except Exception as exception:
         # Safe fallback to existing behavior
         print(f"Error resolving test data: {exception}")
         payload = generate_payload_from_intent(ep, tc_id)
         query = generate_query_params_from_intent(ep, tc_id)
-        return payload, query
+        return payload, query, None, {}
 
 
 # ----------------------------
 # Main generator
 # ----------------------------
 
-def generate_tests(base_url: str, intent_model: list, swagger_spec: dict):
+MODULE_HEADER = """import pytest
+from automation.utils.api_runtime import (
+    EXECUTION_CONTEXT,
+    assert_latency,
+    assert_response_contract,
+    capture_resources,
+    fill_payload,
+    log_request_response,
+    safe_request,
+)
 
-    API_TEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+BASE_URL = "{base_url}"
+"""
 
-    header_block = f"""import pytest
-import requests
-import logging
-from resolution.lifecycle_engine import LifecycleChainingEngine
-from resolution.execution_context import ExecutionContext
+# Below this many endpoints, spawning worker processes costs more than it saves
+PARALLEL_THRESHOLD = 50
 
-BASE_URL = "{base_url}"
-EXECUTION_CONTEXT = ExecutionContext()
+# Segments skipped when sharding by path prefix
+PREFIX_NOISE = re.compile(r"^(api|v\d+)$")
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.FileHandler("api_test.log"), logging.StreamHandler()]
-)
+# Methods contract and performance tests may send as a permitted role
+SAFE_METHODS = ("GET", "HEAD")
 
-def log_request_response(method, url, response):
-    logging.info(f"REQUEST {{method}} {{url}}")
-    logging.info(f"Status Code: {{response.status_code}}")
-    logging.info(f"Response Body: {{response.text[:1000]}}")
+# Swagger spec of the current worker process (set by the pool initializer)
+_WORKER_SPEC: dict = {}
 
-def safe_request(method, url, **kwargs):
-    try:
-        return requests.request(method, url, timeout=15, **kwargs)
-    except Exception as e:
-        logging.exception("Request failed")
-        pytest.fail(str(e))
 
-"""
+def path_prefix(path: str) -> str:
+    """
+    First meaningful path segment, e.g. /api/v1/projects/{id} -> projects
+    """
+    for segment in path.strip("/").split("/"):
+        if segment and not PREFIX_NOISE.match(segment) and "{" not in segment:
+            return safe_test_name(segment) or "default"
 
-    code = header_block
+    return "default"
 
-    creation_endpoints = [ep for ep in intent_model if ep.get("classification") == "create"]
-    non_creation_endpoints = [ep for ep in intent_model if ep.get("classification") != "create"]
-    ordered_endpoints = creation_endpoints + non_creation_endpoints
 
-    for ep in ordered_endpoints:
+def shard_name(ep: dict, swagger_spec: dict, shard_by: str = "tag") -> str:
+    """
+    Module a test lands in: the operation's first OpenAPI tag,
+    or the first meaningful path segment.
+    """
+    if shard_by == "tag":
+        operation = SpecIndex.for_spec(swagger_spec).operation(ep["endpoint"], ep["method"])
+        if operation and operation.tags:
+            return safe_test_name(operation.tags[0]) or "default"
 
-        method = ep["method"].upper()
-        raw_path = ep["endpoint"]
-        tc_id_base = next_tc_id()
+    return path_prefix(ep["endpoint"])
 
-        runtime_path = replace_path_params_with_swagger(
-            raw_path,
-            method,
-            swagger_spec,
-            tc_id_base,
-        )
 
-        classification = ep.get("classification", "unknown")
-        risk = ep.get("risk_level", "medium")
-        roles_info = ep.get("roles", {})
-        role_access = roles_info.get("role_access", {})
-        requires_auth = roles_info.get("requires_auth", False)
+def lifecycle_graph(intent_model: Iterable[dict], swagger_spec: dict) -> Optional[LifecycleGraph]:
+    """
+    Producer / consumer DAG (`resolution/lifecycle_graph.py`) of the spec
+    with the intent model's classifications, None without a spec. Built
+    once per generation run and passed to `dependency_groups`,
+    `chain_positions` and `capture_rules`.
+    """
+    if not swagger_spec:
+        return None
+
+    classifications = {
+        (ep["method"].upper(), ep["endpoint"]): ep.get("classification")
+        for ep in intent_model
+    }
+    return LifecycleGraph(swagger_spec, classifications)
 
-        test_base_name = bdd_test_name(method, raw_path)
-        url_expr = f'f"{{BASE_URL}}{runtime_path}"'
 
-        payload, query_params, content_type = resolve_with_engine(
-            ep, tc_id_base, swagger_spec
-        )
+def dependency_groups(intent_model: Iterable[dict], graph: Optional[LifecycleGraph] = None) -> dict:
+    """
+    xdist group per lifecycle chain.
+
+    With the spec's graph, chains are the components of the producer /
+    consumer DAG: a create endpoint plus every endpoint consuming the path
+    parameter it produces. Without it, a resource that has a create
+    endpoint forms a chain with every endpoint of the same path prefix
+    that consumes a path parameter.
+    Chain members must run on one worker so captured IDs are visible;
+    all other endpoints are left ungrouped and distributed freely.
+
+    Single pass: only (method, path) keys are kept, not the entries.
+    """
+    if graph is not None:
+        nodes = {(ep["method"].upper(), ep["endpoint"]) for ep in intent_model}
+
+        return {
+            node: name
+            for name, chain in graph.chains().items()
+            for node in chain
+            if node in nodes
+        }
+
+    creators = set()
+    consumers = set()
+    candidates = {}
+
+    for ep in intent_model:
+        prefix = path_prefix(ep["endpoint"])
+        is_create = ep.get("classification") == "create"
+        consumes = "{" in ep["endpoint"]
+
+        if is_create:
+            creators.add(prefix)
+        if consumes:
+            consumers.add(prefix)
+        if is_create or consumes:
+            candidates[(ep["method"].upper(), ep["endpoint"])] = prefix
+
+    chained = creators & consumers
+
+    return {
+        key: f"lifecycle_{prefix}"
+        for key, prefix in candidates.items()
+        if prefix in chained
+    }
+
+
+def chain_positions(intent_model: Iterable[dict], graph: Optional[LifecycleGraph] = None) -> dict:
+    """
+    (METHOD, path) -> position in its lifecycle chain's topological order
+    (`LifecycleGraph.chains()`), so a parent create runs before the creates
+    nested below it whatever module they land in. Without the graph, the
+    number of path parameters stands in for the depth of the chain.
+    """
+    if graph is not None:
+        nodes = {(ep["method"].upper(), ep["endpoint"]) for ep in intent_model}
+
+        return {
+            node: position
+            for chain in graph.chains().values()
+            for position, node in enumerate(node for node in chain if node in nodes)
+        }
+
+    return {
+        (ep["method"].upper(), ep["endpoint"]): ep["endpoint"].count("{")
+        for ep in intent_model
+    }
+
+
+def capture_rules(intent_model: Iterable[dict], graph: Optional[LifecycleGraph]) -> dict:
+    """
+    (METHOD, path) of each create endpoint -> the extraction rules of the
+    values it produces, e.g. {"project_id": "id", "project.id": "id"}.
+    """
+    rules = {}
+    if graph is None:
+        return rules
+
+    for ep in intent_model:
+        node = (ep["method"].upper(), ep["endpoint"])
+        if graph.classifications.get(node) == "create":
+            captures = graph.captures(node)
+            if captures:
+                rules[node] = captures
+    return rules
+
+
+def tc_id_count(ep: dict) -> int:
+    """
+    Number of test case IDs consumed by one endpoint:
+    base + one per role + unauthenticated + contract.
+    """
+    roles_info = ep.get("roles", {})
+    return (
+        1
+        + len(roles_info.get("role_access", {}))
+        + (1 if roles_info.get("requires_auth", False) else 0)
+        + 1
+    )
+
+
+def contract_role_for(role_access: dict, method: str = None):
+    """
+    Role used by the contract test: admin if permitted, else the first permitted role.
+    With a `method`, only safe methods are authenticated: a write would
+    create, change or delete live resources outside the lifecycle chain.
+    """
+    if method is not None and method.upper() not in SAFE_METHODS:
+        return None
+
+    allowed = [role for role, is_allowed in role_access.items() if is_allowed]
+    if "admin" in allowed:
+        return "admin"
+    return allowed[0] if allowed else None
+
+
+def response_body_schema(response: dict):
+    """
+    JSON schema of one documented response (OpenAPI 3 content or Swagger 2 schema).
+    """
+    for content_type, media in response.get("content", {}).items():
+        if content_type == "application/json" or content_type.endswith("+json"):
+            return media.get("schema")
+
+    return response.get("schema")
+
+
+def contract_document(swagger_spec: dict) -> dict:
+    """
+    Response schemas of every operation, keyed "METHOD path" -> status,
+    plus the component schemas their $refs point to.
+    Schemas are kept raw; the runtime validator resolves $refs lazily.
+    """
+    operations = {}
+
+    for (path, method), op in SpecIndex.for_spec(swagger_spec).operations.items():
+        schemas = {}
+        for status, response in op.responses.items():
+            if "$ref" in response:
+                response = lookup_ref(swagger_spec, response["$ref"])
+            schema = response_body_schema(response)
+            if schema:
+                schemas[str(status)] = schema
+
+        if schemas:
+            operations[f"{method} {path}"] = schemas
+
+    return {
+        "components": {
+            "schemas": swagger_spec.get("components", {}).get("schemas", {}),
+        },
+        "definitions": swagger_spec.get("definitions", {}),
+        "operations": operations,
+    }
+
+
+def _init_worker(swagger_spec: dict):
+    global _WORKER_SPEC
+    _WORKER_SPEC = swagger_spec
+
 
-        payload_code = json.dumps(payload, indent=4) if payload else "None"
-        query_code = json.dumps(query_params, indent=4) if query_params else "None"
+def _render_job(job):
+    ep, tc_ids, group, shard, captures, position = job
+    return shard, render_endpoint_tests(ep, tc_ids, _WORKER_SPEC, group, captures, position)
 
-        # --------------------------------------------------
-        # ROLE BASED TESTS
-        # --------------------------------------------------
-        if role_access:
 
-            for role_name, is_allowed in role_access.items():
+def _case_job(job):
+    ep, tc_ids = job
+    return intent_case(ep, tc_ids[0], _WORKER_SPEC)
 
-                tc_id = next_tc_id()
-                fixture_name = f"{role_name}_headers"
 
-                if is_allowed:
+class ModuleWriter:
+    """
+    Appends rendered chunks to one generated module as they arrive.
+    Output matches "".join(parts).strip() + "\n": trailing whitespace
+    of each chunk is held back until more content follows.
+    """
+
+    def __init__(self, path: Path, header: str):
+        self.path = path
+        self.tmp_path = path.with_name(f".{path.name}.partial")
+        self.file = open(self.tmp_path, "w", encoding="utf-8")
+        self.pending = ""
+        self.started = False
+        self.write(header)
+
+    def write(self, chunk: str):
+        if not self.started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return
+            self.started = True
+
+        body = chunk.rstrip()
+        if body:
+            self.file.write(self.pending + body)
+            self.pending = chunk[len(body):]
+        else:
+            self.pending += chunk
+
+    def close(self):
+        self.file.write("\n")
+        self.file.close()
+
+    def commit(self):
+        os.replace(self.tmp_path, self.path)
 
-                    request_block = (
-                        f"""response = safe_request(
+    def discard(self):
+        if not self.file.closed:
+            self.file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+def render_endpoint_tests(
+    ep: dict,
+    tc_ids: list,
+    swagger_spec: dict,
+    group: str = None,
+    captures: dict = None,
+    position: int = 0,
+) -> str:
+    """
+    Renders all tests of one endpoint.
+    Test case IDs are assigned up front so output does not depend on
+    which worker renders the endpoint.
+    """
+    tc_ids = iter(tc_ids)
+    parts = []
+
+    method = ep["method"].upper()
+    raw_path = ep["endpoint"]
+    tc_id_base = next(tc_ids)
+
+    # Lifecycle chains keep their captures in their own namespace
+    context_expr = f"EXECUTION_CONTEXT.namespace('{group}')" if group else "EXECUTION_CONTEXT"
+
+    runtime_path = replace_path_params_with_swagger(
+        raw_path,
+        method,
+        swagger_spec,
+        tc_id_base,
+        context_expr,
+    )
+
+    classification = ep.get("classification", "unknown")
+    risk = ep.get("risk_level", "medium")
+    roles_info = ep.get("roles", {})
+    role_access = roles_info.get("role_access", {})
+    requires_auth = roles_info.get("requires_auth", False)
+
+    test_base_name = bdd_test_name(method, raw_path)
+
+    # Ordering inside a run and xdist placement of lifecycle chains
+    scheduling_marks = f'@pytest.mark.lifecycle("{classification}", {position})\n'
+    if group:
+        scheduling_marks += f'@pytest.mark.xdist_group("{group}")\n'
+    url_expr = f'f"{{BASE_URL}}{runtime_path}"'
+
+    payload, query_params, content_type, links = resolve_with_engine(
+        ep, tc_id_base, swagger_spec
+    )
+
+    payload_code = python_literal(payload) if payload else "None"
+    # Produced fields: a captured ID replaces the generated value
+    if payload and links:
+        payload_code = f"fill_payload({payload_code}, {context_expr}, {json.dumps(links)})"
+    query_code = python_literal(query_params) if query_params else "None"
+
+    # --------------------------------------------------
+    # ROLE BASED TESTS
+    # --------------------------------------------------
+    if role_access:
+
+        for role_name, is_allowed in role_access.items():
+
+            tc_id = next(tc_ids)
+            fixture_name = f"{role_name}_headers"
+
+            if is_allowed:
+
+                request_block = (
+                    f"""response = safe_request(
+        http_session,
         "{method}",
         url,
+        endpoint="{raw_path}",
+        role="{role_name}",
         headers={fixture_name},"""
-                    )
+                )
 
-                    if content_type == "application/x-www-form-urlencoded":
-                        request_block += """
+                if content_type == "application/x-www-form-urlencoded":
+                    request_block += """
         data=payload if payload else None,"""
-                    else:
-                        request_block += """
+                else:
+                    request_block += """
         json=payload if payload else None,"""
 
-                    request_block += """
+                request_block += """
         params=query if query else None
     )"""
 
-                    code += f"""
+                parts.append(f"""
 @pytest.mark.functional
 @pytest.mark.rbac
 @pytest.mark.{risk}
-def test_{test_base_name}_as_{role_name}({fixture_name}):
+{scheduling_marks}def test_{test_base_name}_as_{role_name}(http_session, {fixture_name}):
     \"\"\"
     Test Case ID: {tc_id}
     Role: {role_name}
@@ -257,76 +566,313 @@ def test_{test_base_name}_as_{role_name}({fixture_name}):
     {request_block}
 
     log_request_response("{method}", url, response)
-"""
+""")
 
-                    # Lifecycle capture ONLY for create
-                    if classification == "create":
-                        code += """
+                # Lifecycle capture ONLY for create
+                if classification == "create":
+                    capture_args = f", rules={json.dumps(captures)}" if captures else ""
+                    parts.append(f"""
     try:
-        data = response.json()
-        captured = LifecycleChainingEngine.extract_resource_values(data, {})
-        EXECUTION_CONTEXT.register(captured)
+        captured = capture_resources(response{capture_args})
+        {context_expr}.register(captured)
     except Exception:
         pass
-"""
+""")
 
-                    code += """
+                parts.append("""
     assert response.status_code in (200, 201, 202, 204)
-"""
+""")
 
-                else:
+            else:
 
-                    code += f"""
+                parts.append(f"""
 @pytest.mark.security
 @pytest.mark.rbac
 @pytest.mark.{risk}
-def test_{test_base_name}_as_{role_name}_forbidden({fixture_name}):
+{scheduling_marks}def test_{test_base_name}_as_{role_name}_forbidden(http_session, {fixture_name}):
 
     url = {url_expr}
-    response = safe_request("{method}", url, headers={fixture_name})
+    response = safe_request(
+        http_session, "{method}", url, endpoint="{raw_path}", role="{role_name}", headers={fixture_name}
+    )
     log_request_response("{method}", url, response)
 
     assert response.status_code in (401, 403)
-"""
+""")
 
-        # --------------------------------------------------
-        # UNAUTHENTICATED TEST
-        # --------------------------------------------------
-        if requires_auth:
+    # --------------------------------------------------
+    # UNAUTHENTICATED TEST
+    # --------------------------------------------------
+    if requires_auth:
 
-            tc_id = next_tc_id()
+        tc_id = next(tc_ids)
 
-            code += f"""
+        parts.append(f"""
 @pytest.mark.security
 @pytest.mark.{risk}
-def test_{test_base_name}_without_auth():
+{scheduling_marks}def test_{test_base_name}_without_auth(http_session):
 
     url = {url_expr}
-    response = safe_request("{method}", url)
+    response = safe_request(http_session, "{method}", url, endpoint="{raw_path}")
     log_request_response("{method}", url, response)
 
     assert response.status_code in (401, 403)
-"""
+""")
+
+    # --------------------------------------------------
+    # CONTRACT TEST
+    # --------------------------------------------------
+    tc_id = next(tc_ids)
+
+    # Validated as a permitted role when there is one, so the documented
+    # success schema (not just the 401 body) is what gets checked; writes
+    # stay unauthenticated
+    contract_role = contract_role_for(role_access, method)
+    if contract_role:
+        contract_fixture = f"{contract_role}_headers"
+        contract_args = f"http_session, {contract_fixture}"
+        contract_headers = f', role="{contract_role}", headers={contract_fixture}'
+    else:
+        contract_args = "http_session"
+        contract_headers = ""
+
+    parts.append(f"""
+@pytest.mark.contract
+@pytest.mark.{risk}
+{scheduling_marks}def test_{test_base_name}_contract_stability({contract_args}):
 
-        # --------------------------------------------------
-        # CONTRACT TEST
-        # --------------------------------------------------
-        tc_id = next_tc_id()
+    url = {url_expr}
+    response = safe_request(http_session, "{method}", url, endpoint="{raw_path}"{contract_headers})
+    log_request_response("{method}", url, response)
 
-        code += f"""
-@pytest.mark.contract
+    assert response.status_code < 500
+    assert_response_contract(response, "{method}", "{raw_path}")
+""")
+
+    # --------------------------------------------------
+    # PERFORMANCE TEST
+    # --------------------------------------------------
+    # Only for safe operations with a latency baseline from exploration:
+    # writes are timed by their role test, never replayed
+    baseline = ep.get("latency_ms")
+    if baseline and method in SAFE_METHODS:
+        baseline_code = f'{{"median": {baseline["median"]!r}, "p95": {baseline["p95"]!r}}}'
+
+        parts.append(f"""
+@pytest.mark.performance
 @pytest.mark.{risk}
-def test_{test_base_name}_contract_stability():
+{scheduling_marks}def test_{test_base_name}_performance({contract_args}):
 
     url = {url_expr}
-    response = safe_request("{method}", url)
+    response = safe_request(http_session, "{method}", url, endpoint="{raw_path}"{contract_headers})
     log_request_response("{method}", url, response)
 
     assert response.status_code < 500
-"""
+    assert_latency(response, {baseline_code})
+""")
+
+    return "".join(parts)
+
+
+def generate_tests(
+    base_url: str,
+    intent_model: Iterable[dict],
+    swagger_spec: dict,
+    workers: int = None,
+    shard_by: str = "tag",
+):
+    """
+    Renders test modules from the intent model.
+
+    `intent_model` may be a list or any re-iterable source such as
+    `IntentModelFile`; it is read in passes (dependency groups, creation
+    endpoints, everything else) and rendered chunks are streamed straight
+    into the module files, so entries are never all held in memory.
+    A one-shot iterator is materialised first.
+    """
+
+    API_TEST_DIR.mkdir(parents=True, exist_ok=True)
+
+    if iter(intent_model) is intent_model:
+        intent_model = list(intent_model)
+
+    graph = lifecycle_graph(intent_model, swagger_spec)
+    groups = dependency_groups(intent_model, graph)
+    captures = capture_rules(intent_model, graph)
+    positions = chain_positions(intent_model, graph)
+
+    def jobs():
+        for ep, tc_ids in tc_id_plan(intent_model):
+            key = (ep["method"].upper(), ep["endpoint"])
+            yield (
+                ep,
+                tc_ids,
+                groups.get(key),
+                shard_name(ep, swagger_spec, shard_by),
+                captures.get(key),
+                positions.get(key, 0),
+            )
+
+    workers = workers or os.cpu_count() or 1
+    header = MODULE_HEADER.format(base_url=base_url)
+
+    # One module per tag / path prefix, creation-first order kept inside each
+    modules = {}
+    try:
+        if workers > 1 and is_large(intent_model):
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(swagger_spec,),
+            ) as pool:
+                write_modules(modules, bounded_map(pool, _render_job, jobs(), workers * 16), header)
+        else:
+            rendered = (
+                (shard, render_endpoint_tests(ep, tc_ids, swagger_spec, group, captures, position))
+                for ep, tc_ids, group, shard, captures, position in jobs()
+            )
+            write_modules(modules, rendered, header)
+    except BaseException:
+        for writer in modules.values():
+            writer.discard()
+        raise
 
-    API_TEST_FILE.write_text(code.strip(), encoding="utf-8")
-    print(f"[GENERATED] {API_TEST_FILE}")
+    # Drop modules from previous runs (including the legacy single file)
+    # and a plugin-collected suite, which would run the same tests again
+    remove_generated_suites()
+
+    for writer in modules.values():
+        writer.commit()
+        print(f"[GENERATED] {writer.path}")
+
+    write_contract_schemas(swagger_spec)
+
+
+def remove_generated_suites():
+    for stale in API_TEST_DIR.glob(f"{GENERATED_PREFIX}*.py"):
+        stale.unlink()
+    for name in (INTENT_SUITE_FILE, INTENT_CASES_FILE):
+        (API_TEST_DIR / name).unlink(missing_ok=True)
+
+
+def write_contract_schemas(swagger_spec: dict):
+    # Response schemas for the contract tests' full validation
+    contract_path = API_TEST_DIR / CONTRACT_SCHEMA_FILE
+    contract_path.write_text(
+        json.dumps(contract_document(swagger_spec), indent=2),
+        encoding="utf-8",
+    )
+    print(f"[GENERATED] {contract_path}")
+
+
+# ----------------------------
+# Plugin-collected suite
+# ----------------------------
+
+def intent_case(ep: dict, tc_id_base: str, swagger_spec: dict) -> dict:
+    """
+    Resolved request data of one endpoint: what a generated module
+    would have rendered as literals.
+    """
+    method = ep["method"].upper()
+    payload, query_params, content_type, links = resolve_with_engine(ep, tc_id_base, swagger_spec)
+
+    return {
+        "key": f"{method} {ep['endpoint']}",
+        "payload": payload or None,
+        "links": links if payload else {},
+        "query": query_params or None,
+        "content_type": content_type,
+        "path_params": path_param_fallbacks(ep["endpoint"], method, swagger_spec, tc_id_base),
+    }
+
+
+def generate_intent_suite(
+    base_url: str,
+    intent_model_file: str,
+    swagger_spec: dict,
+    workers: int = None,
+    shard_by: str = "tag",
+):
+    """
+    Writes the inputs of the intent-model pytest plugin instead of test
+    modules: a manifest (base URL, intent model location, module of each
+    operation) and one line of resolved request data per operation.
+    Test names, TC IDs and markers are derived at collection time.
+    """
+    API_TEST_DIR.mkdir(parents=True, exist_ok=True)
+
+    intent_model = IntentModelFile(intent_model_file)
+    jobs = tc_id_plan(intent_model)
+    workers = workers or os.cpu_count() or 1
+
+    remove_generated_suites()
+
+    cases_path = API_TEST_DIR / INTENT_CASES_FILE
+    if workers > 1 and is_large(intent_model):
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(swagger_spec,),
+        ) as pool:
+            count = write_jsonl(cases_path, bounded_map(pool, _case_job, jobs, workers * 16))
+    else:
+        count = write_jsonl(
+            cases_path, (intent_case(ep, tc_ids[0], swagger_spec) for ep, tc_ids in jobs)
+        )
+
+    graph = lifecycle_graph(intent_model, swagger_spec)
+    manifest_path = API_TEST_DIR / INTENT_SUITE_FILE
+    manifest_path.write_text(
+        json.dumps(
+            {
+                "base_url": base_url,
+                "intent_model": str(intent_model_file),
+                "cases": INTENT_CASES_FILE,
+                "groups": {
+                    f"{method} {path}": group
+                    for (method, path), group in dependency_groups(intent_model, graph).items()
+                },
+                "positions": {
+                    f"{method} {path}": position
+                    for (method, path), position in chain_positions(intent_model, graph).items()
+                },
+                "captures": {
+                    f"{method} {path}": rules
+                    for (method, path), rules in capture_rules(intent_model, graph).items()
+                },
+                "shards": {
+                    f"{ep['method'].upper()} {ep['endpoint']}": shard_name(ep, swagger_spec, shard_by)
+                    for ep in intent_model
+                },
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    print(f"[GENERATED] {manifest_path} ({count} operations, collected by automation/utils/intent_plugin.py)")
+    print(f"[GENERATED] {cases_path}")
+
+    write_contract_schemas(swagger_spec)
+
+
+def is_large(intent_model: Iterable[dict]) -> bool:
+    return any(
+        True for _ in itertools.islice(intent_model, PARALLEL_THRESHOLD - 1, None)
+    )
+
+
+def write_modules(modules: dict, rendered: Iterable, header: str):
+    for shard, chunk in rendered:
+        writer = modules.get(shard)
+        if writer is None:
+            writer = modules[shard] = ModuleWriter(
+                API_TEST_DIR / f"{GENERATED_PREFIX}{shard}.py", header
+            )
+        writer.write(chunk)
+
+    for writer in modules.values():
+        writer.close()
 
 
 def replace_path_params(path: str, tc_id: str):
@@ -336,54 +882,61 @@ def replace_path_params(path: str, tc_id: str):
     return re.sub(r"{([^}]+)}", replacer, path)
 
 
-def replace_path_params_with_swagger(path: str, method: str, swagger_spec: dict, tc_id: str):
-    """
-    Replaces {path} parameters using Swagger schema.
-    Supports uuid format properly.
-    """
+def path_param_fallback(schema: dict, tc_id: str, param_name: str) -> str:
+    param_type = schema.get("type")
+    param_format = schema.get("format")
 
-    paths = swagger_spec.get("paths", {})
-    path_item = paths.get(path, {})
-    operation = path_item.get(method.lower(), {})
+    # ---- UUID FIX ----
+    if param_format == "uuid":
+        return str(uuid.uuid4())
 
-    # Collect parameters from both path-level and operation-level
-    parameters = []
-    parameters.extend(path_item.get("parameters", []))
-    parameters.extend(operation.get("parameters", []))
+    # ---- INTEGER ----
+    if param_type == "integer":
+        return "1"
 
-    param_map = {
-        p["name"]: p.get("schema", {})
-        for p in parameters
-        if p.get("in") == "path"
-    }
+    # ---- DEFAULT ----
+    return deterministic_value(
+        tc_id,
+        param_name,
+        param_type or "string"
+    )
 
-    def replacer(match):
-        param_name = match.group(1)
-        schema = param_map.get(param_name, {})
 
-        param_type = schema.get("type")
-        param_format = schema.get("format")
+def path_param_fallbacks(path: str, method: str, swagger_spec: dict, tc_id: str) -> dict:
+    """
+    Value used for each {path} parameter while nothing was captured.
+    Supports uuid format properly.
+    """
+
+    # Path-level and operation-level parameters, merged once per spec
+    operation = SpecIndex.for_spec(swagger_spec).operation(path, method)
+    param_map = operation.path_params if operation else {}
 
-        # ---- UUID FIX ----
-        if param_format == "uuid":
-            fallback = str(uuid.uuid4())
+    return {
+        name: path_param_fallback(param_map.get(name, {}), tc_id, name)
+        for name in re.findall(r"{([^}]+)}", path)
+    }
 
-        # ---- INTEGER ----
-        elif param_type == "integer":
-            fallback = "1"
 
-        # ---- DEFAULT ----
-        else:
-            fallback = deterministic_value(
-                tc_id,
-                param_name,
-                param_type or "string"
-            )
+def replace_path_params_with_swagger(
+    path: str,
+    method: str,
+    swagger_spec: dict,
+    tc_id: str,
+    context_expr: str = "EXECUTION_CONTEXT",
+):
+    """
+    Replaces {path} parameters using Swagger schema.
+    `context_expr` is the (namespaced) execution context captures are read from.
+    """
+    fallbacks = path_param_fallbacks(path, method, swagger_spec, tc_id)
 
-        # Runtime-safe expression for lifecycle chaining
+    # Runtime-safe expression for lifecycle chaining
+    def replacer(match):
+        param_name = match.group(1)
         return (
             "{"
-            + f"EXECUTION_CONTEXT.get('{param_name}') or '{fallback}'"
+            + f"{context_expr}.get('{param_name}') or '{fallbacks[param_name]}'"
             + "}"
         )
 
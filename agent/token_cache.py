@@ -0,0 +1,173 @@
+"""
+Role Token Cache
+----------------
+On-disk cache of OAuth2 tokens shared by `authenticate_role` and the
+generated suite's `conftest.py` (including every pytest-xdist worker).
+
+- Keyed by base URL + role + client_id (`oauth_client_id`, the same for
+  the agent and the suite, so either reuses the other's tokens)
+- Expiry taken from the JWT `exp` claim (or `expires_in`)
+- Tokens are refreshed REFRESH_MARGIN seconds before they expire,
+  with a refresh_token grant when one was issued
+- Optional encryption at rest: set TOKEN_CACHE_KEY to a Fernet key
+  (requires the `cryptography` package)
+
+Environment overrides:
+- CLIENT_ID        → OAuth2 client_id of every role login (default "string")
+- TOKEN_CACHE_FILE → cache location (default ~/.cache/automation-agent/tokens.json)
+- TOKEN_CACHE_KEY  → Fernet key enabling encryption at rest
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from filelock import FileLock
+
+DEFAULT_CACHE_FILE = Path.home() / ".cache" / "automation-agent" / "tokens.json"
+
+# Refresh this many seconds before expiry
+REFRESH_MARGIN = 60
+
+# Lifetime assumed for tokens that carry no expiry information
+DEFAULT_TTL = 300
+
+DEFAULT_CLIENT_ID = "string"
+
+_lock = threading.Lock()
+
+
+def oauth_client_id() -> str:
+    return os.getenv("CLIENT_ID") or DEFAULT_CLIENT_ID
+
+
+def cache_key(base_url: str, role: str, client_id: Optional[str]) -> str:
+    return f"{base_url.rstrip('/')}|{role}|{client_id or ''}"
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """
+    Reads the `exp` claim of a JWT without verifying it.
+    Returns None for opaque (non-JWT) tokens.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims["exp"])
+    except Exception:
+        return None
+
+
+def token_entry(token_response: dict) -> dict:
+    """
+    Normalizes a token endpoint response into a cache entry.
+    """
+    access_token = token_response.get("access_token")
+    if not access_token:
+        raise ValueError("Authentication succeeded but access_token missing")
+
+    expires_at = jwt_expiry(access_token)
+    if expires_at is None and token_response.get("expires_in"):
+        expires_at = time.time() + float(token_response["expires_in"])
+    if expires_at is None:
+        expires_at = time.time() + DEFAULT_TTL
+
+    return {
+        "access_token": access_token,
+        "refresh_token": token_response.get("refresh_token"),
+        "expires_at": expires_at,
+    }
+
+
+class TokenCache:
+    def __init__(self, file_path: Optional[str] = None, encryption_key: Optional[str] = None):
+        self.file_path = Path(file_path or os.getenv("TOKEN_CACHE_FILE") or DEFAULT_CACHE_FILE)
+        self.lock = FileLock(f"{self.file_path}.lock")
+
+        encryption_key = encryption_key or os.getenv("TOKEN_CACHE_KEY")
+        self.fernet = None
+        if encryption_key:
+            try:
+                from cryptography.fernet import Fernet
+            except ImportError as e:
+                raise RuntimeError(
+                    "TOKEN_CACHE_KEY is set but the 'cryptography' package is not installed"
+                ) from e
+            self.fernet = Fernet(encryption_key)
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def get_token(
+        self,
+        key: str,
+        fetch: Callable[[], dict],
+        refresh: Optional[Callable[[str], dict]] = None,
+    ) -> str:
+        """
+        Returns a valid access token for `key`.
+
+        fetch()                → full grant (e.g. password), returns the token response
+        refresh(refresh_token) → refresh_token grant, returns the token response
+        """
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with _lock, self.lock:
+            entries = self._load()
+            entry = entries.get(key)
+
+            if entry and entry["expires_at"] - REFRESH_MARGIN > time.time():
+                return entry["access_token"]
+
+            entry = self._renew(entry, fetch, refresh)
+            entries[key] = entry
+            self._save(entries)
+
+            return entry["access_token"]
+
+    def invalidate(self, key: str):
+        with _lock, self.lock:
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._save(entries)
+
+    # --------------------------------------------------
+    # Internals
+    # --------------------------------------------------
+    def _renew(self, entry, fetch, refresh) -> dict:
+        if entry and entry.get("refresh_token") and refresh:
+            try:
+                return token_entry(refresh(entry["refresh_token"]))
+            except Exception:
+                # Refresh token expired or revoked: fall back to a full grant
+                pass
+
+        return token_entry(fetch())
+
+    def _load(self) -> Dict[str, dict]:
+        if not self.file_path.exists():
+            return {}
+
+        raw = self.file_path.read_bytes()
+        try:
+            if self.fernet:
+                raw = self.fernet.decrypt(raw)
+            return json.loads(raw)
+        except Exception:
+            # Unreadable cache (corrupt or different key): start over
+            return {}
+
+    def _save(self, entries: Dict[str, dict]):
+        raw = json.dumps(entries).encode()
+        if self.fernet:
+            raw = self.fernet.encrypt(raw)
+
+        tmp_path = self.file_path.with_suffix(".tmp")
+        tmp_path.write_bytes(raw)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, self.file_path)
@@ -1,20 +1,82 @@
 import os
 import pytest
-import requests
+
+from agent.cassette import placeholder_token
+from agent.http_session import get_session, close_sessions
+from agent.token_cache import TokenCache, cache_key, oauth_client_id
+from automation.utils.api_runtime import CASSETTE, EXECUTION_CONTEXT
+from automation.utils.intent_plugin import pytest_collect_file  # noqa: F401 (collects intent_suite.json)
+from automation.utils.capture import configure_logging, end_test, start_test
+from automation.utils.latency_report import LATENCY, latency_html, write_latency_report
 
 BASE_URL = os.getenv("BASE_URL")
+TOKEN_CACHE = TokenCache()
+
+# Generated tests run create -> read/search -> update -> delete, and in
+# chain order within a phase (second argument of the lifecycle marker)
+LIFECYCLE_ORDER = {"create": 0, "read": 1, "search": 1, "update": 2, "delete": 3}
+
+
+def pytest_configure(config):
+    # Log files are opened here, not when the runtime is imported
+    configure_logging("api_test.log")
+
+    # Each run starts with an empty shared context; xdist workers join the
+    # controller's. CI shards sharing one file set EXECUTION_CONTEXT_KEEP=1
+    if not hasattr(config, "workerinput") and os.getenv("EXECUTION_CONTEXT_KEEP", "0") != "1":
+        EXECUTION_CONTEXT.clear()
+
+
+def pytest_collection_modifyitems(items):
+    def phase(item):
+        marker = item.get_closest_marker("lifecycle")
+        if marker is None:
+            return (1, 0)
+        position = marker.args[1] if len(marker.args) > 1 else 0
+        return (LIFECYCLE_ORDER.get(marker.args[0], 1), position)
+
+    # Stable sort: collection order is kept among equal (phase, position)
+    items.sort(key=phase)
+
+
+# Latency histograms and cassette counts: xdist workers send theirs to
+# the controller, which writes the merged report (a plain run writes its own)
+def pytest_sessionfinish(session):
+    CASSETTE.close()
+
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["latency"] = LATENCY.to_dict()
+        workeroutput["cassette"] = CASSETTE.to_dict()
+    else:
+        write_latency_report()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    workeroutput = getattr(node, "workeroutput", {})
+    LATENCY.merge_dict(workeroutput.get("latency", {}))
+    CASSETTE.merge_dict(workeroutput.get("cassette", {}))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if CASSETTE.mode == "off":
+        return
+
+    terminalreporter.write_sep("-", f"cassette: {CASSETTE.summary()}")
+    for line in CASSETTE.unmatched_report():
+        terminalreporter.write_line(line)
+
 
-def login(username: str, password: str) -> str:
-    response = requests.post(
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    prefix.extend(latency_html())
+
+
+def token_request(form_data: dict) -> dict:
+    response = get_session(BASE_URL).post(
         f"{BASE_URL}/api/v1/auth/auth/login",
-        data={
-            "grant_type": os.getenv("GRANT_TYPE", "password"),
-            "username": username,
-            "password": password,
-            "scope": os.getenv("SCOPE", ""),
-            "client_id": os.getenv("CLIENT_ID"),
-            "client_secret": os.getenv("CLIENT_SECRET"),
-        },
+        data=form_data,
         headers={
             "Content-Type": "application/x-www-form-urlencoded",
             "Accept": "application/json",
@@ -23,12 +85,63 @@ def login(username: str, password: str) -> str:
     )
 
     response.raise_for_status()
-    return response.json()["access_token"]
+    return response.json()
+
+
+def password_grant(username: str, password: str) -> dict:
+    return token_request({
+        "grant_type": os.getenv("GRANT_TYPE", "password"),
+        "username": username,
+        "password": password,
+        "scope": os.getenv("SCOPE", ""),
+        "client_id": oauth_client_id(),
+        "client_secret": os.getenv("CLIENT_SECRET"),
+    })
+
+
+def refresh_grant(refresh_token: str) -> dict:
+    return token_request({
+        "grant_type": "refresh_token",
+        "refresh_token": refresh_token,
+        "client_id": oauth_client_id(),
+        "client_secret": os.getenv("CLIENT_SECRET"),
+    })
+
+
+# The on-disk token cache is shared by every pytest session and xdist
+# worker: the auth service only sees a login when the cached token is
+# missing or about to expire.
+def login(role: str, username: str, password: str) -> str:
+    # Strict replay never reaches the API: the cassette ignores tokens
+    if CASSETTE.mode == "strict":
+        return placeholder_token(role)
+
+    return TOKEN_CACHE.get_token(
+        cache_key(BASE_URL, role, oauth_client_id()),
+        lambda: password_grant(username, password),
+        refresh_grant,
+    )
+
+
+@pytest.fixture(autouse=True)
+def correlation_id(request):
+    # Tags every captured request of this test with one correlation ID
+    token = start_test(request.node.nodeid)
+    yield
+    end_test(token)
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    session = get_session(BASE_URL)
+    yield session
+    close_sessions()
 
 
 @pytest.fixture(scope="session")
 def admin_headers():
     token = login(
+        "admin",
         os.getenv("ADMIN_USERNAME"),
         os.getenv("ADMIN_PASSWORD"),
     )
@@ -38,6 +151,7 @@ def admin_headers():
 @pytest.fixture(scope="session")
 def user_headers():
     token = login(
+        "user",
         os.getenv("USER_USERNAME"),
         os.getenv("USER_PASSWORD"),
     )
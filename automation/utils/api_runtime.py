@@ -0,0 +1,135 @@
+"""
+Generated API Test Runtime
+--------------------------
+Shared helpers imported by every generated test module.
+
+Keeping them here (instead of repeating them in each generated file)
+means all modules share one execution context for lifecycle chaining.
+With EXECUTION_CONTEXT_BACKEND=sqlite it is shared by every xdist worker
+and CI shard on the host (see resolution/execution_context.py).
+
+Environment overrides:
+- STREAM_RESPONSES → "1" streams large bodies (see json_stream.py)
+- STREAM_MIN_BYTES → bodies with a smaller Content-Length are read at once
+- LOG_BODY_BYTES   → bytes of request/response bodies kept per capture record
+- PERFORMANCE_ASSERTIONS → "on" (default) or "off" (performance tests skip)
+- PERF_LATENCY_MULTIPLE  → allowed multiple of the baseline p95 (default 3)
+- PERF_LATENCY_FLOOR_MS  → limits never go below this (default 50 ms), so
+                           sub-millisecond baselines do not turn into flaky tests
+- EXECUTION_CONTEXT_BACKEND → memory (default) or sqlite
+- EXECUTION_CONTEXT_FILE    → SQLite file (default .execution_context.sqlite)
+- EXECUTION_CONTEXT_KEEP    → "1" keeps the values of earlier runs (CI shards)
+
+Requests are recorded as JSON lines by automation/utils/capture.py;
+their timings feed the latency report (latency_report.py). With
+CASSETTE_MODE set they are recorded to / replayed from cassettes/api.jsonl
+(see agent/cassette.py).
+"""
+
+import logging
+import os
+from urllib.parse import urlsplit
+
+import pytest
+
+from agent.cassette import Cassette
+from automation.utils.capture import (
+    CORRELATION_HEADER,
+    capture_exchange,
+    correlation_id,
+)
+from automation.utils.json_stream import attach_stream, streamed_body, top_level_scalars
+from automation.utils.latency_report import LATENCY
+from automation.utils.schema_assertions import assert_response_contract
+from resolution.execution_context import ExecutionContext
+from resolution.lifecycle_engine import LifecycleChainingEngine
+from resolution.producer_index import fill_payload, is_identifier
+from resolution.response_extractor import apply_rules, is_integer
+
+EXECUTION_CONTEXT = ExecutionContext.from_env()
+CASSETTE = Cassette.from_env("api")
+
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "0") == "1"
+STREAM_MIN_BYTES = int(os.getenv("STREAM_MIN_BYTES", str(1024 * 1024)))
+LOG_BODY_BYTES = int(os.getenv("LOG_BODY_BYTES", "1000"))
+PERFORMANCE_ASSERTIONS = os.getenv("PERFORMANCE_ASSERTIONS", "on") != "off"
+PERF_LATENCY_MULTIPLE = float(os.getenv("PERF_LATENCY_MULTIPLE", "3"))
+PERF_LATENCY_FLOOR_MS = float(os.getenv("PERF_LATENCY_FLOOR_MS", "50"))
+
+def log_request_response(method, url, response):
+    capture_exchange(method, url, response, LOG_BODY_BYTES)
+
+def safe_request(session, method, url, endpoint=None, role="anonymous", **kwargs):
+    """
+    `endpoint` (the path template) and `role` label the latency sample;
+    without a template the concrete URL path is used.
+    """
+    headers = dict(kwargs.pop("headers", None) or {})
+    if correlation_id():
+        headers.setdefault(CORRELATION_HEADER, correlation_id())
+
+    try:
+        response = CASSETTE.request(
+            session,
+            method,
+            url,
+            role=role,
+            timeout=15,
+            stream=STREAM_RESPONSES,
+            headers=headers,
+            **kwargs,
+        )
+    except Exception as e:
+        logging.exception("Request failed")
+        pytest.fail(str(e))
+
+    response.latency_ms = response.timings["total_ms"]
+    LATENCY.record(method, endpoint or urlsplit(url).path, role, response.timings)
+
+    if STREAM_RESPONSES:
+        attach_stream(response, STREAM_MIN_BYTES)
+
+    return response
+
+def capture_resources(response, swagger_spec=None, rules=None):
+    """
+    Resource identifiers of a create response for lifecycle chaining.
+    `rules` maps path parameters to response paths (e.g. {"project_id": "id"},
+    from the lifecycle graph). Streamed bodies are walked incrementally;
+    only top-level scalars are kept.
+
+    With the spec, its path parameters decide what to capture; generated
+    tests have no spec, so only top-level string / integer identifiers
+    (`id`, `projectId`, ...) are kept: generic fields such as `name` or
+    `created_at` would otherwise leak into the root namespace.
+    """
+    body = streamed_body(response)
+    data = top_level_scalars(body.reader()) if body is not None else response.json()
+    if swagger_spec:
+        return LifecycleChainingEngine.extract_resource_values(data, swagger_spec, rules)
+
+    values = {}
+    if isinstance(data, dict):
+        values = {
+            key: value for key, value in data.items()
+            if is_identifier(key) and (isinstance(value, str) or is_integer(value))
+        }
+    values.update(apply_rules(data, rules))
+    return values
+
+def assert_latency(response, baseline):
+    """
+    Fails when the time to response headers (`response.elapsed`) exceeds
+    PERF_LATENCY_MULTIPLE x the baseline p95 recorded during exploration.
+    """
+    if not PERFORMANCE_ASSERTIONS:
+        pytest.skip("PERFORMANCE_ASSERTIONS=off")
+
+    limit = max(baseline["p95"] * PERF_LATENCY_MULTIPLE, PERF_LATENCY_FLOOR_MS)
+    elapsed = response.elapsed.total_seconds() * 1000
+
+    assert elapsed <= limit, (
+        f"Response took {elapsed:.1f} ms, limit {limit:.1f} ms "
+        f"({PERF_LATENCY_MULTIPLE:g}x baseline p95 {baseline['p95']} ms, "
+        f"median {baseline['median']} ms)"
+    )
@@ -0,0 +1,190 @@
+"""
+Structured Request Capture
+--------------------------
+Machine-readable request/response records for generated API tests.
+
+- One JSON object per request in CAPTURE_FILE (default api_capture.jsonl;
+  one file per pytest-xdist worker): correlation ID, test, method, URL,
+  status, latency, request/response sizes and truncated bodies
+- Each run starts the capture afresh: the controller removes the files of
+  the previous run, and a file is only created once it has a record
+- All log output goes through a QueueHandler; a background
+  QueueListener thread does the disk I/O, off the request path
+- Each test gets a correlation ID (see `correlation_id` in conftest.py),
+  also sent to the API as the X-Correlation-ID header
+
+Environment overrides:
+- CAPTURE_FILE → JSON-lines capture path
+"""
+
+import atexit
+import contextvars
+import glob
+import json
+import logging
+import os
+import queue
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from automation.utils.json_stream import response_head, streamed_body
+
+CAPTURE_LOGGER = "api_capture"
+CORRELATION_HEADER = "X-Correlation-ID"
+
+_correlation = contextvars.ContextVar("correlation", default=(None, None))
+_listener: Optional[QueueListener] = None
+
+
+def capture_file() -> str:
+    path = os.getenv("CAPTURE_FILE", "api_capture.jsonl")
+
+    # xdist workers write separate files instead of interleaving appends
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if worker:
+        root, ext = os.path.splitext(path)
+        path = f"{root}.{worker}{ext}"
+
+    return path
+
+
+def clear_capture_files():
+    """
+    Removes the capture files of a previous run, worker files included.
+    Only the controller (or a run without xdist) does this: workers start
+    after it.
+    """
+    path = os.getenv("CAPTURE_FILE", "api_capture.jsonl")
+    root, ext = os.path.splitext(path)
+
+    for stale in [path, *glob.glob(f"{glob.escape(root)}.gw*{ext}")]:
+        try:
+            os.remove(stale)
+        except FileNotFoundError:
+            pass
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(getattr(record, "capture", {}), default=str)
+
+
+def configure_logging(log_file: str = "api_test.log"):
+    """
+    Routes the root logger and the capture logger through one queue.
+    Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+
+    text_handler = logging.FileHandler(log_file)
+    text_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    text_handler.addFilter(lambda record: record.name != CAPTURE_LOGGER)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(text_handler.formatter)
+    stream_handler.addFilter(lambda record: record.name != CAPTURE_LOGGER)
+
+    if not os.getenv("PYTEST_XDIST_WORKER"):
+        clear_capture_files()
+
+    # Opened on the first record: an xdist controller sends no requests
+    capture_handler = logging.FileHandler(capture_file(), mode="w", delay=True)
+    capture_handler.setFormatter(JsonLinesFormatter())
+    capture_handler.addFilter(lambda record: record.name == CAPTURE_LOGGER)
+
+    _listener = QueueListener(log_queue, text_handler, stream_handler, capture_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+
+    capture_logger = logging.getLogger(CAPTURE_LOGGER)
+    capture_logger.setLevel(logging.INFO)
+    capture_logger.propagate = False
+    capture_logger.addHandler(QueueHandler(log_queue))
+
+
+def stop_logging():
+    """
+    Flushes queued records and stops the writer thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# --------------------------------------------------
+# Correlation IDs
+# --------------------------------------------------
+def start_test(test_id: str) -> contextvars.Token:
+    return _correlation.set((uuid.uuid4().hex, test_id))
+
+
+def end_test(token: contextvars.Token):
+    _correlation.reset(token)
+
+
+def correlation_id() -> Optional[str]:
+    return _correlation.get()[0]
+
+
+# --------------------------------------------------
+# Records
+# --------------------------------------------------
+def _truncate(body, limit: int) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        body = body[:limit].decode("utf-8", errors="replace")
+    return str(body)[:limit]
+
+
+def _size(body) -> Optional[int]:
+    if body is None:
+        return None
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    return None
+
+
+def capture_exchange(method: str, url: str, response, body_bytes: int):
+    """
+    Queues one structured record for a request/response pair;
+    bodies are truncated to `body_bytes`.
+    """
+    correlation, test_id = _correlation.get()
+    request_body = getattr(response.request, "body", None)
+
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit():
+        response_bytes = int(length)
+    elif streamed_body(response) is None:
+        response_bytes = len(response.content)
+    else:
+        response_bytes = None
+
+    logging.getLogger(CAPTURE_LOGGER).info(
+        "capture",
+        extra={"capture": {
+            "ts": time.time(),
+            "correlation_id": correlation,
+            "test": test_id,
+            "method": method,
+            "url": url,
+            "status": response.status_code,
+            "latency_ms": getattr(response, "latency_ms", None),
+            "request_bytes": _size(request_body),
+            "response_bytes": response_bytes,
+            "request_body": _truncate(request_body, body_bytes),
+            "response_body": response_head(response, body_bytes),
+        }},
+    )
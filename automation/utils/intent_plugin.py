@@ -0,0 +1,441 @@
+"""
+Intent Model Test Collection
+----------------------------
+pytest plugin that collects the API tests straight from the intent model,
+instead of importing generated test_generated_<tag>.py modules.
+
+- `generate_intent_suite` (agent/test_generator.py) writes
+  automation/api/intent_suite.json - the file collected here - and
+  intent_cases.jsonl with the resolved payload, query and path parameter
+  values of every operation
+- Collection only reads the intent model and the manifest (lifecycle
+  chains of the spec's dependency graph): test names, TC IDs, markers,
+  lifecycle phases and xdist groups are the generated modules' own, and
+  each tag / path prefix becomes one collector (`-k projects` still works)
+- intent_cases.jsonl is loaded when the first test runs, not at collection
+- Test bodies are the generated ones: role, forbidden, unauthenticated,
+  contract and performance tests call the same api_runtime helpers
+
+Registered by automation/conftest.py.
+"""
+
+import inspect
+import itertools
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+from agent.streaming import IntentModelFile
+from agent.test_generator import (
+    INTENT_SUITE_FILE,
+    SAFE_METHODS,
+    bdd_test_name,
+    chain_positions,
+    contract_role_for,
+    dependency_groups,
+    tc_id_plan,
+)
+from automation.utils.api_runtime import (
+    EXECUTION_CONTEXT,
+    assert_latency,
+    assert_response_contract,
+    capture_resources,
+    fill_payload,
+    log_request_response,
+    safe_request,
+)
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+SUCCESS_STATUSES = (200, 201, 202, 204)
+DENIED_STATUSES = (401, 403)
+
+PATH_PARAM = re.compile(r"{([^}]+)}")
+
+
+def pytest_collect_file(file_path: Path, parent):
+    if file_path.name == INTENT_SUITE_FILE:
+        return IntentSuite.from_parent(parent, path=file_path)
+    return None
+
+
+# --------------------------------------------------
+# Lazily loaded request data
+# --------------------------------------------------
+class IntentCases:
+    """
+    intent_cases.jsonl, read on first use and shared by every test.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._cases: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict:
+        if self._cases is None:
+            with self._lock:
+                if self._cases is None:
+                    self._cases = self.load()
+        return self._cases.get(key, {})
+
+    def load(self) -> Dict[str, dict]:
+        cases = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    case = json.loads(line)
+                    cases[case["key"]] = case
+        return cases
+
+
+class IntentTestSpec:
+    """
+    Everything one collected test needs, without its request data.
+    """
+
+    __slots__ = (
+        "kind", "method", "path", "role", "classification", "baseline", "base_url", "cases", "context",
+        "captures",
+    )
+
+    def __init__(
+        self, kind, method, path, role, classification, baseline, base_url, cases, context, captures
+    ):
+        self.kind = kind
+        self.method = method
+        self.path = path
+        self.role = role
+        self.classification = classification
+        self.baseline = baseline
+        self.base_url = base_url
+        self.cases = cases
+        # EXECUTION_CONTEXT, or its namespace for a lifecycle chain
+        self.context = context
+        # Extraction rules of a create endpoint's IDs (lifecycle graph)
+        self.captures = captures
+
+    @property
+    def case(self) -> dict:
+        return self.cases.get(f"{self.method} {self.path}")
+
+    def url(self) -> str:
+        fallbacks = self.case.get("path_params", {})
+        # Same expression as the generated modules: captured value, else fallback
+        path = PATH_PARAM.sub(
+            lambda m: str(self.context.get(m.group(1)) or fallbacks.get(m.group(1), "")),
+            self.path,
+        )
+        return f"{self.base_url}{path}"
+
+
+# --------------------------------------------------
+# Test bodies (mirroring render_endpoint_tests)
+# --------------------------------------------------
+def run_role_test(spec: IntentTestSpec, http_session, headers):
+    url = spec.url()
+    case = spec.case
+    payload = fill_payload(case.get("payload"), spec.context, case.get("links"))
+    query = case.get("query")
+    body_key = "data" if case.get("content_type") == FORM_CONTENT_TYPE else "json"
+
+    response = safe_request(
+        http_session,
+        spec.method,
+        url,
+        endpoint=spec.path,
+        role=spec.role,
+        headers=headers,
+        params=query if query else None,
+        **{body_key: payload if payload else None},
+    )
+
+    log_request_response(spec.method, url, response)
+
+    # Lifecycle capture ONLY for create
+    if spec.classification == "create":
+        try:
+            captured = capture_resources(response, rules=spec.captures)
+            spec.context.register(captured)
+        except Exception:
+            pass
+
+    assert response.status_code in SUCCESS_STATUSES
+
+
+def run_forbidden_test(spec: IntentTestSpec, http_session, headers):
+    url = spec.url()
+    response = safe_request(
+        http_session, spec.method, url, endpoint=spec.path, role=spec.role, headers=headers
+    )
+    log_request_response(spec.method, url, response)
+
+    assert response.status_code in DENIED_STATUSES
+
+
+def run_without_auth_test(spec: IntentTestSpec, http_session):
+    url = spec.url()
+    response = safe_request(http_session, spec.method, url, endpoint=spec.path)
+    log_request_response(spec.method, url, response)
+
+    assert response.status_code in DENIED_STATUSES
+
+
+def contract_request(spec: IntentTestSpec, http_session, headers=None):
+    url = spec.url()
+    if spec.role:
+        response = safe_request(
+            http_session, spec.method, url, endpoint=spec.path, role=spec.role, headers=headers
+        )
+    else:
+        response = safe_request(http_session, spec.method, url, endpoint=spec.path)
+    log_request_response(spec.method, url, response)
+
+    assert response.status_code < 500
+    return response
+
+
+def run_contract_test(spec: IntentTestSpec, http_session, headers=None):
+    response = contract_request(spec, http_session, headers)
+    assert_response_contract(response, spec.method, spec.path)
+
+
+def run_performance_test(spec: IntentTestSpec, http_session, headers=None):
+    response = contract_request(spec, http_session, headers)
+    assert_latency(response, spec.baseline)
+
+
+TEST_BODIES = {
+    "role": run_role_test,
+    "forbidden": run_forbidden_test,
+    "without_auth": run_without_auth_test,
+    "contract": run_contract_test,
+    "performance": run_performance_test,
+}
+
+
+def stand_in_function(argnames: tuple):
+    """
+    Stand-in test function whose signature requests `argnames`, so pytest
+    resolves the fixtures exactly as for a generated test.
+    """
+    def requested(**funcargs):
+        pass
+
+    requested.__signature__ = inspect.Signature(
+        [inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY) for name in argnames]
+    )
+    # Marks are per test (see IntentShard.collect)
+    requested.pytestmark = []
+    return requested
+
+
+# --------------------------------------------------
+# Collection
+# --------------------------------------------------
+class IntentTest(pytest.Function):
+    """
+    One test of the intent model; runs its spec with the requested fixtures.
+    """
+
+    def runtest(self):
+        funcargs = [self.funcargs[name] for name in self._fixtureinfo.argnames]
+        TEST_BODIES[self.spec.kind](self.spec, *funcargs)
+
+    def reportinfo(self):
+        return self.path, None, self.name
+
+
+class IntentShard(pytest.Collector):
+    """
+    Tests of one tag / path prefix: a generated module's contents.
+    """
+
+    def __init__(self, *args, tests: List[tuple] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tests = tests
+
+    def collect(self):
+        # Fixture closures depend on the requested names only
+        stand_ins = {}
+        items = []
+
+        for name, spec, argnames, marks, tc_id in self.tests:
+            stand_in = stand_ins.get(argnames)
+            if stand_in is None:
+                function = stand_in_function(argnames)
+                info = self.session._fixturemanager.getfixtureinfo(
+                    node=self, func=function, cls=None
+                )
+                stand_in = stand_ins[argnames] = (function, info)
+
+            item = IntentTest.from_parent(
+                self, name=name, callobj=stand_in[0], fixtureinfo=stand_in[1]
+            )
+            item.spec = spec
+            item.own_markers.extend(marks)
+            item.keywords.update({mark.name: mark for mark in marks})
+            if tc_id:
+                item.user_properties.append(("test_case_id", tc_id))
+            items.append(item)
+
+        return items
+
+
+class IntentSuite(pytest.File):
+    def collect(self):
+        manifest = json.loads(self.path.read_text(encoding="utf-8"))
+
+        intent_model_file = Path(manifest["intent_model"])
+        if not intent_model_file.is_absolute():
+            intent_model_file = self.config.rootpath / intent_model_file
+
+        intent_model = list(IntentModelFile(intent_model_file))
+        groups = manifest.get("groups")
+        if groups is None:
+            groups = dependency_groups(intent_model)
+        else:
+            groups = {tuple(key.split(" ", 1)): group for key, group in groups.items()}
+        positions = manifest.get("positions")
+        if positions is None:
+            positions = chain_positions(intent_model)
+        else:
+            positions = {tuple(key.split(" ", 1)): position for key, position in positions.items()}
+        captures = manifest.get("captures", {})
+        shards = manifest.get("shards", {})
+        cases = IntentCases(self.path.parent / manifest["cases"])
+        marks = MarkCache()
+
+        tests: Dict[str, list] = {}
+        for ep, tc_ids in tc_id_plan(intent_model, itertools.count(1)):
+            key = f"{ep['method'].upper()} {ep['endpoint']}"
+            shard = shards.get(key, "default")
+            node = (ep["method"].upper(), ep["endpoint"])
+            group = groups.get(node)
+            scheduling = marks.scheduling(
+                ep.get("classification", "unknown"), group, positions.get(node, 0)
+            )
+            context = EXECUTION_CONTEXT.namespace(group) if group else EXECUTION_CONTEXT
+            tests.setdefault(shard, []).extend(
+                endpoint_tests(
+                    ep, tc_ids, manifest["base_url"], cases, scheduling, marks, context,
+                    captures.get(key),
+                )
+            )
+
+        # Module order of a generated suite: pytest collects files by name
+        return [
+            IntentShard.from_parent(self, name=shard, tests=tests[shard])
+            for shard in sorted(tests)
+        ]
+
+
+class MarkCache:
+    """
+    Mark objects shared by all tests carrying the same marker.
+    """
+
+    def __init__(self):
+        self._marks = {}
+
+    def get(self, name: str, *args):
+        key = (name, args)
+        mark = self._marks.get(key)
+        if mark is None:
+            mark = self._marks[key] = getattr(pytest.mark, name)(*args).mark
+        return mark
+
+    def scheduling(self, classification: str, group: Optional[str], position: int = 0) -> tuple:
+        # Ordering inside a run and xdist placement of lifecycle chains
+        marks = (self.get("lifecycle", classification, position),)
+        if group:
+            marks += (self.get("xdist_group", group),)
+        return marks
+
+
+def endpoint_tests(
+    ep: dict,
+    tc_ids: list,
+    base_url: str,
+    cases: IntentCases,
+    scheduling: tuple,
+    marks: MarkCache,
+    context=EXECUTION_CONTEXT,
+    captures: Optional[dict] = None,
+):
+    """
+    (name, spec, fixtures, marks, TC ID) of every test render_endpoint_tests
+    would write for this endpoint, in the same order. Performance tests
+    have no TC ID.
+    """
+    tc_ids = iter(tc_ids)
+    next(tc_ids)
+
+    method = ep["method"].upper()
+    path = ep["endpoint"]
+    classification = ep.get("classification", "unknown")
+    risk = marks.get(ep.get("risk_level", "medium"))
+    roles_info = ep.get("roles", {})
+    role_access = roles_info.get("role_access", {})
+    base_name = f"test_{bdd_test_name(method, path)}"
+
+    def spec(kind, role=None, baseline=None):
+        return IntentTestSpec(
+            kind, method, path, role, classification, baseline, base_url, cases, context, captures
+        )
+
+    for role, is_allowed in role_access.items():
+        tc_id = next(tc_ids)
+        fixtures = ("http_session", f"{role}_headers")
+
+        if is_allowed:
+            yield (
+                f"{base_name}_as_{role}",
+                spec("role", role),
+                fixtures,
+                (marks.get("functional"), marks.get("rbac"), risk, *scheduling),
+                tc_id,
+            )
+        else:
+            yield (
+                f"{base_name}_as_{role}_forbidden",
+                spec("forbidden", role),
+                fixtures,
+                (marks.get("security"), marks.get("rbac"), risk, *scheduling),
+                tc_id,
+            )
+
+    if roles_info.get("requires_auth", False):
+        yield (
+            f"{base_name}_without_auth",
+            spec("without_auth"),
+            ("http_session",),
+            (marks.get("security"), risk, *scheduling),
+            next(tc_ids),
+        )
+
+    # Validated as a permitted role when there is one (safe methods only)
+    contract_role = contract_role_for(role_access, method)
+    contract_fixtures = ("http_session", f"{contract_role}_headers") if contract_role else ("http_session",)
+
+    yield (
+        f"{base_name}_contract_stability",
+        spec("contract", contract_role),
+        contract_fixtures,
+        (marks.get("contract"), risk, *scheduling),
+        next(tc_ids),
+    )
+
+    # Only for safe operations with a latency baseline from exploration
+    baseline = ep.get("latency_ms")
+    if baseline and method in SAFE_METHODS:
+        yield (
+            f"{base_name}_performance",
+            spec("performance", contract_role, {"median": baseline["median"], "p95": baseline["p95"]}),
+            contract_fixtures,
+            (marks.get("performance"), risk, *scheduling),
+            None,
+        )
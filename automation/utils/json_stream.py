@@ -0,0 +1,364 @@
+"""
+Streaming JSON Responses
+------------------------
+Opt-in streaming mode for large response bodies (STREAM_RESPONSES=1).
+
+- `safe_request` sends `stream=True`; bodies smaller than
+  STREAM_MIN_BYTES (known Content-Length) are still read at once
+- Logging reads only the first LOG_BODY_BYTES bytes
+- `JsonStreamReader` parses a body incrementally (ijson-style): arrays
+  and objects are walked one element at a time, so contract validation
+  and lifecycle capture never hold the whole document
+
+A streamed body can be consumed once; its logged prefix is replayed.
+"""
+
+import codecs
+import json
+import re
+from typing import Iterator, Optional
+
+from resolution.component_graph import lookup_ref
+
+CHUNK_SIZE = 64 * 1024
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+_DELIMITER = re.compile(r"[\s,:\]}]")
+
+
+class JsonStreamReader:
+    """
+    Incremental JSON reader over an iterator of byte chunks.
+
+    Containers are walked with `iter_array` / `iter_object`; the caller
+    consumes every element (value, skip or a nested walk) before asking
+    for the next one. Single elements are decoded with the stdlib C scanner.
+
+    An element larger than the buffer is retried only when the decoder
+    stopped at a truncated token, and each retry at least doubles the
+    pending text, so decoding stays linear in the element's size.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def peek(self) -> str:
+        """
+        Next non-whitespace character ("" at end of input).
+        """
+        self._skip_ws()
+        return self._buf[self._pos] if self._pos < len(self._buf) else ""
+
+    def value(self):
+        """
+        Decodes the next complete JSON value.
+        """
+        self._skip_ws()
+
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as error:
+                if self._truncated(error) and self._fill(len(self._buf) - self._pos):
+                    continue
+                raise
+
+            # A number split across chunks ("-2." + "5") decodes too early:
+            # in valid JSON a value is always followed by a delimiter
+            if (
+                not self._eof
+                and (end == len(self._buf) or self._buf[end] not in _DELIMITERS)
+                and self._fill()
+            ):
+                continue
+
+            self._pos = end
+            return value
+
+    def skip(self):
+        """
+        Skips the next value without materializing large containers.
+        """
+        first = self.peek()
+
+        if first == "[":
+            for _ in self.iter_array():
+                self.skip()
+        elif first == "{":
+            for _ in self.iter_object():
+                self.skip()
+        else:
+            self.value()
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        Walks an array, yielding the index of each element.
+        """
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        index = 0
+        while True:
+            yield index
+            index += 1
+
+            separator = self.peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {separator!r}")
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Walks an object, yielding each key; its value is next in the stream.
+        """
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+
+            separator = self.peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' in JSON object, got {separator!r}")
+
+    # --------------------------------------------------
+    # Buffer handling
+    # --------------------------------------------------
+    def _fill(self, at_least: int = 1) -> bool:
+        """
+        Appends at least `at_least` characters (less at end of input),
+        dropping the consumed text; chunks are joined once.
+        """
+        if self._eof:
+            return False
+
+        parts = [self._buf[self._pos:]]
+        read = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            parts.append(text)
+            read += len(text)
+            if read >= max(at_least, 1):
+                break
+        else:
+            parts.append(self._decoder.decode(b"", final=True))
+            self._eof = True
+
+        self._buf = "".join(parts)
+        self._pos = 0
+        return True
+
+    def _truncated(self, error: json.JSONDecodeError) -> bool:
+        # The decoder ran into the end of the buffer, not into invalid JSON:
+        # an open string, or a token with no delimiter after it ("tr", "1.", "")
+        if error.msg.startswith("Unterminated string"):
+            return True
+        return _DELIMITER.search(self._buf, error.pos) is None
+
+    def _skip_ws(self):
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._fill():
+                return
+
+    def _expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, got {found!r}")
+        self._pos += 1
+
+
+class StreamedBody:
+    """
+    Single-pass body of a `stream=True` response with a replayable prefix.
+    """
+
+    def __init__(self, response, chunk_size: int = CHUNK_SIZE):
+        self._chunks = response.iter_content(chunk_size)
+        self._prefix = b""
+        self._consumed = False
+
+    def head(self, limit: int) -> bytes:
+        while len(self._prefix) < limit:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._prefix += chunk
+        return self._prefix[:limit]
+
+    def chunks(self) -> Iterator[bytes]:
+        if self._consumed:
+            raise RuntimeError("Streamed response body was already consumed")
+        self._consumed = True
+
+        if self._prefix:
+            yield self._prefix
+        yield from self._chunks
+
+    def reader(self) -> JsonStreamReader:
+        return JsonStreamReader(self.chunks())
+
+
+# --------------------------------------------------
+# Response helpers
+# --------------------------------------------------
+def attach_stream(response, min_bytes: int):
+    """
+    Keeps a `stream=True` response streamed only when its body may be large.
+    """
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit() and int(length) < min_bytes:
+        response.content  # small body: read now, connection goes back to the pool
+        return
+
+    response.streamed_body = StreamedBody(response)
+
+
+def streamed_body(response) -> Optional[StreamedBody]:
+    return getattr(response, "streamed_body", None)
+
+
+def response_head(response, limit: int) -> str:
+    """
+    First `limit` bytes of the body, decoded, without reading the rest.
+    """
+    body = streamed_body(response)
+    raw = body.head(limit) if body is not None else response.content[:limit]
+    return raw.decode(response.encoding or "utf-8", errors="replace")
+
+
+def top_level_scalars(reader: JsonStreamReader) -> dict:
+    """
+    Scalar members of a top-level object; nested containers are skipped.
+    """
+    if reader.peek() != "{":
+        return {}
+
+    scalars = {}
+    for key in reader.iter_object():
+        if reader.peek() in ("{", "["):
+            reader.skip()
+        else:
+            scalars[key] = reader.value()
+
+    return scalars
+
+
+# --------------------------------------------------
+# Streaming contract validation
+# --------------------------------------------------
+# Keywords a streamed object / array walk can enforce itself
+STREAMABLE_KEYWORDS = {
+    "type", "items", "properties", "required", "additionalProperties",
+    "title", "description", "example", "default", "readOnly", "writeOnly",
+}
+
+
+def _declares(schema: dict, json_type: str) -> bool:
+    declared = schema.get("type")
+    if declared is None:
+        return True
+    return json_type in (declared if isinstance(declared, list) else [declared])
+
+
+def validate_json_stream(validator, reader: JsonStreamReader, schema: dict, path: str = "response"):
+    """
+    Validates the next value of `reader` against a raw OpenAPI schema
+    with a ContractValidator. Arrays and objects are walked element by
+    element; anything else is decoded and checked as a whole.
+    """
+    while isinstance(schema, dict) and "$ref" in schema:
+        schema = lookup_ref(validator.document, schema["$ref"])
+
+    first = reader.peek()
+    streamable = isinstance(schema, dict) and set(schema) <= STREAMABLE_KEYWORDS
+
+    if streamable and first == "[" and "items" in schema and _declares(schema, "array"):
+        _validate_array_stream(validator, reader, schema["items"], path)
+        return
+
+    if streamable and first == "{" and _declares(schema, "object"):
+        _validate_object_stream(validator, reader, schema, path)
+        return
+
+    validator.validate(reader.value(), schema, path)
+
+
+def _validate_array_stream(validator, reader, item_schema, path):
+    item_check = validator.validator(item_schema)
+    sample_first, sample_random = validator.sample_first, validator.sample_random
+
+    # Beyond the first N elements, a reservoir keeps K random ones
+    rng = None
+    reservoir = []
+    for index in reader.iter_array():
+        if sample_first is None or index < sample_first:
+            item_check(reader.value(), f"{path}[{index}]")
+            continue
+
+        seen = index - sample_first
+        if len(reservoir) < sample_random:
+            reservoir.append((index, reader.value()))
+            continue
+
+        if rng is None:
+            rng = validator.sampler(path)
+        slot = rng.randrange(seen + 1)
+        if slot < sample_random:
+            reservoir[slot] = (index, reader.value())
+        else:
+            reader.skip()
+
+    try:
+        for index, item in sorted(reservoir, key=lambda pair: pair[0]):
+            item_check(item, f"{path}[{index}]")
+    except AssertionError as error:
+        # Only elements past N + K were actually sampled
+        if rng is None:
+            raise
+        raise validator.sampling_error(error) from None
+
+
+def _validate_object_stream(validator, reader, schema, path):
+    properties = schema.get("properties", {})
+    additional = schema.get("additionalProperties", True)
+
+    seen = set()
+    unexpected = []
+    for key in reader.iter_object():
+        seen.add(key)
+
+        if key in properties:
+            validate_json_stream(validator, reader, properties[key], f"{path}.{key}")
+        elif isinstance(additional, dict):
+            validate_json_stream(validator, reader, additional, f"{path}.{key}")
+        else:
+            if additional is False:
+                unexpected.append(key)
+            reader.skip()
+
+    for field in schema.get("required", []):
+        assert field in seen, f"{path}.{field} is required but missing"
+
+    assert not unexpected, f"{path} has unexpected properties: {sorted(unexpected)}"
@@ -0,0 +1,80 @@
+"""
+Latency Report
+--------------
+Per-operation latency percentiles of a generated test run.
+
+- `safe_request` records DNS / connect / TTFB / total time of every
+  request into LATENCY, keyed by (method, endpoint template, role)
+- pytest-xdist workers hand their histograms to the controller, which
+  merges them (see the latency hooks in conftest.py)
+- At session end the p50/p95/p99 table is added to the pytest-html
+  report and written with the raw histograms to LATENCY_REPORT
+
+Environment overrides:
+- LATENCY_REPORT → JSON artifact path (default latency_report.json)
+"""
+
+import html
+import os
+from typing import List
+
+from agent.latency import PERCENTILES, LatencyRecorder
+
+LATENCY = LatencyRecorder()
+
+# Columns of the HTML table: (metric, heading)
+REPORT_METRICS = (
+    ("total_ms", "Total"),
+    ("ttfb_ms", "TTFB"),
+    ("connect_ms", "Connect"),
+    ("dns_ms", "DNS"),
+)
+
+
+def latency_report_file() -> str:
+    return os.getenv("LATENCY_REPORT", "latency_report.json")
+
+
+def write_latency_report() -> int:
+    if not len(LATENCY):
+        return 0
+    return LATENCY.save(latency_report_file())
+
+
+def latency_html() -> List[str]:
+    """
+    p50/p95/p99 tables (ms) as HTML fragments for pytest-html.
+    """
+    rows = LATENCY.summary()
+    if not rows:
+        return []
+
+    percentile_cells = "".join(f"<th>p{p}</th>" for p in PERCENTILES)
+    header = (
+        "<tr><th rowspan='2'>Method</th><th rowspan='2'>Endpoint</th>"
+        "<th rowspan='2'>Role</th><th rowspan='2'>Requests</th>"
+        + "".join(
+            f"<th colspan='{len(PERCENTILES)}'>{heading} (ms)</th>"
+            for _, heading in REPORT_METRICS
+        )
+        + "</tr><tr>"
+        + percentile_cells * len(REPORT_METRICS)
+        + "</tr>"
+    )
+
+    body = []
+    for row in rows:
+        cells = [
+            html.escape(row["method"]),
+            html.escape(row["endpoint"]),
+            html.escape(row["role"]),
+            str(row["count"]),
+        ]
+        for metric, _ in REPORT_METRICS:
+            cells.extend(str(row[metric][f"p{p}"]) for p in PERCENTILES)
+        body.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+
+    return [
+        "<h2>Latency</h2>",
+        f"<table id='latency'>{header}{''.join(body)}</table>",
+    ]
@@ -0,0 +1,453 @@
+"""
+Load Test Runner
+----------------
+Pure-Python asyncio load generator replaying the scenarios written by
+agent/load_generator.py (automation/load/load_scenarios.json).
+
+- Scenarios start at a target rate (open model), ramped up linearly,
+  for a fixed duration; picks follow the scenario weights in a fixed order.
+  `rps` counts scenario starts: equal to requests/s for single operations,
+  a multiple of it for lifecycle chains
+- At most `concurrency` scenarios are in flight; arrivals that would
+  queue behind a full backlog are counted as dropped
+- Requests go through the pooled keep-alive sessions on a thread pool,
+  so the event loop only schedules; lifecycle chains fill path
+  parameters and produced body fields (`links`) from their create response
+- Per endpoint: throughput, error rate and latency percentiles, printed
+  and written to a JSON report
+- `--lifecycle` runs every lifecycle chain once instead: independent
+  chains in parallel (at most `concurrency`), steps in dependency order,
+  steps whose captured ID is missing skipped; per-step results reported
+
+Usage:
+    python -m automation.utils.load_runner --rps 50 --concurrency 20 --ramp-up 10 --duration 60
+    python -m automation.utils.load_runner --lifecycle --concurrency 8
+
+Environment overrides:
+- BASE_URL                       → target (default: the scenario file's base_url)
+- <ROLE>_USERNAME, <ROLE>_PASSWORD → credentials per role, as for the test suite
+- CLIENT_ID, CLIENT_SECRET, GRANT_TYPE, SCOPE
+- LOAD_REPORT                    → JSON report path (default load_report.json)
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, List, Optional
+
+from agent.http_session import get_session
+from agent.latency import PERCENTILES, LatencyRecorder, timed_request
+from agent.token_cache import TokenCache, cache_key
+from resolution.execution_context import ExecutionContext
+from resolution.lifecycle_graph import ChainResult, ChainScheduler
+from resolution.producer_index import fill_payload
+from resolution.response_extractor import apply_rules
+
+DEFAULT_SCENARIO_FILE = "automation/load/load_scenarios.json"
+
+PATH_PARAM = re.compile(r"{([^}]+)}")
+
+
+@dataclass
+class LoadProfile:
+    rps: float = 10.0
+    concurrency: int = 10
+    ramp_up: float = 0.0
+    duration: float = 30.0
+
+    def arrival_time(self, index: int) -> float:
+        """
+        Start offset (s) of the index-th scenario: the rate grows linearly
+        from 0 to `rps` over `ramp_up` seconds, then stays constant.
+        """
+        ramp_arrivals = self.rps * self.ramp_up / 2
+        if index < ramp_arrivals:
+            return math.sqrt(2 * self.ramp_up * index / self.rps)
+        return self.ramp_up + (index - ramp_arrivals) / self.rps
+
+
+# --------------------------------------------------
+# Authentication
+# --------------------------------------------------
+def role_headers(base_url: str, login_path: Optional[str], roles: List[str]) -> Dict[str, dict]:
+    """
+    Bearer headers per role, through the shared on-disk token cache.
+    Roles without credentials in the environment run unauthenticated.
+    """
+    session = get_session(base_url)
+    token_cache = TokenCache()
+    headers = {}
+
+    def token_request(form_data: dict) -> dict:
+        response = session.post(
+            f"{base_url}{login_path}",
+            data=form_data,
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Accept": "application/json",
+            },
+            timeout=15,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    for role in roles:
+        username = os.getenv(f"{role.upper()}_USERNAME")
+        password = os.getenv(f"{role.upper()}_PASSWORD")
+        if not (login_path and username):
+            print(f"No credentials for role '{role}' - sending its requests unauthenticated")
+            headers[role] = {}
+            continue
+
+        token = token_cache.get_token(
+            cache_key(base_url, role, os.getenv("CLIENT_ID")),
+            partial(token_request, {
+                "grant_type": os.getenv("GRANT_TYPE", "password"),
+                "username": username,
+                "password": password,
+                "scope": os.getenv("SCOPE", ""),
+                "client_id": os.getenv("CLIENT_ID"),
+                "client_secret": os.getenv("CLIENT_SECRET"),
+            }),
+            lambda refresh_token: token_request({
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+                "client_id": os.getenv("CLIENT_ID"),
+                "client_secret": os.getenv("CLIENT_SECRET"),
+            }),
+        )
+        headers[role] = {"Authorization": f"Bearer {token}"}
+
+    return headers
+
+
+# --------------------------------------------------
+# Runner
+# --------------------------------------------------
+class LoadRunner:
+    def __init__(
+        self,
+        base_url: str,
+        scenarios: List[dict],
+        profile: LoadProfile,
+        headers_by_role: Optional[Dict[str, dict]] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.scenarios = [scenario for scenario in scenarios if scenario.get("steps")]
+        self.profile = profile
+        self.headers_by_role = headers_by_role or {}
+        self.session = get_session(self.base_url, pool_size=profile.concurrency)
+
+        self.latency = LatencyRecorder()
+        self.counts: Dict[tuple, Dict[str, int]] = {}
+        self.started = 0
+        self.dropped = 0
+        self.aborted = 0
+        self.elapsed = 0.0
+        self.chain_results: List[ChainResult] = []
+        self._lock = threading.Lock()
+        self._waiting = 0
+
+    # --------------------------------------------------
+    # Scheduling
+    # --------------------------------------------------
+    async def run(self):
+        if not self.scenarios:
+            raise ValueError("No load scenarios to run")
+
+        loop = asyncio.get_running_loop()
+        concurrency = max(1, self.profile.concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        # Weights expand into a fixed pick order
+        picks = itertools.cycle([
+            scenario
+            for scenario in self.scenarios
+            for _ in range(max(1, int(scenario.get("weight", 1))))
+        ])
+
+        tasks = set()
+        with ThreadPoolExecutor(concurrency) as executor:
+            start = loop.time()
+
+            for index in itertools.count():
+                offset = self.profile.arrival_time(index)
+                if offset >= self.profile.duration:
+                    break
+
+                delay = start + offset - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                if self._waiting >= concurrency:
+                    self.dropped += 1
+                    continue
+
+                self._waiting += 1
+                task = asyncio.create_task(
+                    self.iteration(next(picks), semaphore, executor)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.gather(*tasks)
+            self.elapsed = loop.time() - start
+
+    async def iteration(self, scenario: dict, semaphore: asyncio.Semaphore, executor):
+        async with semaphore:
+            self._waiting -= 1
+            self.started += 1
+            await asyncio.get_running_loop().run_in_executor(
+                executor, self.run_scenario, scenario
+            )
+
+    def run_chains(self):
+        """
+        Every lifecycle chain once: `concurrency` independent chains at a
+        time, the steps of each in dependency order (ChainScheduler).
+        """
+        chains = {
+            scenario["name"]: scenario["steps"]
+            for scenario in self.scenarios
+            if len(scenario["steps"]) > 1
+        }
+        if not chains:
+            raise ValueError("No lifecycle chains to run")
+
+        def execute(step: dict, context: ExecutionContext) -> bool:
+            ok, response = self.send(step, context)
+            if ok and step.get("classification") == "create":
+                context.register(self.resource_values(response, step.get("capture", {})))
+            return ok
+
+        start = time.perf_counter()
+        self.chain_results = ChainScheduler(self.profile.concurrency).run(
+            chains, execute, requires=lambda step: step.get("requires", ())
+        )
+        self.elapsed = time.perf_counter() - start
+        self.started = len(chains)
+        self.aborted = sum(not result.ok for result in self.chain_results)
+
+    # --------------------------------------------------
+    # Scenario execution (worker threads)
+    # --------------------------------------------------
+    def run_scenario(self, scenario: dict):
+        captured = {}
+
+        for step in scenario["steps"]:
+            ok, response = self.send(step, captured)
+            if not ok:
+                # Later steps of a chain depend on this one
+                if len(scenario["steps"]) > 1:
+                    with self._lock:
+                        self.aborted += 1
+                return
+
+            if step.get("classification") == "create":
+                captured.update(self.resource_values(response, step.get("capture", {})))
+
+    def send(self, step: dict, captured: dict):
+        path = PATH_PARAM.sub(
+            lambda m: str(captured.get(m.group(1)) or step["path_params"].get(m.group(1), "")),
+            step["endpoint"],
+        )
+        role = step.get("role") or "anonymous"
+        key = (step["method"], step["endpoint"], role)
+
+        response, status = None, "error"
+        try:
+            response = timed_request(
+                self.session,
+                step["method"],
+                f"{self.base_url}{path}",
+                timeout=15,
+                headers=self.headers_by_role.get(role, {}),
+                params=step.get("params"),
+                json=fill_payload(step.get("json"), captured, step.get("links")),
+                data=fill_payload(step.get("data"), captured, step.get("links")),
+            )
+            status = response.status_code
+        except Exception:
+            pass
+
+        ok = response is not None and status < 400
+
+        with self._lock:
+            counts = self.counts.setdefault(key, {"requests": 0, "errors": 0, "statuses": {}})
+            counts["requests"] += 1
+            counts["errors"] += 0 if ok else 1
+            counts["statuses"][str(status)] = counts["statuses"].get(str(status), 0) + 1
+
+        if response is not None:
+            self.latency.record(*key, response.timings)
+
+        return ok, response
+
+    @staticmethod
+    def resource_values(response, capture: dict) -> dict:
+        """
+        Top-level scalars of a create response, plus the path parameters
+        the scenario maps to response paths (e.g. project_id <- id, data.id).
+        """
+        try:
+            data = response.json()
+        except ValueError:
+            return {}
+
+        values = {}
+        if isinstance(data, dict):
+            values = {key: value for key, value in data.items() if isinstance(value, (str, int))}
+        for param, value in apply_rules(data, capture).items():
+            values.setdefault(param, value)
+        return values
+
+    # --------------------------------------------------
+    # Reporting
+    # --------------------------------------------------
+    def report(self) -> dict:
+        latency = {
+            (row["method"], row["endpoint"], row["role"]): row["total_ms"]
+            for row in self.latency.summary()
+        }
+        elapsed = self.elapsed or 1.0
+
+        endpoints = []
+        for key, counts in sorted(self.counts.items()):
+            method, endpoint, role = key
+            endpoints.append({
+                "method": method,
+                "endpoint": endpoint,
+                "role": role,
+                "requests": counts["requests"],
+                "throughput_rps": round(counts["requests"] / elapsed, 2),
+                "error_rate": round(counts["errors"] / counts["requests"], 4),
+                "statuses": counts["statuses"],
+                "latency_ms": latency.get(key, {f"p{p}": None for p in PERCENTILES}),
+            })
+
+        total = sum(row["requests"] for row in endpoints)
+        errors = sum(counts["errors"] for counts in self.counts.values())
+
+        chains = [
+            {
+                "name": result.name,
+                "steps": [
+                    {"method": step["method"], "endpoint": step["endpoint"], "status": status}
+                    for step, status in result.steps
+                ],
+            }
+            for result in self.chain_results
+        ]
+
+        return {
+            "profile": vars(self.profile),
+            "elapsed_s": round(self.elapsed, 3),
+            "scenarios_started": self.started,
+            "scenarios_dropped": self.dropped,
+            "chains_aborted": self.aborted,
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2),
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "endpoints": endpoints,
+            "chains": chains,
+        }
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['requests']} requests in {report['elapsed_s']} s "
+        f"({report['throughput_rps']} req/s, error rate {report['error_rate']:.2%}); "
+        f"scenarios: {report['scenarios_started']} started, "
+        f"{report['scenarios_dropped']} dropped, {report['chains_aborted']} chains aborted",
+        f"{'METHOD':<8}{'ENDPOINT':<48}{'ROLE':<12}{'REQ':>7}{'REQ/S':>9}{'ERR%':>8}"
+        f"{'p50':>10}{'p95':>10}{'p99':>10}",
+    ]
+    for row in report["endpoints"]:
+        p = row["latency_ms"]
+        lines.append(
+            f"{row['method']:<8}{row['endpoint']:<48}{row['role']:<12}{row['requests']:>7}"
+            f"{row['throughput_rps']:>9}{row['error_rate'] * 100:>8.1f}"
+            f"{p['p50']!s:>10}{p['p95']!s:>10}{p['p99']!s:>10}"
+        )
+    for chain in report.get("chains", []):
+        lines.append(
+            f"{chain['name']}: "
+            + " → ".join(f"{step['method']} {step['endpoint']} [{step['status']}]" for step in chain["steps"])
+        )
+    return "\n".join(lines)
+
+
+# --------------------------------------------------
+# Command line
+# --------------------------------------------------
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Replay generated load scenarios")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIO_FILE)
+    parser.add_argument("--base-url", default=os.getenv("BASE_URL"))
+    parser.add_argument("--rps", type=float)
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--ramp-up", type=float)
+    parser.add_argument("--duration", type=float)
+    parser.add_argument("--report", default=os.getenv("LOAD_REPORT", "load_report.json"))
+    parser.add_argument(
+        "--lifecycle",
+        action="store_true",
+        help="Run every lifecycle chain once, --concurrency chains in parallel",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.scenarios, encoding="utf-8") as f:
+        document = json.load(f)
+
+    settings = dict(document.get("profile", {}))
+    for name in ("rps", "concurrency", "ramp_up", "duration"):
+        if getattr(args, name) is not None:
+            settings[name] = getattr(args, name)
+    profile = LoadProfile(**settings)
+
+    base_url = (args.base_url or document["base_url"]).rstrip("/")
+    roles = sorted({
+        step["role"]
+        for scenario in document["scenarios"]
+        for step in scenario["steps"]
+        if step.get("role")
+    })
+
+    runner = LoadRunner(
+        base_url,
+        document["scenarios"],
+        profile,
+        role_headers(base_url, document.get("login_path"), roles),
+    )
+
+    if args.lifecycle:
+        print(f"Lifecycle run: chains in parallel (max {profile.concurrency}) against {base_url}")
+        runner.run_chains()
+    else:
+        print(
+            f"Load test: {len(runner.scenarios)} scenarios at {profile.rps} scenarios/s, "
+            f"concurrency {profile.concurrency}, ramp-up {profile.ramp_up} s, "
+            f"duration {profile.duration} s against {base_url}"
+        )
+        asyncio.run(runner.run())
+
+    report = runner.report()
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(format_report(report))
+    print(f"Load report saved to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
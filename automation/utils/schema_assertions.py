@@ -2,45 +2,104 @@
 Contract Schema Assertions
 --------------------------
 Generated from Swagger/OpenAPI schemas.
+
+Each schema is compiled once into a validator (see
+resolution/schema_compiler.py) and reused for every response.
+
+Full response contracts (`assert_response_contract`) are checked against
+the spec's `responses` section, written by the test generator to
+automation/api/contract_schemas.json.
+
+Environment overrides:
+- CONTRACT_VALIDATION → "full" (default) or "off"
+- CONTRACT_SAMPLE     → "N,K": for long arrays validate only the first N
+                        elements plus K random others (default: every element)
+- CONTRACT_SEED       → seed of the random elements (default 0); sampled
+                        failures print it, set it to reproduce one
+
+With STREAM_RESPONSES=1, large bodies are validated incrementally.
 """
 
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from automation.utils.json_stream import streamed_body, validate_json_stream
+from resolution.schema_compiler import DEFAULT_SAMPLE_SEED, ContractValidator, compile_validator
+
+CONTRACT_SCHEMA_FILE = Path(__file__).resolve().parents[1] / "api" / "contract_schemas.json"
+
+
 def assert_schema(data, schema, path="response"):
     if schema is None:
         return
 
-    schema_type = schema.get("type")
+    compile_validator(schema)(data, path)
+
+
+@lru_cache(maxsize=1)
+def contract_validator() -> Optional[ContractValidator]:
+    if not CONTRACT_SCHEMA_FILE.exists():
+        return None
+
+    document = json.loads(CONTRACT_SCHEMA_FILE.read_text(encoding="utf-8"))
+
+    sample_first, sample_random = None, 0
+    sample = os.getenv("CONTRACT_SAMPLE")
+    if sample:
+        first, _, random_count = sample.partition(",")
+        sample_first, sample_random = int(first), int(random_count or 0)
 
-    if schema_type == "object":
-        assert isinstance(data, dict), f"{path} should be an object"
+    seed = int(os.getenv("CONTRACT_SEED", DEFAULT_SAMPLE_SEED))
 
-        required = schema.get("required", [])
-        properties = schema.get("properties", {})
+    return ContractValidator(
+        document, sample_first=sample_first, sample_random=sample_random, seed=seed
+    )
 
-        for field in required:
-            assert field in data, f"{path}.{field} is required but missing"
 
-        for field, field_schema in properties.items():
-            if field in data:
-                assert_schema(
-                    data[field],
-                    field_schema,
-                    f"{path}.{field}"
-                )
+def response_schema(document: dict, method: str, path: str, status_code: int) -> Optional[dict]:
+    """
+    Documented schema for a status: exact code, then 2XX-style range, then default.
+    """
+    responses = document.get("operations", {}).get(f"{method.upper()} {path}", {})
 
-    elif schema_type == "array":
-        assert isinstance(data, list), f"{path} should be an array"
-        item_schema = schema.get("items")
-        if item_schema and data:
-            assert_schema(data[0], item_schema, f"{path}[0]")
+    for key in (str(status_code), f"{status_code // 100}XX", "default"):
+        if key in responses:
+            return responses[key]
 
-    elif schema_type == "string":
-        assert isinstance(data, str), f"{path} should be string"
+    return None
 
-    elif schema_type == "integer":
-        assert isinstance(data, int), f"{path} should be integer"
 
-    elif schema_type == "number":
-        assert isinstance(data, (int, float)), f"{path} should be number"
+def assert_response_contract(response, method, path):
+    if os.getenv("CONTRACT_VALIDATION", "full") == "off":
+        return
+
+    validator = contract_validator()
+    if validator is None:
+        return
+
+    schema = response_schema(validator.document, method, path, response.status_code)
+    if schema is None:
+        return
+
+    # Streamed bodies are validated element by element
+    body = streamed_body(response)
+    if body is not None:
+        reader = body.reader()
+        if reader.peek():
+            validate_json_stream(validator, reader, schema, "response")
+        return
+
+    if not response.content:
+        return
+
+    try:
+        data = response.json()
+    except ValueError:
+        raise AssertionError(
+            f"{method} {path} returned {response.status_code} with a non-JSON body"
+        ) from None
 
-    elif schema_type == "boolean":
-        assert isinstance(data, bool), f"{path} should be boolean"
+    validator.validate(data, schema, "response")
@@ -0,0 +1,90 @@
+"""
+Data Factory Benchmark
+----------------------
+Times deterministic value generation for a large flattened schema:
+
+- per-field `deterministic_value` calls as the previous implementation
+  made them (SHA-256 hexdigest parsed back into an int)
+- the batch `deterministic_values` API in "compat" mode (same values)
+- the batch API in "fast" mode (BLAKE2b, 8-byte digest)
+
+Compat output is checked against the per-field reference.
+
+Usage:
+    python -m benchmarks.bench_data_factory --fields 100000
+"""
+
+import argparse
+import hashlib
+import time
+
+from agent.data_factory import (
+    COMPAT_MODE,
+    FAST_MODE,
+    deterministic_value,
+    deterministic_values,
+)
+
+FIELD_TYPES = ("string", "integer", "number", "boolean", "string", "integer")
+
+
+def build_fields(count: int):
+    return [(f"field_{i}", FIELD_TYPES[i % len(FIELD_TYPES)]) for i in range(count)]
+
+
+# --------------------------------------------------
+# Previous per-field implementation (reference)
+# --------------------------------------------------
+def legacy_value(tc_id: str, field: str, type_name: str):
+    h = int(hashlib.sha256(f"{tc_id}:{field}".encode()).hexdigest(), 16)
+
+    if type_name == "string":
+        return f"{field}_{h % 10000}"
+    if type_name == "integer":
+        return h % 100
+    if type_name == "number":
+        return round((h % 1000) / 10, 2)
+    if type_name == "boolean":
+        return True
+    return None
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<22}{time.perf_counter() - start:.3f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fields", type=int, default=100_000)
+    parser.add_argument("--tc-id", default="TC_001")
+    args = parser.parse_args()
+
+    fields = build_fields(args.fields)
+    tc_id = args.tc_id
+    print(f"fields:               {len(fields)}")
+
+    reference = timed(
+        "legacy per-field:",
+        lambda: [legacy_value(tc_id, f, t) for f, t in fields],
+    )
+    timed(
+        "per-field (compat):",
+        lambda: [deterministic_value(tc_id, f, t, mode=COMPAT_MODE) for f, t in fields],
+    )
+    compat = timed(
+        "batch (compat):",
+        lambda: deterministic_values(tc_id, fields, mode=COMPAT_MODE),
+    )
+    timed(
+        "batch (fast):",
+        lambda: deterministic_values(tc_id, fields, mode=FAST_MODE),
+    )
+
+    print(f"compat identical:     {compat == reference}")
+
+
+if __name__ == "__main__":
+    main()
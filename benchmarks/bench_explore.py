@@ -0,0 +1,68 @@
+"""
+Behavior Explorer Benchmark
+---------------------------
+Wall-clock comparison of sequential vs concurrent exploration
+against a local stub server.
+
+Usage:
+    python -m benchmarks.bench_explore --endpoints 100 --concurrency 16
+"""
+
+import argparse
+import time
+
+from agent.behavior_explorer import BehaviorExplorer
+from benchmarks.stub_server import StubServer
+
+
+def build_endpoints(count: int):
+    methods = ["GET", "POST", "PUT", "DELETE"]
+    return [
+        {"method": methods[i % len(methods)], "path": f"/api/v1/resource_{i}"}
+        for i in range(count)
+    ]
+
+
+def run(base_url, endpoints, role_headers, concurrency):
+    explorer = BehaviorExplorer(
+        base_url=base_url,
+        endpoints=endpoints,
+        role_headers=role_headers,
+        max_concurrency=concurrency,
+    )
+    start = time.perf_counter()
+    report = explorer.explore_all()
+    return time.perf_counter() - start, report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--endpoints", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    endpoints = build_endpoints(args.endpoints)
+    role_headers = {
+        "admin": {"Authorization": "Bearer admin"},
+        "user": {"Authorization": "Bearer user"},
+    }
+
+    with StubServer(latency=args.latency) as server:
+        sequential_time, sequential_report = run(
+            server.base_url, endpoints, role_headers, 1
+        )
+        concurrent_time, concurrent_report = run(
+            server.base_url, endpoints, role_headers, args.concurrency
+        )
+
+    assert sequential_report == concurrent_report, "report mismatch"
+
+    print(f"endpoints:   {args.endpoints} (stub latency {args.latency * 1000:.0f} ms)")
+    print(f"sequential:  {sequential_time:.2f} s")
+    print(f"concurrent:  {concurrent_time:.2f} s (concurrency={args.concurrency})")
+    print(f"speedup:     {sequential_time / concurrent_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
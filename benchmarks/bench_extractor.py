@@ -0,0 +1,114 @@
+"""
+Response Extractor Benchmark
+----------------------------
+Times lifecycle capture from a create / list response:
+
+- the previous `extract_resource_values`: every top-level key tested
+  against each distinct path-parameter (type, format), with `re`
+  imported and the UUID pattern looked up inside every test
+- the precompiled ResponseExtractor (top level plus nested parameter
+  names), and an explicit `data.items[*].id` rule
+
+Top-level results are checked against the previous implementation.
+
+Usage:
+    python -m benchmarks.bench_extractor --params 200 --keys 200 --items 10000
+"""
+
+import argparse
+import time
+import uuid
+
+from resolution.response_extractor import compile_rule
+from resolution.spec_index import SpecIndex
+
+PARAM_TYPES = (("string", "uuid"), ("integer", None), ("string", None))
+
+
+def build_spec(params: int) -> dict:
+    paths = {}
+    for i in range(params):
+        schema_type, schema_format = PARAM_TYPES[i % len(PARAM_TYPES)]
+        schema = {"type": schema_type}
+        if schema_format:
+            schema["format"] = schema_format
+        paths[f"/resource_{i}/{{resource_{i}_id}}"] = {
+            "get": {
+                "parameters": [
+                    {"name": f"resource_{i}_id", "in": "path", "required": True, "schema": schema}
+                ],
+                "responses": {"200": {"description": "ok"}},
+            }
+        }
+    return {"openapi": "3.0.0", "paths": paths}
+
+
+def build_response(keys: int, items: int) -> dict:
+    response = {"id": str(uuid.uuid4())}
+    for i in range(keys):
+        response[f"field_{i}"] = i if i % 2 else f"value_{i}"
+    response["data"] = {
+        "owner": {"resource_1_id": 7},
+        "items": [{"id": str(uuid.uuid4()), "resource_0_id": str(uuid.uuid4())} for _ in range(items)],
+    }
+    return response
+
+
+# --------------------------------------------------
+# Previous implementation (reference)
+# --------------------------------------------------
+def legacy_matches(value, expected_type, expected_format):
+    if expected_type == "string":
+        if expected_format == "uuid":
+            import re
+            return isinstance(value, str) and re.match(r"^[0-9a-fA-F-]{36}$", value)
+        return isinstance(value, str)
+    if expected_type == "integer":
+        return isinstance(value, int)
+    return False
+
+
+def legacy_extract(response: dict, path_param_types: list) -> dict:
+    resources = {}
+    for key, value in response.items():
+        if not isinstance(value, (str, int)):
+            continue
+        for expected_type, expected_format in path_param_types:
+            if legacy_matches(value, expected_type, expected_format):
+                resources[key] = value
+                break
+    return resources
+
+
+def timed(label: str, fn, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    print(f"{label:<26}{(time.perf_counter() - start) / rounds * 1e6:10.1f} µs")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--params", type=int, default=200)
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    index = SpecIndex(build_spec(args.params))
+    response = build_response(args.keys, args.items)
+    print(f"path params: {args.params}, top-level keys: {len(response)}, list items: {args.items}")
+
+    reference = timed("legacy (top level):", lambda: legacy_extract(response, index.path_param_types), args.rounds)
+    extracted = timed("extractor:", lambda: index.extractor.extract(response), args.rounds)
+    rule = compile_rule("data.items[*].id")
+    timed("rule data.items[*].id:", lambda: rule.first(response), args.rounds)
+
+    top_level = {key: value for key, value in extracted.items() if key in response}
+    print(f"top level identical:      {top_level == reference}")
+    print(f"nested captured:          {sorted(set(extracted) - set(reference))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Component Graph Benchmark
+-------------------------
+Compares per-endpoint $ref resolution (the previous SchemaAnalyzer
+behavior: a fresh recursive walk for every request body) with the
+compiled, memoized ComponentGraph.
+
+By default a synthetic spec with thousands of layered schemas is used.
+Pass --spec to time a real OpenAPI JSON document instead.
+
+Usage:
+    python -m benchmarks.bench_schema_graph --schemas 3000 --operations 1500
+    python -m benchmarks.bench_schema_graph --spec openapi.json
+"""
+
+import argparse
+import json
+import time
+
+from resolution.component_graph import ComponentGraph
+
+LAYER_DEPTH = 6
+
+
+def build_spec(schema_count: int, operation_count: int) -> dict:
+    per_layer = max(1, schema_count // LAYER_DEPTH)
+    schemas = {}
+
+    for i in range(schema_count):
+        layer = i // per_layer
+        properties = {
+            "id": {"type": "string", "format": "uuid"},
+            "name": {"type": "string"},
+            "count": {"type": "integer"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        }
+        # Each schema references two schemas of the layer below
+        if layer > 0:
+            base = (layer - 1) * per_layer
+            properties["left"] = {"$ref": f"#/components/schemas/S{base + i % per_layer}"}
+            properties["right"] = {
+                "type": "array",
+                "items": {"$ref": f"#/components/schemas/S{base + (i * 7) % per_layer}"},
+            }
+        schemas[f"S{i}"] = {"type": "object", "required": ["id"], "properties": properties}
+
+    paths = {}
+    for i in range(operation_count):
+        ref = f"#/components/schemas/S{schema_count - 1 - i % per_layer}"
+        paths[f"/resource_{i}"] = {
+            "post": {
+                "requestBody": {
+                    "content": {"application/json": {"schema": {"$ref": ref}}}
+                }
+            }
+        }
+
+    return {"paths": paths, "components": {"schemas": schemas}}
+
+
+def request_schemas(spec: dict):
+    for methods in spec.get("paths", {}).values():
+        for operation in methods.values():
+            if not isinstance(operation, dict):
+                continue
+            content = (operation.get("requestBody") or {}).get("content", {})
+            for media in content.values():
+                yield media.get("schema", {})
+
+
+# --------------------------------------------------
+# Previous per-endpoint resolution (reference)
+# --------------------------------------------------
+def legacy_resolve_ref(ref_path, spec):
+    node = spec
+    for part in ref_path.strip("#/").split("/"):
+        node = node.get(part, {})
+    return node
+
+
+def legacy_resolve(schema, spec):
+    if not isinstance(schema, dict):
+        return schema
+    if "$ref" in schema:
+        return legacy_resolve(legacy_resolve_ref(schema["$ref"], spec), spec)
+    if "anyOf" in schema:
+        return {"anyOf": [legacy_resolve(o, spec) for o in schema["anyOf"]]}
+    if "properties" in schema:
+        return {
+            **schema,
+            "properties": {k: legacy_resolve(v, spec) for k, v in schema["properties"].items()},
+        }
+    if "items" in schema:
+        return {**schema, "items": legacy_resolve(schema["items"], spec)}
+    return schema
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spec", help="Path to an OpenAPI JSON file")
+    parser.add_argument("--schemas", type=int, default=3000)
+    parser.add_argument("--operations", type=int, default=1500)
+    args = parser.parse_args()
+
+    if args.spec:
+        with open(args.spec) as f:
+            spec = json.load(f)
+    else:
+        spec = build_spec(args.schemas, args.operations)
+
+    bodies = list(request_schemas(spec))
+    print(f"schemas:    {len(spec.get('components', {}).get('schemas', {}))}")
+    print(f"bodies:     {len(bodies)}")
+
+    start = time.perf_counter()
+    try:
+        for schema in bodies:
+            legacy_resolve(schema, spec)
+        print(f"legacy:     {time.perf_counter() - start:.3f} s")
+    except RecursionError:
+        print("legacy:     RecursionError (self-referencing schemas)")
+
+    start = time.perf_counter()
+    graph = ComponentGraph(spec)
+    compiled = time.perf_counter() - start
+    for schema in bodies:
+        graph.resolve(schema)
+    total = time.perf_counter() - start
+
+    print(f"compile:    {compiled:.3f} s ({len(graph.recursive_refs)} recursive refs)")
+    print(f"compiled:   {total:.3f} s (compile + resolve all bodies)")
+
+
+if __name__ == "__main__":
+    main()
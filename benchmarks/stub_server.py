@@ -0,0 +1,69 @@
+"""
+Local Stub Server
+-----------------
+Minimal threaded HTTP server for benchmarks.
+
+Every request sleeps for a fixed latency and answers with a small
+JSON body. Requests without an Authorization header get 401.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(latency: float):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _respond(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+
+            time.sleep(latency)
+
+            if "Authorization" not in self.headers:
+                status, payload = 401, {"detail": "Not authenticated"}
+            else:
+                status, payload = 200, [{"id": 1, "name": "item"}]
+
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StubServer:
+    def __init__(self, latency: float = 0.02, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = _Server((host, port), make_handler(latency))
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,139 @@
+# resolution/component_graph.py
+
+from typing import Any, Dict, Set
+
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+
+def lookup_ref(document: Dict[str, Any], ref_path: str) -> Dict[str, Any]:
+    """
+    Looks up a local $ref like #/components/schemas/XYZ in a document.
+    """
+    node = document
+    for part in ref_path.strip("#/").split("/"):
+        node = node.get(part, {})
+    return node
+
+
+class ComponentGraph:
+    """
+    One-time compilation of every `components/schemas` entry into a
+    shared, memoized, fully resolved schema graph.
+
+    - `$ref` is resolved once per component and shared by every caller
+    - `allOf` is merged, `anyOf` / `oneOf` options are resolved
+    - Self-referencing DTOs are cut with a lazy placeholder:
+      {"$ref": "...", "x-recursive": True}, expandable via `expand`
+    """
+
+    def __init__(self, swagger_spec: Dict[str, Any]):
+        self.swagger_spec = swagger_spec
+        self.resolved: Dict[str, Dict[str, Any]] = {}
+        self.recursive_refs: Set[str] = set()
+        self._resolving: Set[str] = set()
+
+        schemas = swagger_spec.get("components", {}).get("schemas", {})
+        for name in schemas:
+            self.resolve_ref(f"{SCHEMA_REF_PREFIX}{name}")
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def resolve(self, schema: Any) -> Any:
+        """
+        Resolves an arbitrary (possibly inline) schema against the graph.
+        """
+        if not isinstance(schema, dict):
+            return schema
+
+        if "$ref" in schema:
+            return self.resolve_ref(schema["$ref"])
+
+        if "allOf" in schema:
+            siblings = self.resolve({k: v for k, v in schema.items() if k != "allOf"})
+            return self._merge_all_of(
+                [self.resolve(part) for part in schema["allOf"]] + [siblings]
+            )
+
+        resolved = dict(schema)
+
+        for keyword in ("anyOf", "oneOf"):
+            if keyword in resolved:
+                resolved[keyword] = [self.resolve(option) for option in resolved[keyword]]
+
+        if "properties" in resolved:
+            resolved["properties"] = {
+                key: self.resolve(value)
+                for key, value in resolved["properties"].items()
+            }
+
+        if "items" in resolved:
+            resolved["items"] = self.resolve(resolved["items"])
+
+        if isinstance(resolved.get("additionalProperties"), dict):
+            resolved["additionalProperties"] = self.resolve(resolved["additionalProperties"])
+
+        return resolved
+
+    def resolve_ref(self, ref_path: str) -> Dict[str, Any]:
+        if ref_path in self.resolved:
+            return self.resolved[ref_path]
+
+        # Cycle: hand back a lazy placeholder instead of recursing
+        if ref_path in self._resolving:
+            self.recursive_refs.add(ref_path)
+            return {"$ref": ref_path, "x-recursive": True}
+
+        self._resolving.add(ref_path)
+        try:
+            resolved = self.resolve(self._lookup(ref_path))
+        finally:
+            self._resolving.discard(ref_path)
+
+        self.resolved[ref_path] = resolved
+        return resolved
+
+    def expand(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Expands one level of a lazy recursive placeholder.
+        """
+        if isinstance(schema, dict) and schema.get("x-recursive"):
+            return self.resolve_ref(schema["$ref"])
+        return schema
+
+    # --------------------------------------------------
+    # Internals
+    # --------------------------------------------------
+    def _lookup(self, ref_path: str) -> Dict[str, Any]:
+        return lookup_ref(self.swagger_spec, ref_path)
+
+    def _merge_all_of(self, parts: list) -> Dict[str, Any]:
+        """
+        Merges resolved allOf parts; later parts win on conflicting keys.
+        """
+        merged: Dict[str, Any] = {}
+        properties: Dict[str, Any] = {}
+        required: list = []
+
+        for part in parts:
+            if not isinstance(part, dict) or part.get("x-recursive"):
+                continue
+
+            properties.update(part.get("properties", {}))
+
+            for field_name in part.get("required", []):
+                if field_name not in required:
+                    required.append(field_name)
+
+            for key, value in part.items():
+                if key not in ("properties", "required"):
+                    merged[key] = value
+
+        if properties:
+            merged["properties"] = properties
+            merged.setdefault("type", "object")
+
+        if required:
+            merged["required"] = required
+
+        return merged
@@ -2,44 +2,65 @@
 
 from typing import Any
 from .context import StepResolutionContext
+from .spec_index import SpecIndex
 
 
 class DependencyResolver:
     """
     Resolves dependencies like path params and entity references
     from execution context.
+
+    A name with no exact execution-context key is looked up in the spec's
+    producer index (SpecIndex.producers): "projectId" reuses a captured
+    "project.id". A field some operation produces but nothing captured yet
+    is marked "producer", with the context keys to read at run time,
+    instead of getting a made-up ID.
     """
 
     def resolve(self, context: StepResolutionContext) -> StepResolutionContext:
         execution_memory = context.execution_context or {}
+        producers = SpecIndex.for_spec(context.swagger_spec).producers
+        node = (context.http_method.upper(), context.endpoint)
 
         # Resolve path parameters
         for param_name in context.path_params_schema.keys():
-            if param_name in execution_memory:
-                context.dependency_map[param_name] = {
-                    "source": "execution_context",
-                    "value": execution_memory[param_name],
-                }
-            else:
-                context.dependency_map[param_name] = {
-                    "source": "generate",
-                    "value": None,
-                }
+            context.dependency_map[param_name] = self._dependency(
+                param_name, execution_memory, producers, node
+            )
 
         # Resolve body-level dependencies
         properties = context.request_schema.get("properties", {})
 
         for field_name in properties.keys():
-            if field_name in execution_memory:
-                context.dependency_map[field_name] = {
-                    "source": "execution_context",
-                    "value": execution_memory[field_name],
-                }
-            else:
-                if field_name not in context.dependency_map:
-                    context.dependency_map[field_name] = {
-                        "source": "generate",
-                        "value": None,
-                    }
+            dependency = self._dependency(field_name, execution_memory, producers, node)
+            if dependency["source"] != "generate" or field_name not in context.dependency_map:
+                context.dependency_map[field_name] = dependency
 
         return context
+
+    @staticmethod
+    def _dependency(name: str, execution_memory, producers, node) -> dict:
+        if execution_memory.get(name) is not None:
+            return {"source": "execution_context", "value": execution_memory.get(name)}
+
+        # Producers of the field other than this operation, best first
+        candidates = [producer for producer in producers.lookup(name) if producer.node != node]
+        if not candidates:
+            return {"source": "generate", "value": None}
+
+        keys = [name]
+        for producer in candidates:
+            if producer.key not in keys:
+                keys.append(producer.key)
+
+        for key in keys[1:]:
+            value = execution_memory.get(key)
+            if value is not None:
+                return {"source": "execution_context", "value": value, "key": key}
+
+        return {
+            "source": "producer",
+            "value": None,
+            "keys": keys,
+            "producers": [f"{producer.method} {producer.path}" for producer in candidates],
+        }
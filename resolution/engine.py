@@ -63,5 +63,11 @@ class TestDataResolutionEngine:
             metadata={
                 "role": context.role_context.get("role"),
                 "intent": context.intent_metadata,
+                # Body field -> execution-context keys to fill it from at run time
+                "links": {
+                    field_name: dependency["keys"]
+                    for field_name, dependency in context.dependency_map.items()
+                    if dependency["source"] == "producer" and field_name in context.resolved_body
+                },
             },
         )
@@ -1,19 +1,227 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Lookups outside any namespace (and the fallback of namespaced ones)
+ROOT_NAMESPACE = ""
+
+# (namespace, key, value)
+Entry = Tuple[str, str, Any]
+
+
+class MemoryBackend:
+    """
+    In-process store: one pytest process, one load runner chain.
+    """
+
+    def __init__(self):
+        self._values: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def set_many(self, entries: Iterable[Entry]):
+        with self._lock:
+            for namespace, key, value in entries:
+                self._values[(namespace, key)] = value
+
+    def get(self, namespace: str, key: str):
+        return self._values.get((namespace, key))
+
+    def contains(self, namespace: str, key: str) -> bool:
+        return (namespace, key) in self._values
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        with self._lock:
+            return {k: v for (ns, k), v in self._values.items() if ns == namespace}
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class SQLiteBackend:
+    """
+    Store shared by every process on the host through one SQLite file in
+    WAL mode: pytest-xdist workers and CI shards see each other's captures.
+
+    - Each `set_many` is one transaction, so a batch of captures becomes
+      visible atomically
+    - Reads are served from a per-process snapshot: when `PRAGMA
+      data_version` reports a commit from another connection, only rows
+      written since the last refresh are read (row ids only grow)
+    - Values are stored as JSON (str / int IDs keep their type)
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self._version = None
+        self._last_id = 0
+        self._snapshot: Dict[Tuple[str, str], Any] = {}
+
+    def connection(self) -> sqlite3.Connection:
+        # Never reuse a connection inherited through fork
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS resources ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " UNIQUE (namespace, key))"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+            self._version = None
+            self._last_id = 0
+            self._snapshot = {}
+        return self._connection
+
+    def _refresh(self):
+        connection = self.connection()
+        version = connection.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._version:
+            rows = connection.execute(
+                "SELECT id, namespace, key, value FROM resources WHERE id > ? ORDER BY id",
+                (self._last_id,),
+            )
+            for row_id, namespace, key, value in rows:
+                self._snapshot[(namespace, key)] = json.loads(value)
+                self._last_id = row_id
+            self._version = version
+
+    def set_many(self, entries: Iterable[Entry]):
+        rows = [(namespace, key, json.dumps(value)) for namespace, key, value in entries]
+        if not rows:
+            return
+
+        with self._lock:
+            connection = self.connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                # REPLACE gives an updated key a new, higher row id
+                connection.executemany(
+                    "INSERT OR REPLACE INTO resources (namespace, key, value) VALUES (?, ?, ?)",
+                    rows,
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+            # Own commits do not change data_version: read them back here
+            self._version = None
+            self._refresh()
+
+    def get(self, namespace: str, key: str):
+        with self._lock:
+            self._refresh()
+            return self._snapshot.get((namespace, key))
+
+    def contains(self, namespace: str, key: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return (namespace, key) in self._snapshot
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            return {k: v for (ns, k), v in self._snapshot.items() if ns == namespace}
+
+    def clear(self):
+        with self._lock:
+            # Start of a run only: other processes' snapshots are not reset
+            self.connection().execute("DELETE FROM resources")
+            self._snapshot = {}
+
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "sqlite": SQLiteBackend,
+}
+
+
 class ExecutionContext:
     """
     Stores dynamic resources captured during test execution.
     Used for lifecycle chaining.
+
+    Keys live in namespaces (one per lifecycle chain / resource type), so
+    two chains capturing the same parameter name do not overwrite each
+    other. Every register also writes to the root namespace (last writer
+    wins), for tests outside any chain.
+
+    `get` / `has` only see the view's own namespace: a chain whose create
+    step captured nothing never picks up another chain's ID (and deletes
+    it). Reading another chain's value is opt-in through `lookup`.
+
+    Environment overrides (`from_env`):
+    - EXECUTION_CONTEXT_BACKEND → memory (default) / sqlite
+    - EXECUTION_CONTEXT_FILE    → SQLite file (default .execution_context.sqlite)
     """
 
-    def __init__(self):
-        self.resources = {}
+    def __init__(self, backend=None, namespace: str = ROOT_NAMESPACE):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.name = namespace
+        self._namespaces: Dict[str, "ExecutionContext"] = {}
+
+    @classmethod
+    def from_env(cls) -> "ExecutionContext":
+        kind = os.getenv("EXECUTION_CONTEXT_BACKEND", "memory").lower()
+        if kind not in BACKENDS:
+            raise ValueError(
+                f"EXECUTION_CONTEXT_BACKEND must be one of {', '.join(BACKENDS)}, got {kind!r}"
+            )
+        if kind == "sqlite":
+            return cls(SQLiteBackend(os.getenv("EXECUTION_CONTEXT_FILE", ".execution_context.sqlite")))
+        return cls()
+
+    def namespace(self, name: str) -> "ExecutionContext":
+        """
+        View of the same store whose keys live under `name`.
+        """
+        view = self._namespaces.get(name)
+        if view is None:
+            view = self._namespaces[name] = ExecutionContext(self.backend, name)
+        return view
 
     def register(self, values: dict):
         if not values:
             return
-        self.resources.update(values)
+
+        entries = [(self.name, key, value) for key, value in values.items()]
+        if self.name != ROOT_NAMESPACE:
+            entries += [(ROOT_NAMESPACE, key, value) for key, value in values.items()]
+        self.backend.set_many(entries)
 
     def get(self, key: str):
-        return self.resources.get(key)
+        return self.backend.get(self.name, key)
 
     def has(self, key: str) -> bool:
-        return key in self.resources
+        return self.backend.contains(self.name, key)
+
+    def lookup(self, key: str):
+        """
+        Own value, else the last one any chain registered (root namespace).
+        """
+        value = self.backend.get(self.name, key)
+        if value is None and self.name != ROOT_NAMESPACE:
+            value = self.backend.get(ROOT_NAMESPACE, key)
+        return value
+
+    @property
+    def resources(self) -> Dict[str, Any]:
+        return self.backend.items(self.name)
+
+    def clear(self):
+        self.backend.clear()
@@ -2,9 +2,9 @@
 import os
 from typing import Any, Dict
 from .context import StepResolutionContext
-from agent.data_factory import deterministic_value
-import uuid
-from datetime import datetime
+from .schema_compiler import CompiledGenerator, compile_generator, is_recursive
+from .spec_index import SpecIndex
+from agent.data_factory import deterministic_values
 class FieldResolver:
     """
     Builds resolved request payload using strategy map.
@@ -17,6 +17,10 @@ class FieldResolver:
 
         tc_id = f"TC_{context.deterministic_seed or 1:03d}"
 
+        # Generated fields use compiled generators and are hashed in one batch
+        compiled: Dict[str, CompiledGenerator] = {}
+        graph = SpecIndex.for_spec(context.swagger_spec).graph
+
         for field_name, schema in properties.items():
             strategy = context.strategy_map.get(field_name, "DEFAULT")
             
@@ -30,71 +34,38 @@ class FieldResolver:
                 enum_values = schema.get("enum", [])
                 resolved_body[field_name] = enum_values[0] if enum_values else None
 
+            elif is_recursive(schema) and field_name not in context.required_fields:
+                # Optional self-references are left out (see compile_generator)
+                continue
+
             else:
-                resolved_body[field_name] = self._generate_value(
-                    schema,
-                    tc_id,
-                    field_name
-                )
+                # Placeholder keeps the schema's field order
+                resolved_body[field_name] = None
+                compiled[field_name] = compile_generator(schema, graph=graph)
+
+        values = iter(deterministic_values(tc_id, [
+            leaf
+            for field_name, generator in compiled.items()
+            for leaf in generator.leaf_fields(field_name)
+        ]))
+        for field_name, generator in compiled.items():
+            resolved_body[field_name] = generator.build(tc_id, field_name, values)
 
         context.resolved_body = resolved_body
 
-        # Resolve path params
+        # Resolve path params; uncaptured ones are hashed in one batch too
+        generated = []
         for param_name, dependency in context.dependency_map.items():
             if param_name in context.path_params_schema:
                 if dependency["source"] == "execution_context":
                     context.resolved_path_params[param_name] = dependency["value"]
                 else:
-                    context.resolved_path_params[param_name] = deterministic_value(
-                        tc_id,
-                        param_name,
-                        context.path_params_schema[param_name].get("type", "string")
+                    context.resolved_path_params[param_name] = None
+                    generated.append(
+                        (param_name, context.path_params_schema[param_name].get("type", "string"))
                     )
 
-        return context
-
-    def _generate_value(self, schema: Dict[str, Any], tc_id: str, field_name: str) -> Any:
-
-        # -------------------------
-        # Normalize anyOf
-        # -------------------------
-        if "anyOf" in schema:
-            for option in schema["anyOf"]:
-                if option.get("type") != "null":
-                    schema = option
-                    break
-
-        schema_type = schema.get("type", "string")
-        schema_format = schema.get("format")
+        for (param_name, _), value in zip(generated, deterministic_values(tc_id, generated)):
+            context.resolved_path_params[param_name] = value
 
-        # -------------------------
-        # Format-aware generation
-        # -------------------------
-        if schema_format == "uuid":
-            namespace = uuid.NAMESPACE_DNS
-            return str(uuid.uuid5(namespace, f"{tc_id}-{field_name}"))
-
-        if schema_format == "date-time":
-            return datetime.utcnow().isoformat()
-
-        # -------------------------
-        # Object
-        # -------------------------
-        if schema_type == "object":
-            properties = schema.get("properties", {})
-            return {
-                key: self._generate_value(value_schema, tc_id, key)
-                for key, value_schema in properties.items()
-            }
-
-        # -------------------------
-        # Array
-        # -------------------------
-        if schema_type == "array":
-            item_schema = schema.get("items", {})
-            return [self._generate_value(item_schema, tc_id, field_name)]
-
-        # -------------------------
-        # Default primitive
-        # -------------------------
-        return deterministic_value(tc_id, field_name, schema_type)
+        return context
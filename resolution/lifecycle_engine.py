@@ -1,3 +1,7 @@
+from .response_extractor import compile_matcher
+from .spec_index import SpecIndex
+
+
 class LifecycleContext:
     """
     Holds runtime-created resource identifiers
@@ -15,49 +19,18 @@ class LifecycleContext:
 class LifecycleChainingEngine:
 
     @staticmethod
-    def extract_resource_values(response_json: dict, swagger_spec: dict) -> dict:
-        if not isinstance(response_json, dict):
+    def extract_resource_values(response_json, swagger_spec: dict, rules: dict = None) -> dict:
+        """
+        Resource identifiers of a response, through the spec's precompiled
+        ResponseExtractor (see resolution/response_extractor.py). `rules`
+        maps names to JSONPath-like paths, e.g. {"project_id": "data.id"}.
+        """
+        if not isinstance(response_json, (dict, list)):
             return {}
 
-        path_param_schemas = []
-
-        paths = swagger_spec.get("paths", {})
-
-        for path, methods in paths.items():
-            for method_data in methods.values():
-                for param in method_data.get("parameters", []):
-                    if param.get("in") == "path":
-                        path_param_schemas.append(param.get("schema", {}))
-
-        resources = {}
-
-        for key, value in response_json.items():
-            if not isinstance(value, (str, int)):
-                continue
-
-            for schema in path_param_schemas:
-                if LifecycleChainingEngine.matches_schema(
-                    value,
-                    schema.get("type"),
-                    schema.get("format")
-                ):
-                    resources[key] = value
-
-        return resources
+        return SpecIndex.for_spec(swagger_spec).extractor.extract(response_json, rules)
 
     @staticmethod
     def matches_schema(value, expected_type, expected_format):
-
-        if expected_type == "string":
-            if expected_format == "uuid":
-                import re
-                return isinstance(value, str) and re.match(
-                    r"^[0-9a-fA-F-]{36}$", value
-                )
-
-            return isinstance(value, str)
-
-        if expected_type == "integer":
-            return isinstance(value, int)
-
-        return False
+        matcher = compile_matcher(expected_type, expected_format)
+        return matcher is not None and matcher(value)
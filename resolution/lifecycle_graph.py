@@ -0,0 +1,331 @@
+# resolution/lifecycle_graph.py
+
+import heapq
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .execution_context import ExecutionContext
+from .spec_index import SpecIndex
+
+# (METHOD, path)
+Node = Tuple[str, str]
+
+PATH_PARAM = re.compile(r"{([^}]+)}")
+
+# Order of the steps inside a lifecycle chain
+PHASES = {"create": 0, "read": 1, "search": 1, "update": 2, "delete": 3}
+
+# Levels of nested response objects searched for a create step's ID
+CAPTURE_DEPTH = 3
+
+# Classification of operations the intent model does not cover
+METHOD_CLASSIFICATION = {
+    "POST": "create",
+    "GET": "read",
+    "PUT": "update",
+    "PATCH": "update",
+    "DELETE": "delete",
+}
+
+
+class LifecycleGraph:
+    """
+    Producer / consumer DAG of the spec's operations.
+
+    - A create operation on a collection ("POST /projects/") produces the
+      path parameter right below it ("/projects/{project_id}"); its
+      capture rule points at the response field of the same name, else
+      "id", nested objects included ("data.id")
+    - Every operation whose path contains a produced parameter depends on
+      its producer; within one resource read/search run before update,
+      and a delete runs after everything else that uses the resource
+    - Weakly connected components are the lifecycle chains: independent
+      of each other, topologically ordered inside (create → read/search →
+      update → delete, spec order among equals)
+    """
+
+    def __init__(self, swagger_spec: Dict[str, Any], classifications: Optional[Dict[Node, str]] = None):
+        index = SpecIndex.for_spec(swagger_spec)
+        classifications = classifications or {}
+
+        self.producer_index = index.producers
+
+        self.order: Dict[Node, int] = {}
+        self.classifications: Dict[Node, str] = {}
+        for position, (path, method) in enumerate(index.operations):
+            node = (method, path)
+            self.order[node] = position
+            self.classifications[node] = (
+                classifications.get(node) or METHOD_CLASSIFICATION.get(method, "read")
+            )
+
+        # (collection, param) -> create node, and its captures
+        self.producers: Dict[Tuple[str, str], Node] = {}
+        self.capture_fields: Dict[Node, Dict[str, str]] = {}
+
+        # node -> (collection, param) it consumes, outermost first
+        self.consumes: Dict[Node, List[Tuple[str, str]]] = {}
+        self.dependencies: Dict[Node, set] = {node: set() for node in self.order}
+
+        self._link(index)
+        self._order_resources()
+        self._chains: Optional[Dict[str, List[Node]]] = None
+
+    # --------------------------------------------------
+    # Build
+    # --------------------------------------------------
+    def _link(self, index: SpecIndex):
+        creators = {
+            node[1].rstrip("/"): node
+            for node in self.order
+            if node[0] == "POST" and self.classifications[node] == "create"
+        }
+
+        for node in self.order:
+            path = node[1]
+            consumed = []
+
+            for match in PATH_PARAM.finditer(path):
+                collection = path[:match.start()].rstrip("/")
+                producer = creators.get(collection)
+                if producer is None:
+                    continue
+
+                resource = (collection, match.group(1))
+                consumed.append(resource)
+
+                if resource not in self.producers:
+                    self.producers[resource] = producer
+                    self.capture_fields.setdefault(producer, {})[resource[1]] = (
+                        self._capture_field(index, producer, resource[1])
+                    )
+
+                if producer != node:
+                    self.dependencies[node].add(producer)
+
+            self.consumes[node] = consumed
+
+    @staticmethod
+    def _capture_field(index: SpecIndex, producer: Node, param: str) -> str:
+        """
+        Extraction rule (resolution/response_extractor.py) of the new ID in
+        the documented success response: the shallowest property named
+        after the parameter, else the shallowest "id" ("data.id").
+        """
+        operation = index.operation(producer[1], producer[0])
+        responses = operation.responses if operation else {}
+
+        level = []
+        for code, response in responses.items():
+            if str(code).startswith("2"):
+                response = index.graph.resolve(response)
+                schema = response.get("content", {}).get("application/json", {}).get("schema")
+                level.append(("", index.graph.resolve(schema or {})))
+
+        for _ in range(CAPTURE_DEPTH):
+            for name in (param, "id"):
+                for prefix, schema in level:
+                    if name in schema.get("properties", {}):
+                        return prefix + name
+
+            children = []
+            for prefix, schema in level:
+                for name, child in schema.get("properties", {}).items():
+                    child = index.graph.resolve(child)
+                    if "properties" in child:
+                        children.append((f"{prefix}{name}.", child))
+            level = children
+
+        return "id"
+
+    def _order_resources(self):
+        # Members of each resource: the consumers of its innermost parameter
+        members: Dict[Tuple[str, str], List[Node]] = {}
+        users: Dict[Tuple[str, str], List[Node]] = {}
+
+        for node, consumed in self.consumes.items():
+            if consumed and self.classifications[node] != "create":
+                members.setdefault(consumed[-1], []).append(node)
+            for resource in consumed:
+                users.setdefault(resource, []).append(node)
+
+        for resource, nodes in members.items():
+            reads = [n for n in nodes if self.phase(n) == PHASES["read"]]
+            deletes = [n for n in nodes if self.phase(n) == PHASES["delete"]]
+
+            for node in nodes:
+                if self.phase(node) == PHASES["update"]:
+                    self.dependencies[node].update(reads)
+
+            # After everything else that uses the resource, children included
+            for node in deletes:
+                self.dependencies[node].update(
+                    user for user in users[resource] if user not in deletes
+                )
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def phase(self, node: Node) -> int:
+        return PHASES.get(self.classifications.get(node), PHASES["read"])
+
+    def captures(self, node: Node) -> Dict[str, str]:
+        """
+        Path parameter -> extraction rule of a create step's response, plus
+        the keys the producer index serves from it ("project.id", "projectId").
+        """
+        captures = self.producer_index.capture_rules(*node)
+        captures.update(self.capture_fields.get(node, {}))
+        return captures
+
+    def requires(self, node: Node) -> List[str]:
+        """
+        Path parameters of `node` that a create step of its chain produces.
+        """
+        return [param for _, param in self.consumes.get(node, ())]
+
+    def chains(self) -> Dict[str, List[Node]]:
+        """
+        Lifecycle chains (two or more linked operations), each in execution
+        order, named after the collection of their first create step.
+        Computed once per graph.
+        """
+        if self._chains is None:
+            self._chains = self._components()
+        return self._chains
+
+    def _components(self) -> Dict[str, List[Node]]:
+        parent = {node: node for node in self.order}
+
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for node, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                parent[find(node)] = find(dependency)
+
+        components: Dict[Node, List[Node]] = {}
+        for node in self.order:
+            components.setdefault(find(node), []).append(node)
+
+        chains: Dict[str, List[Node]] = {}
+        for nodes in components.values():
+            if len(nodes) < 2:
+                continue
+
+            ordered = self.topological(nodes)
+            name = f"lifecycle_{collection_name(ordered[0][1])}"
+            suffix = 2
+            while name in chains:
+                name = f"lifecycle_{collection_name(ordered[0][1])}_{suffix}"
+                suffix += 1
+            chains[name] = ordered
+
+        return chains
+
+    def topological(self, nodes: Iterable[Node]) -> List[Node]:
+        nodes = set(nodes)
+        waiting = {node: len(self.dependencies[node] & nodes) for node in nodes}
+        dependents: Dict[Node, List[Node]] = {}
+        for node in nodes:
+            for dependency in self.dependencies[node] & nodes:
+                dependents.setdefault(dependency, []).append(node)
+
+        def key(node):
+            return (self.phase(node), self.order[node], node)
+
+        ready = [key(node) for node, count in waiting.items() if count == 0]
+        heapq.heapify(ready)
+
+        ordered = []
+        while ready:
+            node = heapq.heappop(ready)[-1]
+            ordered.append(node)
+            for dependent in dependents.get(node, ()):
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    heapq.heappush(ready, key(dependent))
+
+        return ordered
+
+
+def collection_name(path: str) -> str:
+    """
+    Last literal segment of a path, e.g. /api/v1/projects/ -> projects
+    """
+    for segment in reversed(path.strip("/").split("/")):
+        if segment and "{" not in segment:
+            return re.sub(r"\W+", "_", segment).strip("_").lower() or "default"
+    return "default"
+
+
+# --------------------------------------------------
+# Scheduling
+# --------------------------------------------------
+@dataclass
+class ChainResult:
+    name: str
+    # (step, passed / failed / skipped)
+    steps: List[Tuple[Any, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(status == "passed" for _, status in self.steps)
+
+
+class ChainScheduler:
+    """
+    Runs independent lifecycle chains concurrently, at most `max_workers`
+    at a time, and the steps of one chain in order.
+
+    Each chain gets its own ExecutionContext, so captured IDs never leak
+    between chains. A step is skipped when a value it requires was not
+    captured (its create step failed or returned no ID).
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, max_workers)
+
+    def run(
+        self,
+        chains: Dict[str, list],
+        execute: Callable[[Any, ExecutionContext], bool],
+        requires: Callable[[Any], Iterable[str]] = lambda step: (),
+    ) -> List[ChainResult]:
+        """
+        `execute(step, context)` sends one step, registers its captures in
+        the context and returns whether it passed. Results come back in
+        the order of `chains`.
+        """
+        if not chains:
+            return []
+
+        with ThreadPoolExecutor(min(self.max_workers, len(chains))) as pool:
+            futures = [
+                pool.submit(self.run_chain, name, steps, execute, requires)
+                for name, steps in chains.items()
+            ]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def run_chain(name: str, steps: list, execute, requires) -> ChainResult:
+        context = ExecutionContext()
+        result = ChainResult(name)
+
+        for step in steps:
+            if not all(context.has(param) for param in requires(step)):
+                result.steps.append((step, "skipped"))
+                continue
+
+            try:
+                passed = execute(step, context)
+            except Exception:
+                passed = False
+            result.steps.append((step, "passed" if passed else "failed"))
+
+        return result
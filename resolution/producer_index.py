@@ -0,0 +1,203 @@
+# resolution/producer_index.py
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+# Levels of nested response objects / list items indexed per operation
+MAX_PRODUCER_DEPTH = 3
+
+# Ranking of a key's producers, best first
+QUALIFIED, EXACT, PARENT = 0, 1, 2
+
+# Wrapper properties whose fields still describe the operation's resource
+ENVELOPES = frozenset({"data", "result", "results", "item", "items", "content", "payload", "records"})
+
+NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+def normalize(name: str) -> str:
+    """
+    projectId, project_id and Project-ID all become "projectid".
+    """
+    return NON_ALNUM.sub("", name.lower())
+
+
+def singular(word: str) -> str:
+    if word.endswith("ies") and len(word) > 3:
+        return word[:-3] + "y"
+    if word.endswith("sses"):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def resource_name(path: str) -> str:
+    """
+    Singular resource of an operation: /api/v1/projects/ -> project,
+    /projects/{project_id}/tasks/{task_id} -> task
+    """
+    for segment in reversed(path.strip("/").split("/")):
+        if segment and "{" not in segment:
+            return singular(normalize(segment))
+    return ""
+
+
+def is_identifier(name: str) -> bool:
+    return normalize(name).endswith("id")
+
+
+@dataclass(frozen=True)
+class Producer:
+    method: str
+    path: str
+    # Extraction rule of the value in the response (resolution/response_extractor.py)
+    field: str
+    resource: str
+    rank: int
+
+    @property
+    def node(self) -> Tuple[str, str]:
+        return (self.method, self.path)
+
+    @property
+    def key(self) -> str:
+        """
+        Resource-qualified execution-context key of the value: "project.id"
+        (list items share the key of the single resource).
+        """
+        return f"{self.resource}.{self.field.replace('[*]', '').lstrip('.')}"
+
+
+class ProducerIndex:
+    """
+    Inverted index from consumable field names to the operations whose
+    responses produce them, built once per spec from the response schemas
+    (see SpecIndex.producers).
+
+    Every identifier in a success response ("id", "project_id", nested
+    "data.id", list items "[*].id") is indexed under normalized keys:
+    - qualified by the operation's resource, at the top level or inside an
+      envelope ("data"): POST /projects -> id is "projectid"
+    - its own name when that is specific: "project_id" is "projectid"
+    - an embedded object's "id" by its property: "owner.id" is "ownerid"
+
+    A consumer's name ("project_id", "projectId" in a request body, a path
+    parameter) is then one dict lookup. Producers come back best first:
+    by the ranking above, create (POST) operations first, then shallower
+    fields, then spec order.
+    """
+
+    def __init__(self, spec_index):
+        self.graph = spec_index.graph
+        self._producers: Dict[str, List[Producer]] = {}
+
+        ranked = []
+        for position, ((path, method), operation) in enumerate(spec_index.operations.items()):
+            for producer, key, depth in self._productions(method, path, operation):
+                order = (producer.rank, method != "POST", depth, position)
+                ranked.append((order, key, producer))
+
+        for _, key, producer in sorted(ranked, key=lambda item: item[0]):
+            producers = self._producers.setdefault(key, [])
+            if producer not in producers:
+                producers.append(producer)
+
+        # What each producer serves: consumer name -> its rule, plus its own keys
+        self._captures: Dict[Tuple[str, str], Dict[str, str]] = {}
+        for producers in self._producers.values():
+            for producer in producers:
+                self._captures.setdefault(producer.node, {})[producer.key] = producer.field
+
+        for (path, method), operation in spec_index.operations.items():
+            consumed = list(operation.path_params) + list(
+                operation.request_schema.get("properties", {})
+            )
+            for name in consumed:
+                for producer in self.lookup(name):
+                    if producer.node != (method, path):
+                        self._captures[producer.node].setdefault(name, producer.field)
+                        break
+
+    # --------------------------------------------------
+    # Build
+    # --------------------------------------------------
+    def _productions(self, method: str, path: str, operation):
+        resource = resource_name(path)
+
+        level = []
+        for code, response in operation.responses.items():
+            if str(code).startswith("2"):
+                response = self.graph.resolve(response)
+                schema = response.get("content", {}).get("application/json", {}).get("schema")
+                if schema:
+                    level.append(("", "", self.graph.resolve(schema)))
+
+        for depth in range(MAX_PRODUCER_DEPTH):
+            children = []
+            for prefix, parent, schema in level:
+                if "items" in schema:
+                    items_prefix = (prefix[:-1] if prefix else "") + "[*]."
+                    children.append((items_prefix, parent, self.graph.resolve(schema["items"])))
+                    continue
+
+                for name, child in schema.get("properties", {}).items():
+                    child = self.graph.resolve(child)
+                    if child.get("type") in ("object", "array") or "properties" in child:
+                        children.append((f"{prefix}{name}.", name, child))
+                        continue
+                    if not is_identifier(name):
+                        continue
+
+                    field = prefix + name
+                    keys = {}
+                    if not parent or parent in ENVELOPES:
+                        keys[normalize(resource + name)] = QUALIFIED
+                    if normalize(name) != "id":
+                        keys.setdefault(normalize(name), EXACT)
+                    elif parent and parent not in ENVELOPES:
+                        keys.setdefault(normalize(singular(parent) + name), PARENT)
+
+                    for key, rank in keys.items():
+                        yield Producer(method, path, field, resource, rank), key, depth
+
+            level = children
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def lookup(self, name: str) -> List[Producer]:
+        """
+        Producers of a consumable field name, best first.
+        """
+        return self._producers.get(normalize(name), [])
+
+    def capture_rules(self, method: str, path: str) -> Dict[str, str]:
+        """
+        Execution-context key -> extraction rule of every value this
+        operation produces: its resource-qualified keys ("project.id") and
+        the consumer names it is the best producer for ("project_id").
+        """
+        return dict(self._captures.get((method.upper(), path), {}))
+
+
+def fill_payload(payload, memory, links: Dict[str, List[str]]):
+    """
+    Copy of a request body whose produced fields (field -> execution-context
+    keys, best first; see DependencyResolver) hold a captured value where
+    one exists. `memory` is an ExecutionContext, whose chain's own values
+    come first and any chain's next (`lookup`), or a plain dict.
+    """
+    if not isinstance(payload, dict) or not links:
+        return payload
+
+    lookup = getattr(memory, "lookup", memory.get)
+    filled = dict(payload)
+    for field, keys in links.items():
+        for key in keys:
+            value = lookup(key)
+            if value is not None:
+                filled[field] = value
+                break
+    return filled
@@ -0,0 +1,220 @@
+# resolution/response_extractor.py
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+UUID_PATTERN = re.compile(r"^[0-9a-fA-F-]{36}$")
+
+# Nested keys are only looked for this deep; list elements count as a level
+MAX_NESTED_DEPTH = 4
+
+RULE_TOKEN = re.compile(r"([^.\[\]]+)|\[(\*|-?\d+)\]|(\.)")
+
+Matcher = Callable[[Any], bool]
+
+
+# --------------------------------------------------
+# Matchers
+# --------------------------------------------------
+def is_uuid(value) -> bool:
+    return isinstance(value, str) and UUID_PATTERN.match(value) is not None
+
+
+def is_string(value) -> bool:
+    return isinstance(value, str)
+
+
+def is_integer(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def compile_matcher(schema_type: Optional[str], schema_format: Optional[str]) -> Optional[Matcher]:
+    """
+    Value test for a path parameter schema; None when nothing can match.
+    """
+    if schema_type == "string":
+        return is_uuid if schema_format == "uuid" else is_string
+    if schema_type == "integer":
+        return is_integer
+    return None
+
+
+# --------------------------------------------------
+# Extraction rules
+# --------------------------------------------------
+class ExtractionRule:
+    """
+    JSONPath-like path into a response body: `id`, `data.id`,
+    `data.items[*].id`, `[0].id`. Values are produced lazily, so taking
+    the first match of a `[*]` rule never walks the rest of the list.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.steps: List[Tuple[str, Union[str, int, None]]] = []
+
+        position = 0
+        for match in RULE_TOKEN.finditer(expression):
+            if match.start() != position:
+                break
+            position = match.end()
+            key, index, _ = match.groups()
+            if key is not None:
+                self.steps.append(("key", key))
+            elif index == "*":
+                self.steps.append(("all", None))
+            elif index is not None:
+                self.steps.append(("index", int(index)))
+
+        if position != len(expression) or not self.steps:
+            raise ValueError(f"Invalid extraction rule: {expression!r}")
+
+    def values(self, document) -> Iterator[Any]:
+        nodes: Iterable[Any] = (document,)
+        for kind, arg in self.steps:
+            nodes = STEPS[kind](nodes, arg)
+        return iter(nodes)
+
+    def first(self, document, matcher: Optional[Matcher] = None):
+        for value in self.values(document):
+            if isinstance(value, (str, int)) and (matcher is None or matcher(value)):
+                return value
+        return None
+
+
+def _key_step(nodes, key):
+    return (node[key] for node in nodes if isinstance(node, dict) and key in node)
+
+
+def _index_step(nodes, index):
+    return (
+        node[index] for node in nodes
+        if isinstance(node, list) and -len(node) <= index < len(node)
+    )
+
+
+def _all_step(nodes, _):
+    return (item for node in nodes if isinstance(node, list) for item in node)
+
+
+STEPS = {"key": _key_step, "index": _index_step, "all": _all_step}
+
+
+@lru_cache(maxsize=1024)
+def compile_rule(expression: str) -> ExtractionRule:
+    return ExtractionRule(expression)
+
+
+def apply_rules(
+    document,
+    rules: Dict[str, Union[str, List[str]]],
+    matchers: Optional[Dict[str, Matcher]] = None,
+) -> dict:
+    """
+    name -> first value found by its rule (or the first of several rules
+    that yields one), checked against the name's matcher when known.
+    """
+    values = {}
+    for name, expressions in (rules or {}).items():
+        if isinstance(expressions, str):
+            expressions = (expressions,)
+        matcher = (matchers or {}).get(name)
+        for expression in expressions:
+            value = compile_rule(expression).first(document, matcher)
+            if value is not None:
+                values[name] = value
+                break
+    return values
+
+
+# --------------------------------------------------
+# Per-spec extractor
+# --------------------------------------------------
+class ResponseExtractor:
+    """
+    Captures resource identifiers from response bodies, compiled once per
+    spec from its path parameters (built by SpecIndex).
+
+    - Top-level scalars that match any path parameter's type / format
+    - Keys named after a path parameter ("project_id") in nested objects
+      and in the first element of lists, shallowest first, checked against
+      that parameter's schema; a nested generic "id" is left alone, it
+      belongs to an embedded object
+    - Explicit rules (`apply_rules`), e.g. {"project_id": "data.id"}
+    """
+
+    def __init__(self, path_param_schemas: Dict[str, dict]):
+        self.param_matchers: Dict[str, Matcher] = {}
+        type_matchers = []
+
+        for name, schema in path_param_schemas.items():
+            matcher = compile_matcher(schema.get("type"), schema.get("format"))
+            if matcher is None:
+                continue
+            self.param_matchers[name] = matcher
+            if matcher not in type_matchers:
+                type_matchers.append(matcher)
+
+        # A plain string parameter accepts every string: UUIDs need no check
+        if is_string in type_matchers and is_uuid in type_matchers:
+            type_matchers.remove(is_uuid)
+        self.type_matchers: Tuple[Matcher, ...] = tuple(type_matchers)
+
+        # Top-level scan: one type dispatch per value instead of a matcher loop
+        self._any_string = is_string in type_matchers
+        self._uuid_strings = is_uuid in type_matchers
+        self._integers = is_integer in type_matchers
+
+        self.nested_names = frozenset(name for name in self.param_matchers if name != "id")
+
+    def matches_any(self, value) -> bool:
+        return any(matcher(value) for matcher in self.type_matchers)
+
+    def extract(self, document, rules: Optional[Dict[str, Union[str, List[str]]]] = None) -> dict:
+        values = {}
+
+        if isinstance(document, dict):
+            any_string, uuid_strings, integers = self._any_string, self._uuid_strings, self._integers
+            uuid_match = UUID_PATTERN.match
+
+            for key, value in document.items():
+                kind = type(value)
+                if kind is str:
+                    if any_string or (uuid_strings and uuid_match(value)):
+                        values[key] = value
+                elif kind is int:
+                    if integers:
+                        values[key] = value
+                elif isinstance(value, (str, int)) and self.matches_any(value):
+                    values[key] = value
+
+        if self.nested_names:
+            self._nested(document, values)
+
+        if rules:
+            values.update(apply_rules(document, rules, self.param_matchers))
+
+        return values
+
+    def _nested(self, document, values: dict):
+        # Breadth-first below the top level
+        level = [document]
+        for _ in range(MAX_NESTED_DEPTH):
+            children = []
+            for node in level:
+                if isinstance(node, dict):
+                    children.extend(v for v in node.values() if isinstance(v, (dict, list)))
+                elif isinstance(node, list) and node:
+                    children.append(node[0])
+            if not children:
+                return
+
+            for node in children:
+                if not isinstance(node, dict):
+                    continue
+                for name in self.nested_names.intersection(node):
+                    value = node[name]
+                    if name not in values and self.param_matchers[name](value):
+                        values[name] = value
+            level = children
@@ -0,0 +1,633 @@
+# resolution/schema_compiler.py
+
+import random
+import re
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from agent.data_factory import deterministic_values
+from .component_graph import ComponentGraph, lookup_ref
+
+# Compiled schemas kept alive (oldest evicted first); resolved schemas
+# from the ComponentGraph are shared objects, so identity lookups hit
+_COMPILED_CACHE_SIZE = 4096
+_generator_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_validator_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+# Required self-references are expanded this many levels deep
+MAX_RECURSIVE_DEPTH = 2
+
+# Node signature: (tc_id, root field name, iterator over hashed values) -> value
+BuildFn = Callable[[str, str, Iterator], Any]
+ValidateFn = Callable[[Any, str], None]
+
+# Python types accepted for each primitive schema type
+PRIMITIVE_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+}
+
+
+def _cached(cache: OrderedDict, key: tuple, schema: Dict[str, Any], compile_fn: Callable):
+    cached = cache.get(key)
+
+    # The schema is stored alongside the result so its id cannot be reused
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+
+    compiled = compile_fn()
+    cache[key] = (schema, compiled)
+    if len(cache) > _COMPILED_CACHE_SIZE:
+        cache.popitem(last=False)
+
+    return compiled
+
+
+class CompiledGenerator:
+    """
+    Payload generator compiled from one schema.
+
+    `leaves` lists the (field name, type) of every hashed primitive in
+    build order; None stands for the field name given at call time.
+    All leaves are hashed in one deterministic_values batch, and `build`
+    assembles the value from them without looking at the schema again.
+    """
+
+    __slots__ = ("leaves", "build")
+
+    def __init__(self, leaves: List[Tuple[Optional[str], str]], build: BuildFn):
+        self.leaves = leaves
+        self.build = build
+
+    def leaf_fields(self, field_name: str) -> List[Tuple[str, str]]:
+        return [(name or field_name, type_name) for name, type_name in self.leaves]
+
+    def __call__(self, tc_id: str, field_name: str = "") -> Any:
+        values = iter(deterministic_values(tc_id, self.leaf_fields(field_name)))
+        return self.build(tc_id, field_name, values)
+
+
+# --------------------------------------------------
+# Generator compilation
+# --------------------------------------------------
+def compile_generator(
+    schema: Dict[str, Any],
+    default_type: Optional[str] = "string",
+    formats: bool = True,
+    graph: Optional[ComponentGraph] = None,
+) -> CompiledGenerator:
+    """
+    Compiles a resolved schema into a payload generator, once per schema object.
+
+    default_type → type assumed when a schema declares none
+    formats      → uuid / date-time aware generation and anyOf / x-recursive
+                   handling (the resolution engine); the legacy intent
+                   payload builder turns these off
+    graph        → expands required x-recursive placeholders, up to
+                   MAX_RECURSIVE_DEPTH levels; optional ones are left out
+    """
+    key = (id(schema), default_type, formats, id(graph))
+
+    def compile_fn():
+        leaves: List[Tuple[Optional[str], str]] = []
+        build = _compile_node(schema, None, leaves, default_type, formats, graph)
+        return CompiledGenerator(leaves, build)
+
+    return _cached(_generator_cache, key, schema, compile_fn)
+
+
+def is_recursive(schema: Any) -> bool:
+    """
+    True for a lazy recursive placeholder, alone, as an anyOf option or
+    as the items of an array.
+    """
+    if not isinstance(schema, dict):
+        return False
+    if "items" in schema:
+        return is_recursive(schema["items"])
+    return bool(schema.get("x-recursive")) or any(
+        isinstance(option, dict) and option.get("x-recursive")
+        for option in schema.get("anyOf", [])
+    )
+
+
+def _compile_node(
+    schema: Any,
+    name: Optional[str],
+    leaves: List[Tuple[Optional[str], str]],
+    default_type: Optional[str],
+    formats: bool,
+    graph: Optional[ComponentGraph] = None,
+    depth: int = 0,
+) -> BuildFn:
+    if not isinstance(schema, dict):
+        schema = {}
+
+    if formats:
+        # -------------------------
+        # Normalize anyOf
+        # -------------------------
+        if "anyOf" in schema:
+            for option in schema["anyOf"]:
+                if option.get("type") != "null":
+                    schema = option
+                    break
+
+        # Recursive DTOs are expanded one level per placeholder
+        if schema.get("x-recursive"):
+            if graph is None or depth >= MAX_RECURSIVE_DEPTH:
+                return lambda tc_id, field_name, values: None
+            schema = graph.expand(schema)
+            depth += 1
+
+    elif not schema:
+        return lambda tc_id, field_name, values: None
+
+    schema_type = schema.get("type", default_type)
+
+    # -------------------------
+    # Format-aware generation
+    # -------------------------
+    if formats:
+        schema_format = schema.get("format")
+
+        if schema_format == "uuid":
+            namespace = uuid.NAMESPACE_DNS
+
+            def build_uuid(tc_id, field_name, values):
+                return str(uuid.uuid5(namespace, f"{tc_id}-{name or field_name}"))
+
+            return build_uuid
+
+        if schema_format == "date-time":
+            return lambda tc_id, field_name, values: datetime.utcnow().isoformat()
+
+        if schema_format == "email":
+            leaves.append((name, "string"))
+            return lambda tc_id, field_name, values: f"{next(values)}@example.com"
+
+    # -------------------------
+    # Object
+    # -------------------------
+    if schema_type == "object":
+        required = schema.get("required", [])
+
+        # Optional self-references are left out rather than sent as null
+        children = [
+            (key, _compile_node(value_schema, key, leaves, default_type, formats, graph, depth))
+            for key, value_schema in schema.get("properties", {}).items()
+            if not (formats and key not in required and is_recursive(value_schema))
+        ]
+
+        def build_object(tc_id, field_name, values):
+            return {key: child(tc_id, field_name, values) for key, child in children}
+
+        return build_object
+
+    # -------------------------
+    # Array
+    # -------------------------
+    if schema_type == "array":
+        if formats and is_recursive(schema.get("items")) and (
+            graph is None or depth >= MAX_RECURSIVE_DEPTH
+        ):
+            return lambda tc_id, field_name, values: []
+
+        item = _compile_node(
+            schema.get("items", {}), name, leaves, default_type, formats, graph, depth
+        )
+
+        def build_array(tc_id, field_name, values):
+            return [item(tc_id, field_name, values)]
+
+        return build_array
+
+    # -------------------------
+    # Default primitive
+    # -------------------------
+    leaves.append((name, schema_type))
+    return lambda tc_id, field_name, values: next(values)
+
+
+# --------------------------------------------------
+# Validator compilation
+# --------------------------------------------------
+def compile_validator(schema: Dict[str, Any]) -> ValidateFn:
+    """
+    Compiles a response schema into an assertion function
+    `validate(data, path)`, once per schema object.
+    """
+    return _cached(
+        _validator_cache,
+        (id(schema),),
+        schema,
+        lambda: _compile_check(schema),
+    )
+
+
+def _compile_check(schema: Dict[str, Any]) -> ValidateFn:
+    schema_type = schema.get("type")
+
+    if schema_type == "object":
+        required = schema.get("required", [])
+
+        # Primitive properties are checked inline: (field, suffix, types, label, None);
+        # anything else delegates to a nested check: (field, suffix, None, None, check)
+        properties = []
+        for field, field_schema in schema.get("properties", {}).items():
+            field_type = field_schema.get("type")
+            if field_type in PRIMITIVE_TYPES:
+                properties.append((field, f".{field}", PRIMITIVE_TYPES[field_type], field_type, None))
+            else:
+                properties.append((field, f".{field}", None, None, _compile_check(field_schema)))
+
+        def check_object(data, path):
+            assert isinstance(data, dict), f"{path} should be an object"
+
+            for field in required:
+                assert field in data, f"{path}.{field} is required but missing"
+
+            for field, suffix, types, label, check in properties:
+                if field not in data:
+                    continue
+                if types is not None:
+                    assert isinstance(data[field], types), f"{path}{suffix} should be {label}"
+                else:
+                    check(data[field], path + suffix)
+
+        return check_object
+
+    if schema_type == "array":
+        item_schema = schema.get("items")
+        item_check = _compile_check(item_schema) if item_schema else None
+
+        def check_array(data, path):
+            assert isinstance(data, list), f"{path} should be an array"
+            if item_check and data:
+                item_check(data[0], f"{path}[0]")
+
+        return check_array
+
+    if schema_type in PRIMITIVE_TYPES:
+        types = PRIMITIVE_TYPES[schema_type]
+
+        def check_primitive(data, path):
+            assert isinstance(data, types), f"{path} should be {schema_type}"
+
+        return check_primitive
+
+    return lambda data, path: None
+
+
+# --------------------------------------------------
+# Full response contract validation
+# --------------------------------------------------
+# JSON types; bool is not accepted as integer / number here
+JSON_TYPE_CHECKS = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+    "null": lambda value: value is None,
+}
+
+TYPE_LABELS = {"object": "an object", "array": "an array"}
+
+FORMAT_PATTERNS = {
+    "uuid": re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"),
+    "date-time": re.compile(r"^\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:?\d{2})?$"),
+    "date": re.compile(r"^\d{4}-\d{2}-\d{2}$"),
+    "email": re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$"),
+    "uri": re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:\S+$"),
+}
+
+# Seed of array sampling: the same seed validates the same elements
+DEFAULT_SAMPLE_SEED = 0
+
+# Value constraints, checked when a validator is built with constraints=True
+CONSTRAINT_KEYWORDS = frozenset({
+    "minLength", "maxLength", "pattern", "minimum", "maximum",
+    "exclusiveMinimum", "exclusiveMaximum", "minItems", "maxItems",
+})
+
+# Keywords that do not affect validation; schemas made only of these
+# and a primitive type are checked inline by their parent object
+ANNOTATION_KEYWORDS = {"type", "title", "description", "example", "default", "readOnly", "writeOnly"}
+
+
+class ContractValidator:
+    """
+    Full response contract validation, compiled once per schema.
+
+    Works on raw OpenAPI schemas: `$ref` targets are looked up in
+    `document` and compiled on first use (self-referencing DTOs are
+    fine). Checks type, nullable, enum, format, required, properties,
+    additionalProperties, allOf / anyOf / oneOf and every array element.
+
+    sample_first / sample_random → for arrays longer than their sum,
+    validate only the first N elements plus K random others, drawn from
+    `seed` and the array's path (reproducible; failures name the seed)
+    constraints → also check minLength / maxLength / pattern, minimum /
+    maximum (exclusive too) and minItems / maxItems (request bodies)
+    """
+
+    def __init__(
+        self,
+        document: Dict[str, Any],
+        sample_first: Optional[int] = None,
+        sample_random: int = 0,
+        seed: int = DEFAULT_SAMPLE_SEED,
+        constraints: bool = False,
+    ):
+        self.document = document
+        self.sample_first = sample_first
+        self.sample_random = sample_random
+        self.constraints = constraints
+        self.seed = seed
+        self._refs: Dict[str, ValidateFn] = {}
+        self._compiled: Dict[int, tuple] = {}
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def validator(self, schema: Dict[str, Any]) -> ValidateFn:
+        cached = self._compiled.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+
+        check = self._compile(schema)
+        self._compiled[id(schema)] = (schema, check)
+        return check
+
+    def validate(self, data: Any, schema: Dict[str, Any], path: str = "response"):
+        self.validator(schema)(data, path)
+
+    def indices(self, length: int, path: str = "response"):
+        """
+        Array positions to validate: a range unless the array is sampled.
+        """
+        if self.sample_first is None or length <= self.sample_first + self.sample_random:
+            return range(length)
+
+        sampled = self.sampler(path).sample(range(self.sample_first, length), self.sample_random)
+        return [*range(self.sample_first), *sorted(sampled)]
+
+    def sampler(self, path: str) -> random.Random:
+        return random.Random(f"{self.seed}:{path}")
+
+    def sampling_error(self, error: AssertionError) -> AssertionError:
+        return AssertionError(f"{error} (sampled elements, seed {self.seed})")
+
+    # --------------------------------------------------
+    # Compilation
+    # --------------------------------------------------
+    def _compile(self, schema: Any) -> ValidateFn:
+        if not isinstance(schema, dict) or not schema:
+            return lambda data, path: None
+
+        if "$ref" in schema:
+            return self._compile_ref(schema["$ref"])
+
+        nullable = schema.get("nullable", False)
+        checks: List[ValidateFn] = []
+
+        type_check = self._compile_type(schema)
+        if type_check:
+            checks.append(type_check)
+
+        if "enum" in schema:
+            checks.append(self._compile_enum(schema["enum"]))
+
+        if schema.get("format") in FORMAT_PATTERNS:
+            checks.append(self._compile_format(schema["format"]))
+
+        if self.constraints and not CONSTRAINT_KEYWORDS.isdisjoint(schema):
+            checks.append(self._compile_constraints(schema))
+
+        for part in schema.get("allOf", []):
+            checks.append(self._compile(part))
+
+        if "anyOf" in schema:
+            checks.append(self._compile_any_of(schema["anyOf"]))
+
+        if "oneOf" in schema:
+            checks.append(self._compile_one_of(schema["oneOf"]))
+
+        if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+            checks.append(self._compile_object(schema))
+
+        if "items" in schema:
+            checks.append(self._compile_array(schema["items"]))
+
+        if not checks:
+            return lambda data, path: None
+
+        if len(checks) == 1 and not nullable:
+            return checks[0]
+
+        def check_all(data, path):
+            if data is None and nullable:
+                return
+            for check in checks:
+                check(data, path)
+
+        return check_all
+
+    def _compile_ref(self, ref: str) -> ValidateFn:
+        refs = self._refs
+
+        def check_ref(data, path):
+            check = refs.get(ref)
+            if check is None:
+                check = refs[ref] = self._compile(lookup_ref(self.document, ref))
+            check(data, path)
+
+        return check_ref
+
+    def _compile_type(self, schema: Dict[str, Any]) -> Optional[ValidateFn]:
+        declared = schema.get("type")
+        if not declared:
+            return None
+
+        types = declared if isinstance(declared, list) else [declared]
+        if schema.get("nullable") and "null" not in types:
+            types = [*types, "null"]
+
+        checks = [JSON_TYPE_CHECKS[t] for t in types if t in JSON_TYPE_CHECKS]
+        if not checks:
+            return None
+
+        label = " or ".join(TYPE_LABELS.get(t, t) for t in types if t != "null")
+
+        if len(checks) == 1:
+            type_ok = checks[0]
+
+            def check_type(data, path):
+                assert type_ok(data), f"{path} should be {label}"
+
+            return check_type
+
+        def check_types(data, path):
+            assert any(ok(data) for ok in checks), f"{path} should be {label}"
+
+        return check_types
+
+    def _compile_enum(self, allowed: list) -> ValidateFn:
+        try:
+            allowed_set = frozenset(allowed)
+        except TypeError:
+            allowed_set = None
+
+        def check_enum(data, path):
+            try:
+                ok = data in allowed_set if allowed_set is not None else data in allowed
+            except TypeError:
+                ok = data in allowed
+            assert ok, f"{path} should be one of {allowed}, got {data!r}"
+
+        return check_enum
+
+    def _compile_format(self, schema_format: str) -> ValidateFn:
+        pattern = FORMAT_PATTERNS[schema_format]
+
+        def check_format(data, path):
+            if isinstance(data, str):
+                assert pattern.match(data), f"{path} should be a valid {schema_format}, got {data!r}"
+
+        return check_format
+
+    def _compile_constraints(self, schema: Dict[str, Any]) -> ValidateFn:
+        min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+        min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+
+        # OpenAPI 3.0 flags the bound as exclusive, 3.1 gives the bound itself
+        minimum, maximum = schema.get("minimum"), schema.get("maximum")
+        exclusive_min, exclusive_max = schema.get("exclusiveMinimum"), schema.get("exclusiveMaximum")
+        if not isinstance(exclusive_min, bool) and exclusive_min is not None:
+            minimum, exclusive_min = exclusive_min, True
+        if not isinstance(exclusive_max, bool) and exclusive_max is not None:
+            maximum, exclusive_max = exclusive_max, True
+
+        def check_constraints(data, path):
+            if isinstance(data, str):
+                if min_length is not None:
+                    assert len(data) >= min_length, f"{path} should have at least {min_length} characters"
+                if max_length is not None:
+                    assert len(data) <= max_length, f"{path} should have at most {max_length} characters"
+                if pattern is not None:
+                    assert pattern.search(data), f"{path} should match {pattern.pattern!r}, got {data!r}"
+
+            elif isinstance(data, (int, float)) and not isinstance(data, bool):
+                if minimum is not None:
+                    ok = data > minimum if exclusive_min else data >= minimum
+                    assert ok, f"{path} should be {'>' if exclusive_min else '>='} {minimum}, got {data}"
+                if maximum is not None:
+                    ok = data < maximum if exclusive_max else data <= maximum
+                    assert ok, f"{path} should be {'<' if exclusive_max else '<='} {maximum}, got {data}"
+
+            elif isinstance(data, list):
+                if min_items is not None:
+                    assert len(data) >= min_items, f"{path} should have at least {min_items} items"
+                if max_items is not None:
+                    assert len(data) <= max_items, f"{path} should have at most {max_items} items"
+
+        return check_constraints
+
+    def _compile_any_of(self, options: list) -> ValidateFn:
+        checks = [self._compile(option) for option in options]
+
+        def check_any_of(data, path):
+            for check in checks:
+                try:
+                    check(data, path)
+                    return
+                except AssertionError:
+                    continue
+            raise AssertionError(f"{path} does not match any allowed schema")
+
+        return check_any_of
+
+    def _compile_one_of(self, options: list) -> ValidateFn:
+        checks = [self._compile(option) for option in options]
+
+        def check_one_of(data, path):
+            matched = 0
+            for check in checks:
+                try:
+                    check(data, path)
+                    matched += 1
+                except AssertionError:
+                    continue
+            assert matched == 1, f"{path} matches {matched} schemas, expected exactly one"
+
+        return check_one_of
+
+    def _compile_object(self, schema: Dict[str, Any]) -> ValidateFn:
+        required = schema.get("required", [])
+        known = set(schema.get("properties", {}))
+        additional = schema.get("additionalProperties", True)
+        additional_check = self._compile(additional) if isinstance(additional, dict) else None
+
+        # (field, suffix, inline type check or None, label, nested check or None)
+        properties = []
+        for field, field_schema in schema.get("properties", {}).items():
+            field_type = field_schema.get("type") if isinstance(field_schema, dict) else None
+            if (
+                isinstance(field_type, str)
+                and field_type in PRIMITIVE_TYPES
+                and set(field_schema) <= ANNOTATION_KEYWORDS
+            ):
+                properties.append((field, f".{field}", JSON_TYPE_CHECKS[field_type], field_type, None))
+            else:
+                properties.append((field, f".{field}", None, None, self._compile(field_schema)))
+
+        def check_object(data, path):
+            if not isinstance(data, dict):
+                return
+
+            for field in required:
+                assert field in data, f"{path}.{field} is required but missing"
+
+            for field, suffix, type_ok, label, check in properties:
+                if field not in data:
+                    continue
+                if type_ok is not None:
+                    assert type_ok(data[field]), f"{path}{suffix} should be {label}"
+                else:
+                    check(data[field], path + suffix)
+
+            if additional is False:
+                unexpected = data.keys() - known
+                assert not unexpected, f"{path} has unexpected properties: {sorted(unexpected)}"
+
+            elif additional_check is not None:
+                for field in data.keys() - known:
+                    additional_check(data[field], f"{path}.{field}")
+
+        return check_object
+
+    def _compile_array(self, item_schema: Dict[str, Any]) -> ValidateFn:
+        item_check = self._compile(item_schema)
+        indices = self.indices
+
+        def check_array(data, path):
+            if not isinstance(data, list):
+                return
+
+            positions = indices(len(data), path)
+            try:
+                for i in positions:
+                    item_check(data[i], f"{path}[{i}]")
+            except AssertionError as error:
+                if isinstance(positions, range):
+                    raise
+                raise self.sampling_error(error) from None
+
+        return check_array
@@ -0,0 +1,178 @@
+# resolution/spec_index.py
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+from .component_graph import ComponentGraph
+from .producer_index import ProducerIndex
+from .response_extractor import ResponseExtractor
+
+HTTP_METHODS = {"get", "post", "put", "patch", "delete", "options", "head"}
+
+# Request content types in order of preference
+SUPPORTED_CONTENT_TYPES = (
+    "application/json",
+    "application/x-www-form-urlencoded",
+)
+
+# Indexes kept alive per spec object (LRU)
+_INDEX_CACHE_SIZE = 8
+_index_cache: "OrderedDict[int, tuple]" = OrderedDict()
+
+
+@dataclass
+class OperationIndex:
+    """
+    Precomputed view of a single OpenAPI operation.
+    """
+    path: str
+    method: str
+    operation: Dict[str, Any]
+    operation_id: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+
+    # location (path | query | header | cookie) -> name -> schema
+    parameters: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    request_content_type: Optional[str] = None
+    request_schema: Dict[str, Any] = field(default_factory=dict)
+    content_types: List[str] = field(default_factory=list)
+    responses: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def path_params(self) -> Dict[str, Any]:
+        return self.parameters.get("path", {})
+
+    @property
+    def query_params(self) -> Dict[str, Any]:
+        return self.parameters.get("query", {})
+
+
+class SpecIndex:
+    """
+    Single index built once per spec and shared by the resolution engine,
+    the test generator and the lifecycle engine, so none of them has to
+    rescan `paths` on every call.
+    """
+
+    def __init__(self, swagger_spec: Dict[str, Any]):
+        self.swagger_spec = swagger_spec
+        self.graph = ComponentGraph(swagger_spec)
+
+        self.operations: Dict[Tuple[str, str], OperationIndex] = {}
+        self.by_operation_id: Dict[str, OperationIndex] = {}
+
+        # (type, format) of every path parameter in the spec
+        self.path_param_types: List[Tuple[Optional[str], Optional[str]]] = []
+        # First schema seen for each path parameter name
+        self.path_param_schemas: Dict[str, Dict[str, Any]] = {}
+
+        self._build()
+
+        # Lifecycle capture from responses, compiled from the path parameters
+        self.extractor = ResponseExtractor(self.path_param_schemas)
+
+    @classmethod
+    def for_spec(cls, swagger_spec: Dict[str, Any]) -> "SpecIndex":
+        """
+        Returns the index for a spec, building it on first use.
+        """
+        if not swagger_spec:
+            return cls(swagger_spec)
+
+        key = id(swagger_spec)
+        cached = _index_cache.get(key)
+
+        # The spec is stored alongside the index so its id cannot be reused
+        if cached is not None and cached[0] is swagger_spec:
+            _index_cache.move_to_end(key)
+            return cached[1]
+
+        index = cls(swagger_spec)
+        _index_cache[key] = (swagger_spec, index)
+        if len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+
+        return index
+
+    def operation(self, path: str, method: str) -> Optional[OperationIndex]:
+        return self.operations.get((path, method.upper()))
+
+    @cached_property
+    def producers(self) -> ProducerIndex:
+        """
+        Consumable field -> producing operations, from the response schemas.
+        Built on first use: only dependency resolution needs it.
+        """
+        return ProducerIndex(self)
+
+    # --------------------------------------------------
+    # Build
+    # --------------------------------------------------
+    def _build(self):
+        seen_path_param_types = set()
+
+        for path, path_item in self.swagger_spec.get("paths", {}).items():
+            path_level_params = path_item.get("parameters", [])
+
+            for method, operation in path_item.items():
+                if method.lower() not in HTTP_METHODS:
+                    continue
+
+                op = self._index_operation(path, method, operation, path_level_params)
+                self.operations[(path, op.method)] = op
+
+                if op.operation_id:
+                    self.by_operation_id[op.operation_id] = op
+
+                for name, schema in op.path_params.items():
+                    self.path_param_schemas.setdefault(name, schema)
+                    param_type = (schema.get("type"), schema.get("format"))
+                    if param_type not in seen_path_param_types:
+                        seen_path_param_types.add(param_type)
+                        self.path_param_types.append(param_type)
+
+    def _index_operation(
+        self,
+        path: str,
+        method: str,
+        operation: Dict[str, Any],
+        path_level_params: list,
+    ) -> OperationIndex:
+        parameters: Dict[str, Dict[str, Any]] = {}
+
+        # Operation-level parameters override path-level ones
+        for param in path_level_params + operation.get("parameters", []):
+            param = self.graph.resolve(param)
+            location = param.get("in")
+            parameters.setdefault(location, {})[param.get("name")] = (
+                self.graph.resolve(param.get("schema", {}))
+            )
+
+        request_body = self.graph.resolve(operation.get("requestBody") or {})
+        content = request_body.get("content", {})
+
+        request_content_type = None
+        request_schema: Dict[str, Any] = {}
+        for content_type in SUPPORTED_CONTENT_TYPES:
+            if content_type in content:
+                request_content_type = content_type
+                request_schema = self.graph.resolve(
+                    content[content_type].get("schema", {})
+                )
+                break
+
+        return OperationIndex(
+            path=path,
+            method=method.upper(),
+            operation=operation,
+            operation_id=operation.get("operationId"),
+            tags=operation.get("tags", []),
+            parameters=parameters,
+            request_content_type=request_content_type,
+            request_schema=request_schema,
+            content_types=list(content),
+            responses=operation.get("responses", {}),
+        )
@@ -0,0 +1,38 @@
+from requests import Response
+
+from agent.behavior_explorer import BehaviorExplorer
+
+
+class Server:
+    """
+    Cassette double: answers every probe, 404 below the operation path.
+    """
+
+    mode = "off"
+
+    def __init__(self):
+        self.urls = []
+
+    def request(self, session, method, url, role="anonymous", throttle=None, **kwargs):
+        self.urls.append(url)
+        response = Response()
+        response.status_code = 404 if url.endswith("/invalid") else 200
+        response._content = b"[]"
+        response.timings = {"ttfb_ms": 2.0, "total_ms": 3.0}
+        return response
+
+
+def test_every_probe_is_timed_under_the_template_path():
+    explorer = BehaviorExplorer(
+        "http://api",
+        [{"method": "get", "path": "/items/{item_id}"}],
+        role_headers={"admin": {"Authorization": "Bearer a"}},
+        cassette=Server(),
+    )
+    behavior = explorer.explore_all()[0]
+
+    assert "http://api/items/{item_id}/invalid" in explorer.cassette.urls
+    assert {row["endpoint"] for row in explorer.latency.summary()} == {"/items/{item_id}"}
+    # pagination x2, sorting, filtering, error probe, plain call
+    assert behavior["latency_ms"]["samples"] == 6
+    assert "(GET /items/{item_id} as admin)" in explorer.latency_summary()
@@ -0,0 +1,21 @@
+from automation.utils.capture import capture_file, clear_capture_files
+
+
+def test_capture_files_are_per_worker(monkeypatch):
+    monkeypatch.setenv("CAPTURE_FILE", "out/api.jsonl")
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    assert capture_file() == "out/api.jsonl"
+
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    assert capture_file() == "out/api.gw3.jsonl"
+
+
+def test_a_new_run_removes_every_previous_capture_file(tmp_path, monkeypatch):
+    for name in ("api.jsonl", "api.gw0.jsonl", "api.gw7.jsonl", "other.jsonl"):
+        (tmp_path / name).write_text("{}\n")
+    monkeypatch.setenv("CAPTURE_FILE", str(tmp_path / "api.jsonl"))
+
+    clear_capture_files()
+    clear_capture_files()
+
+    assert [path.name for path in tmp_path.iterdir()] == ["other.jsonl"]
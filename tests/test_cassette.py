@@ -0,0 +1,176 @@
+import json
+from datetime import timedelta
+
+import pytest
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from agent.cassette import Cassette, CassetteMiss, cassette_file, interaction_key
+
+
+def make_response(body: bytes = b"{}", status: int = 200) -> Response:
+    response = Response()
+    response.status_code = status
+    response.reason = "OK"
+    response.headers = CaseInsensitiveDict({
+        "Content-Type": "application/json",
+        "Content-Encoding": "gzip",
+    })
+    response.encoding = "utf-8"
+    response._content = body
+    response.elapsed = timedelta(milliseconds=12)
+    return response
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        return self.responses.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def controller(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+
+
+def record(path, *exchanges):
+    """
+    Records (method, url, role, kwargs, response) exchanges into `path`.
+    """
+    cassette = Cassette(path, "record")
+    for method, url, role, kwargs, response in exchanges:
+        cassette.request(FakeSession(response), method, url, role=role, **kwargs)
+    cassette.close()
+    return cassette
+
+
+# --------------------------------------------------
+# Keys
+# --------------------------------------------------
+def test_keys_ignore_query_order_host_case_default_port_and_credentials():
+    assert interaction_key("get", "https://user:pw@API.example.com:443/items?b=2&a=1", "admin", {}) == (
+        interaction_key("GET", "https://api.example.com/items", "admin", {"params": {"a": 1, "b": 2}})
+    )
+
+
+def test_keys_differ_by_body_and_role():
+    base = interaction_key("POST", "http://api/items", "admin", {"json": {"name": "a"}})
+    assert base != interaction_key("POST", "http://api/items", "admin", {"json": {"name": "b"}})
+    assert base != interaction_key("POST", "http://api/items", "user", {"json": {"name": "a"}})
+
+
+# --------------------------------------------------
+# Record / replay
+# --------------------------------------------------
+def test_record_then_replay_round_trip(tmp_path):
+    path = tmp_path / "api.jsonl"
+    record(path, ("POST", "http://api/items?b=2&a=1", "admin", {"json": {"name": "a"}},
+                  make_response(b'{"id": 7}', status=201)))
+
+    cassette = Cassette(path, "strict")
+    session = FakeSession()
+    response = cassette.request(
+        session, "POST", "http://API/items?a=1&b=2", role="admin", json={"name": "a"}
+    )
+
+    assert session.calls == []
+    assert response.status_code == 201
+    assert response.json() == {"id": 7}
+    assert response.headers["Content-Type"] == "application/json"
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Content-Length"] == "9"
+    assert response.elapsed == timedelta(milliseconds=12)
+    assert response.timings["ttfb_ms"] == 12
+    assert cassette.replayed == 1 and cassette.unmatched == []
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    path = tmp_path / "api.jsonl"
+    record(
+        path,
+        ("GET", "http://api/items/1", "admin", {}, make_response(b'{"id": 1}')),
+        ("GET", "http://api/items/1", "user", {}, make_response(b'{"id": 1}')),
+    )
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sum("digest" in record for record in records) == 1
+    assert sum("key" in record for record in records) == 2
+
+
+def test_repeated_requests_replay_in_recording_order(tmp_path):
+    path = tmp_path / "api.jsonl"
+    record(
+        path,
+        ("GET", "http://api/items/1", "admin", {}, make_response(b'{"state": "new"}')),
+        ("GET", "http://api/items/1", "admin", {}, make_response(b'{"state": "done"}')),
+        ("GET", "http://api/items/1", "admin", {}, make_response(b"{}", status=404)),
+    )
+
+    cassette = Cassette(path, "strict")
+    replayed = [
+        cassette.request(FakeSession(), "GET", "http://api/items/1", role="admin")
+        for _ in range(4)
+    ]
+
+    assert [response.status_code for response in replayed] == [200, 200, 404, 404]
+    assert [response.content for response in replayed[:2]] == [b'{"state": "new"}', b'{"state": "done"}']
+
+
+# --------------------------------------------------
+# Misses
+# --------------------------------------------------
+def test_strict_miss_raises_without_sending(tmp_path):
+    path = tmp_path / "api.jsonl"
+    record(path, ("GET", "http://api/items", "admin", {}, make_response()))
+
+    cassette = Cassette(path, "strict")
+    session = FakeSession()
+    with pytest.raises(CassetteMiss, match="GET http://api/items - user"):
+        cassette.request(session, "GET", "http://api/items", role="user")
+
+    assert session.calls == []
+    assert cassette.unmatched == ["GET http://api/items - user"]
+
+
+def test_replay_miss_is_sent_and_reported(tmp_path):
+    path = tmp_path / "api.jsonl"
+    record(path, ("GET", "http://api/items", "admin", {}, make_response()))
+
+    cassette = Cassette(path, "replay")
+    session = FakeSession(make_response(b"[]"))
+    response = cassette.request(session, "GET", "http://api/other", role="admin")
+
+    assert response.content == b"[]"
+    assert session.calls == [("GET", "http://api/other")]
+    assert cassette.unmatched == ["GET http://api/other - admin"]
+
+
+# --------------------------------------------------
+# xdist workers
+# --------------------------------------------------
+def test_worker_files_are_replayed_together(tmp_path, monkeypatch):
+    monkeypatch.setenv("CASSETTE_DIR", str(tmp_path))
+    for worker, item in (("gw0", 1), ("gw1", 2)):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+        path = cassette_file("api")
+        assert path.name == f"api.{worker}.jsonl"
+        record(path, ("GET", f"http://api/items/{item}", "admin", {}, make_response(b'{"id": %d}' % item)))
+
+    monkeypatch.delenv("PYTEST_XDIST_WORKER")
+    cassette = Cassette(cassette_file("api"), "strict")
+    assert cassette.request(FakeSession(), "GET", "http://api/items/1", role="admin").json() == {"id": 1}
+    assert cassette.request(FakeSession(), "GET", "http://api/items/2", role="admin").json() == {"id": 2}
+
+
+def test_a_new_recording_replaces_every_worker_file(tmp_path):
+    stale = tmp_path / "api.gw7.jsonl"
+    stale.write_text("{}\n")
+    (tmp_path / "other.jsonl").write_text("{}\n")
+
+    record(tmp_path / "api.jsonl", ("GET", "http://api/items", "admin", {}, make_response()))
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["api.jsonl", "other.jsonl"]
@@ -0,0 +1,123 @@
+import json
+
+from agent.exploration_cache import ExplorationCache, operation_fingerprint
+
+CONTEXT = {"base_url": "http://api", "environment": "test", "roles": ["admin"]}
+
+
+def endpoint(path="/items", method="get", **extra) -> dict:
+    return {"path": path, "method": method, "responses": {"200": {"description": "OK"}}, **extra}
+
+
+def behavior(status: int) -> dict:
+    return {"status": status, "latency_ms": 1.5}
+
+
+def explore(cache_file, endpoints) -> ExplorationCache:
+    """
+    One agent run: reuse cached operations, record the others, save.
+    """
+    cache = ExplorationCache(cache_file)
+    fingerprints = []
+    for index, operation in enumerate(endpoints):
+        fingerprint = operation_fingerprint(operation, CONTEXT)
+        fingerprints.append(fingerprint)
+        if not cache.lookup(fingerprint):
+            cache.put(fingerprint, behavior(200 + index), {"classification": "read"})
+    cache.save(keep=fingerprints)
+    return cache
+
+
+# --------------------------------------------------
+# Fingerprints
+# --------------------------------------------------
+def test_fingerprint_is_stable_and_covers_the_operation_and_context():
+    fingerprint = operation_fingerprint(endpoint(), CONTEXT)
+
+    assert fingerprint == operation_fingerprint(endpoint(method="GET"), dict(CONTEXT))
+    assert fingerprint != operation_fingerprint(endpoint(parameters=[{"name": "q"}]), CONTEXT)
+    assert fingerprint != operation_fingerprint(endpoint(), {**CONTEXT, "base_url": "http://other"})
+
+
+# --------------------------------------------------
+# Hits and misses
+# --------------------------------------------------
+def test_unchanged_operation_is_a_hit(tmp_path):
+    cache_file = tmp_path / "cache.jsonl"
+    explore(cache_file, [endpoint()])
+
+    cache = ExplorationCache(cache_file)
+    fingerprint = operation_fingerprint(endpoint(), CONTEXT)
+
+    assert cache.lookup(fingerprint)
+    assert cache.get(fingerprint) == {
+        "fingerprint": fingerprint,
+        "behavior": behavior(200),
+        "intent": {"classification": "read"},
+    }
+    assert (cache.hits, cache.misses) == (1, 0)
+    cache.close()
+
+
+def test_changed_operation_is_a_miss(tmp_path):
+    cache_file = tmp_path / "cache.jsonl"
+    explore(cache_file, [endpoint()])
+
+    changed = endpoint(responses={"200": {"description": "OK"}, "404": {"description": "Gone"}})
+    cache = explore(cache_file, [changed])
+
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.summary() == "0 hits, 1 misses (0% reused)"
+    assert operation_fingerprint(changed, CONTEXT) in cache
+
+
+def test_a_truncated_last_line_keeps_the_other_records(tmp_path):
+    cache_file = tmp_path / "cache.jsonl"
+    explore(cache_file, [endpoint("/a"), endpoint("/b")])
+    with open(cache_file, "a", encoding="utf-8") as f:
+        f.write('{"fingerprint": "partial", "behav')
+
+    cache = ExplorationCache(cache_file)
+    assert len(cache.offsets) == 2
+    assert operation_fingerprint(endpoint("/b"), CONTEXT) in cache
+
+
+# --------------------------------------------------
+# Saving
+# --------------------------------------------------
+def test_save_keeps_reused_records_and_drops_stale_ones(tmp_path):
+    cache_file = tmp_path / "cache.jsonl"
+    explore(cache_file, [endpoint("/a"), endpoint("/b"), endpoint("/c")])
+
+    # /b is gone from the spec, /d is new
+    cache = explore(cache_file, [endpoint("/a"), endpoint("/c"), endpoint("/d")])
+
+    assert (cache.hits, cache.misses) == (2, 1)
+    records = [json.loads(line) for line in cache_file.read_text().splitlines()]
+    assert [record["fingerprint"] for record in records] == [
+        operation_fingerprint(endpoint("/d"), CONTEXT),
+        operation_fingerprint(endpoint("/a"), CONTEXT),
+        operation_fingerprint(endpoint("/c"), CONTEXT),
+    ]
+    assert records[1]["behavior"] == behavior(200)
+    assert not cache.tmp_path.exists()
+
+
+def test_save_without_keep_preserves_every_record(tmp_path):
+    cache_file = tmp_path / "cache.jsonl"
+    explore(cache_file, [endpoint("/a"), endpoint("/b")])
+
+    cache = ExplorationCache(cache_file)
+    cache.put(operation_fingerprint(endpoint("/c"), CONTEXT), behavior(500), None)
+    cache.save()
+
+    assert len(ExplorationCache(cache_file).offsets) == 3
+
+
+def test_save_with_nothing_to_keep_empties_the_cache(tmp_path):
+    cache_file = tmp_path / "cache.jsonl"
+    explore(cache_file, [endpoint("/a")])
+
+    ExplorationCache(cache_file).save(keep=[])
+
+    assert cache_file.read_text() == ""
@@ -0,0 +1,178 @@
+import json
+import random
+
+import pytest
+
+from automation.utils.json_stream import (
+    JsonStreamReader,
+    top_level_scalars,
+    validate_json_stream,
+)
+from resolution.schema_compiler import ContractValidator
+
+
+def chunked(text: str, size: int = 1):
+    raw = text.encode("utf-8")
+    return (raw[i:i + size] for i in range(0, len(raw), size))
+
+
+def read_all(text: str, size: int = 1):
+    return JsonStreamReader(chunked(text, size)).value()
+
+
+# --------------------------------------------------
+# Tokens split across chunks
+# --------------------------------------------------
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+def test_numbers_split_across_chunks(size):
+    text = "[-2.5e3, 10, 0.125, -7, 123456789012345678901234567890]"
+    assert read_all(text, size) == json.loads(text)
+
+
+@pytest.mark.parametrize("size", [1, 2, 5])
+def test_strings_and_escapes_split_across_chunks(size):
+    text = json.dumps({"quote": 'a "b" c', "escape": "\\n\u00e9", "key, with: delimiters": "x]}"})
+    assert read_all(text, size) == json.loads(text)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3])
+def test_multibyte_utf8_split_across_chunks(size):
+    text = json.dumps({"name": "Żółć €uro 😀"}, ensure_ascii=False)
+    assert read_all(text, size) == {"name": "Żółć €uro 😀"}
+
+
+def test_literals_split_across_chunks():
+    assert read_all("[true, false, null]") == [True, False, None]
+
+
+def test_element_larger_than_the_buffer():
+    document = {"items": [{"id": i, "name": "x" * 40} for i in range(20_000)]}
+    text = json.dumps(document)
+    assert read_all(text, size=4096) == document
+
+
+def test_invalid_json_raises_without_reading_ahead():
+    def chunks():
+        yield b"[1 2] "
+        raise AssertionError("read past the error")
+
+    with pytest.raises(json.JSONDecodeError):
+        JsonStreamReader(chunks()).value()
+
+
+def test_truncated_document_raises():
+    with pytest.raises(json.JSONDecodeError):
+        read_all('{"a": "unterminated')
+
+
+# --------------------------------------------------
+# Walking containers
+# --------------------------------------------------
+def test_iter_array_and_object():
+    reader = JsonStreamReader(chunked('{"a": [1, 2, 3], "b": {}, "c": []}'))
+    seen = {}
+    for key in reader.iter_object():
+        if key == "a":
+            seen[key] = [reader.value() for _ in reader.iter_array()]
+        else:
+            seen[key] = reader.value()
+    assert seen == {"a": [1, 2, 3], "b": {}, "c": []}
+
+
+def test_nested_skip():
+    text = '{"a": 1, "b": {"c": [1, {"d": [2, 3]}, "]"]}, "e": "x", "f": [[], [{}]], "g": null}'
+    reader = JsonStreamReader(chunked(text))
+    assert top_level_scalars(reader) == {"a": 1, "e": "x", "g": None}
+    assert reader.peek() == ""
+
+
+# --------------------------------------------------
+# Reservoir sampling of long arrays
+# --------------------------------------------------
+class RecordingValidator:
+    document = {}
+
+    def __init__(self, sample_first, sample_random, seed=1):
+        self.sample_first = sample_first
+        self.sample_random = sample_random
+        self.seed = seed
+        self.checked = []
+
+    def sampler(self, path):
+        return random.Random(self.seed)
+
+    def validator(self, schema):
+        return lambda value, path: self.checked.append(value)
+
+    def validate(self, value, schema, path):
+        self.checked.append(value)
+
+
+def sampled(length, sample_first, sample_random, seed=1):
+    validator = RecordingValidator(sample_first, sample_random, seed)
+    reader = JsonStreamReader(chunked(json.dumps(list(range(length))), 64))
+    validate_json_stream(validator, reader, {"type": "array", "items": {"type": "integer"}})
+    return validator.checked
+
+
+def test_reservoir_keeps_first_n_plus_k_distinct_elements():
+    checked = sampled(1000, 10, 5)
+    assert checked[:10] == list(range(10))
+    assert len(checked) == 15
+    assert checked[10:] == sorted(set(checked[10:]))
+    assert all(10 <= index < 1000 for index in checked[10:])
+
+
+def test_reservoir_is_reproducible_for_a_seed():
+    assert sampled(1000, 10, 5, seed=3) == sampled(1000, 10, 5, seed=3)
+
+
+def test_reservoir_covers_the_whole_tail():
+    counts = [0] * 100
+    for seed in range(2000):
+        for index in sampled(100, 0, 10, seed):
+            counts[index] += 1
+
+    # Every element is kept with probability 10/100: 200 expected per slot
+    assert min(counts) > 120 and max(counts) < 280
+
+
+def test_short_array_is_fully_validated():
+    assert sampled(12, 10, 5) == list(range(12))
+
+
+# --------------------------------------------------
+# Sampling with ContractValidator
+# --------------------------------------------------
+def contract_check(data, seed, streamed):
+    validator = ContractValidator({}, sample_first=2, sample_random=3, seed=seed)
+    schema = {"type": "array", "items": {"type": "integer"}}
+    if streamed:
+        validate_json_stream(validator, JsonStreamReader(chunked(json.dumps(data), 16)), schema)
+    else:
+        validator.validate(data, schema)
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_sampled_failure_names_the_seed_and_reproduces(streamed):
+    data = list(range(200))
+    data[150] = "bad"
+
+    failing = []
+    for seed in range(400):
+        try:
+            contract_check(data, seed, streamed)
+        except AssertionError as error:
+            assert "response[150]" in str(error) and f"seed {seed}" in str(error)
+            failing.append(seed)
+
+    assert failing
+    for seed in failing:
+        with pytest.raises(AssertionError, match=f"seed {seed}"):
+            contract_check(data, seed, streamed)
+
+
+def test_unsampled_failure_does_not_mention_a_seed():
+    with pytest.raises(AssertionError) as error:
+        contract_check([1, "bad", 3], 0, streamed=False)
+    assert "seed" not in str(error.value)
@@ -0,0 +1,78 @@
+from agent.test_generator import capture_rules, chain_positions, dependency_groups, lifecycle_graph
+from resolution.lifecycle_graph import LifecycleGraph
+
+
+def operation(status: str = "200", schema: dict = None) -> dict:
+    content = {"application/json": {"schema": schema}} if schema else {}
+    return {"responses": {status: {"description": "OK", "content": content}}}
+
+
+CREATED = {"type": "object", "properties": {"id": {"type": "string"}, "name": {"type": "string"}}}
+
+SPEC = {
+    "paths": {
+        "/projects/": {"post": operation("201", CREATED), "get": operation()},
+        "/projects/{project_id}": {"get": operation(), "put": operation(), "delete": operation("204")},
+        "/projects/{project_id}/tasks/": {
+            "post": operation("201", {"type": "object", "properties": {"data": {
+                "type": "object", "properties": {"id": {"type": "integer"}},
+            }}}),
+        },
+        "/projects/{project_id}/tasks/{task_id}": {"get": operation(), "delete": operation("204")},
+        # Unrelated collection: nothing consumes what it creates
+        "/tags/": {"post": operation("201", CREATED), "get": operation()},
+        "/health": {"get": operation()},
+    },
+}
+
+INTENT_MODEL = [
+    {"method": method.upper(), "endpoint": path}
+    for path, item in SPEC["paths"].items()
+    for method in item
+]
+
+
+def test_projects_and_tasks_form_one_ordered_chain():
+    chains = LifecycleGraph(SPEC).chains()
+
+    assert list(chains) == ["lifecycle_projects"]
+    chain = chains["lifecycle_projects"]
+
+    def before(first, second):
+        return chain.index(first) < chain.index(second)
+
+    assert chain[0] == ("POST", "/projects/")
+    assert before(("POST", "/projects/"), ("POST", "/projects/{project_id}/tasks/"))
+    assert before(("GET", "/projects/{project_id}"), ("PUT", "/projects/{project_id}"))
+    assert before(("POST", "/projects/{project_id}/tasks/"), ("GET", "/projects/{project_id}/tasks/{task_id}"))
+    # A delete runs after everything using its resource, child resources included
+    assert chain[-1] == ("DELETE", "/projects/{project_id}")
+    assert before(("DELETE", "/projects/{project_id}/tasks/{task_id}"), ("DELETE", "/projects/{project_id}"))
+
+
+def test_unrelated_collections_stay_out_of_every_chain():
+    chain = LifecycleGraph(SPEC).chains()["lifecycle_projects"]
+
+    for node in [("POST", "/tags/"), ("GET", "/tags/"), ("GET", "/health"), ("GET", "/projects/")]:
+        assert node not in chain
+
+
+def test_generator_helpers_share_one_graph():
+    graph = lifecycle_graph(INTENT_MODEL, SPEC)
+    groups = dependency_groups(INTENT_MODEL, graph)
+    positions = chain_positions(INTENT_MODEL, graph)
+
+    assert set(groups.values()) == {"lifecycle_projects"}
+    assert ("POST", "/tags/") not in groups
+    assert positions[("POST", "/projects/")] == 0
+    assert positions[("DELETE", "/projects/{project_id}")] == len(groups) - 1
+
+    rules = capture_rules(INTENT_MODEL, graph)
+    assert rules[("POST", "/projects/")]["project_id"] == "id"
+    assert rules[("POST", "/projects/{project_id}/tasks/")]["task_id"] == "data.id"
+
+
+def test_without_a_spec_groups_fall_back_to_path_prefixes():
+    assert lifecycle_graph(INTENT_MODEL, {}) is None
+    assert capture_rules(INTENT_MODEL, None) == {}
+    assert chain_positions(INTENT_MODEL)[("GET", "/projects/{project_id}/tasks/{task_id}")] == 2
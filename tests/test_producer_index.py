@@ -0,0 +1,122 @@
+from requests import Response
+
+from automation.utils.api_runtime import capture_resources
+from resolution.execution_context import ExecutionContext
+from resolution.producer_index import EXACT, PARENT, QUALIFIED, fill_payload
+from resolution.spec_index import SpecIndex
+
+
+def returns(schema: dict, status: str = "200") -> dict:
+    return {"responses": {status: {
+        "description": "OK",
+        "content": {"application/json": {"schema": schema}},
+    }}}
+
+
+def obj(**properties) -> dict:
+    return {"type": "object", "properties": properties}
+
+
+ID = {"type": "string"}
+PROJECT = obj(id=ID, name={"type": "string"}, owner=obj(id={"type": "integer"}))
+
+SPEC = {
+    "paths": {
+        # Listed before the create on purpose: POST still ranks first
+        "/tasks/": {"post": returns(obj(id={"type": "integer"}, project_id=ID), "201")},
+        "/projects/": {
+            "get": returns({"type": "array", "items": PROJECT}),
+            "post": returns(PROJECT, "201"),
+        },
+        "/labels/": {"post": returns(obj(data=obj(id=ID)), "201")},
+    },
+}
+
+
+def producers(name: str):
+    return [
+        (producer.method, producer.path, producer.field, producer.rank)
+        for producer in SpecIndex.for_spec(SPEC).producers.lookup(name)
+    ]
+
+
+# --------------------------------------------------
+# Ranking
+# --------------------------------------------------
+def test_create_id_is_the_best_producer_of_project_id():
+    expected = [
+        ("POST", "/projects/", "id", QUALIFIED),
+        ("GET", "/projects/", "[*].id", QUALIFIED),
+        ("POST", "/tasks/", "project_id", EXACT),
+    ]
+    assert producers("project_id") == expected
+    assert producers("projectId") == expected
+    assert producers("Project-ID") == expected
+
+
+def test_embedded_id_is_qualified_by_its_property():
+    assert producers("owner_id")[0] == ("POST", "/projects/", "owner.id", PARENT)
+
+
+def test_envelope_fields_describe_the_operation_resource():
+    assert producers("labelId") == [("POST", "/labels/", "data.id", QUALIFIED)]
+
+
+def test_list_items_share_the_key_of_the_single_resource():
+    keys = {
+        producer.key
+        for producer in SpecIndex.for_spec(SPEC).producers.lookup("project_id")
+        if producer.path == "/projects/"
+    }
+    assert keys == {"project.id"}
+
+
+def test_capture_rules_of_the_create():
+    rules = SpecIndex.for_spec(SPEC).producers.capture_rules("post", "/projects/")
+    assert rules["project.id"] == "id"
+    assert rules["project.owner.id"] == "owner.id"
+
+
+# --------------------------------------------------
+# fill_payload
+# --------------------------------------------------
+LINKS = {"projectId": ["projectId", "project.id"]}
+
+
+def test_fill_payload_prefers_the_chain_own_value():
+    context = ExecutionContext()
+    context.namespace("lifecycle_a").register({"project.id": "a"})
+    context.namespace("lifecycle_b").register({"project.id": "b"})
+
+    payload = {"projectId": "generated", "name": "x"}
+    assert fill_payload(payload, context.namespace("lifecycle_a"), LINKS) == {"projectId": "a", "name": "x"}
+    assert payload["projectId"] == "generated"
+
+
+def test_fill_payload_falls_back_to_the_root_namespace():
+    context = ExecutionContext()
+    context.namespace("lifecycle_b").register({"project.id": "b"})
+
+    filled = fill_payload({"projectId": "generated"}, context.namespace("lifecycle_c"), LINKS)
+    assert filled == {"projectId": "b"}
+
+
+def test_fill_payload_keeps_generated_values_without_a_capture():
+    assert fill_payload({"projectId": "generated"}, ExecutionContext(), LINKS) == {"projectId": "generated"}
+    assert fill_payload({"projectId": "generated"}, {"projectId": "plain"}, LINKS) == {"projectId": "plain"}
+    assert fill_payload(None, {}, LINKS) is None
+
+
+# --------------------------------------------------
+# Captures without a spec
+# --------------------------------------------------
+def test_create_captures_identifiers_and_rules_only():
+    response = Response()
+    response.status_code = 201
+    response._content = (
+        b'{"id": 3, "projectId": "p", "name": "n", "created_at": "t", "data": {"id": 9}}'
+    )
+
+    assert capture_resources(response, rules={"task_id": "data.id"}) == {
+        "id": 3, "projectId": "p", "task_id": 9,
+    }
@@ -0,0 +1,78 @@
+from resolution import contracts, engine
+from resolution.schema_compiler import MAX_RECURSIVE_DEPTH, ContractValidator
+
+
+def node_spec(child_required: bool) -> dict:
+    return {
+        "paths": {
+            "/nodes": {
+                "post": {
+                    "requestBody": {"content": {"application/json": {"schema": {
+                        "$ref": "#/components/schemas/NodeCreate",
+                    }}}},
+                    "responses": {"201": {"description": "Created"}},
+                },
+            },
+        },
+        "components": {"schemas": {
+            "NodeCreate": {
+                "type": "object",
+                "required": ["label", "parent"],
+                "properties": {
+                    "label": {"type": "string"},
+                    "parent": {"$ref": "#/components/schemas/Node"},
+                },
+            },
+            "Node": {
+                "type": "object",
+                "required": ["label", "child"] if child_required else ["label"],
+                "properties": {
+                    "label": {"type": "string"},
+                    "child": {"$ref": "#/components/schemas/Node"},
+                    "siblings": {"type": "array", "items": {"$ref": "#/components/schemas/Node"}},
+                    "next": {"anyOf": [{"$ref": "#/components/schemas/Node"}, {"type": "null"}]},
+                },
+            },
+        }},
+    }
+
+
+def resolve_body(swagger_spec: dict) -> dict:
+    request = contracts.TestStepResolutionRequest(
+        endpoint="/nodes",
+        http_method="POST",
+        swagger_spec=swagger_spec,
+        intent_metadata={},
+        role_context={},
+        deterministic_seed=1,
+    )
+    return engine.TestDataResolutionEngine().resolve(request).body
+
+
+def test_optional_self_references_are_left_out():
+    spec = node_spec(child_required=False)
+    body = resolve_body(spec)
+
+    # child, siblings (array of Node) and next (nullable Node) are optional
+    assert set(body["parent"]) == {"label"}
+    ContractValidator(spec, constraints=True).validate(
+        body, {"$ref": "#/components/schemas/NodeCreate"}, "body"
+    )
+
+
+def test_required_self_reference_is_expanded_up_to_the_cap():
+    body = resolve_body(node_spec(child_required=True))
+
+    node, depth = body["parent"], 0
+    while node is not None:
+        assert set(node) == {"label", "child"}
+        assert isinstance(node["label"], str)
+        node, depth = node["child"], depth + 1
+
+    # The body's own Node plus one level per expanded placeholder
+    assert depth == MAX_RECURSIVE_DEPTH + 1
+
+
+def test_payload_is_deterministic():
+    spec = node_spec(child_required=True)
+    assert resolve_body(spec) == resolve_body(spec)
@@ -0,0 +1,158 @@
+import base64
+import json
+import stat
+import time
+
+import pytest
+
+from agent.token_cache import (
+    DEFAULT_CLIENT_ID,
+    DEFAULT_TTL,
+    REFRESH_MARGIN,
+    TokenCache,
+    cache_key,
+    jwt_expiry,
+    oauth_client_id,
+    token_entry,
+)
+
+KEY = cache_key("http://api/", "admin", "client")
+
+
+def jwt(exp: float) -> str:
+    def encode(part: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+    return f"{encode({'alg': 'none'})}.{encode({'exp': exp})}.signature"
+
+
+class Grants:
+    """
+    Token endpoint double: records every grant it serves.
+    """
+
+    def __init__(self, lifetime: float = 3600, refresh_fails: bool = False):
+        self.lifetime = lifetime
+        self.refresh_fails = refresh_fails
+        self.calls = []
+
+    def fetch(self) -> dict:
+        self.calls.append("password")
+        return self.issue("password")
+
+    def refresh(self, refresh_token: str) -> dict:
+        self.calls.append(f"refresh:{refresh_token}")
+        if self.refresh_fails:
+            raise RuntimeError("invalid_grant")
+        return self.issue("refreshed")
+
+    def issue(self, name: str) -> dict:
+        return {
+            "access_token": f"{name}-{len(self.calls)}",
+            "refresh_token": f"rt-{len(self.calls)}",
+            "expires_in": self.lifetime,
+        }
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("TOKEN_CACHE_KEY", raising=False)
+    return TokenCache(str(tmp_path / "tokens.json"))
+
+
+# --------------------------------------------------
+# Expiry
+# --------------------------------------------------
+def test_expiry_from_the_jwt_exp_claim():
+    exp = time.time() + 1234
+    assert jwt_expiry(jwt(exp)) == pytest.approx(exp)
+    assert token_entry({"access_token": jwt(exp), "expires_in": 5})["expires_at"] == pytest.approx(exp)
+
+
+def test_expiry_from_expires_in_for_opaque_tokens():
+    assert jwt_expiry("opaque") is None
+    entry = token_entry({"access_token": "opaque", "expires_in": 120})
+    assert entry["expires_at"] == pytest.approx(time.time() + 120, abs=5)
+
+
+def test_default_ttl_without_expiry_information():
+    entry = token_entry({"access_token": "opaque"})
+    assert entry["expires_at"] == pytest.approx(time.time() + DEFAULT_TTL, abs=5)
+    assert entry["refresh_token"] is None
+
+
+def test_missing_access_token_is_an_error():
+    with pytest.raises(ValueError):
+        token_entry({"token_type": "bearer"})
+
+
+# --------------------------------------------------
+# Reuse and refresh
+# --------------------------------------------------
+def test_valid_token_is_reused_across_instances(cache, tmp_path):
+    grants = Grants()
+    token = cache.get_token(KEY, grants.fetch, grants.refresh)
+
+    again = TokenCache(str(tmp_path / "tokens.json")).get_token(KEY, grants.fetch, grants.refresh)
+    assert again == token
+    assert grants.calls == ["password"]
+
+
+def test_token_inside_the_refresh_margin_is_refreshed(cache):
+    grants = Grants(lifetime=REFRESH_MARGIN - 1)
+    cache.get_token(KEY, grants.fetch, grants.refresh)
+
+    assert cache.get_token(KEY, grants.fetch, grants.refresh) == "refreshed-2"
+    assert grants.calls == ["password", "refresh:rt-1"]
+
+
+def test_token_outside_the_refresh_margin_is_kept(cache):
+    grants = Grants(lifetime=REFRESH_MARGIN + 30)
+    token = cache.get_token(KEY, grants.fetch, grants.refresh)
+
+    assert cache.get_token(KEY, grants.fetch, grants.refresh) == token
+    assert grants.calls == ["password"]
+
+
+def test_failed_refresh_falls_back_to_the_password_grant(cache):
+    grants = Grants(lifetime=1, refresh_fails=True)
+    cache.get_token(KEY, grants.fetch, grants.refresh)
+
+    assert cache.get_token(KEY, grants.fetch, grants.refresh) == "password-3"
+    assert grants.calls == ["password", "refresh:rt-1", "password"]
+
+
+def test_invalidate_forces_a_new_grant(cache):
+    grants = Grants()
+    cache.get_token(KEY, grants.fetch, grants.refresh)
+    cache.invalidate(KEY)
+    cache.get_token(KEY, grants.fetch, grants.refresh)
+
+    assert grants.calls == ["password", "password"]
+
+
+# --------------------------------------------------
+# Storage
+# --------------------------------------------------
+def test_cache_file_is_private(cache):
+    grants = Grants()
+    cache.get_token(KEY, grants.fetch, grants.refresh)
+
+    assert stat.S_IMODE(cache.file_path.stat().st_mode) == 0o600
+
+
+def test_keys_separate_roles_and_clients(cache):
+    grants = Grants()
+    keys = [cache_key("http://api", "admin", "a"), cache_key("http://api", "user", "a"),
+            cache_key("http://api", "admin", "b")]
+    tokens = {cache.get_token(key, grants.fetch, grants.refresh) for key in keys}
+
+    assert len(tokens) == 3
+    assert cache_key("http://api/", "admin", "a") == keys[0]
+
+
+def test_client_id_comes_from_the_environment(monkeypatch):
+    monkeypatch.delenv("CLIENT_ID", raising=False)
+    assert oauth_client_id() == DEFAULT_CLIENT_ID
+
+    monkeypatch.setenv("CLIENT_ID", "suite")
+    assert oauth_client_id() == "suite"